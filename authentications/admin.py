@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from .models import CustomUser
+from .models import CustomUser, EmailOutbox, RevokedToken
 
 
 class CustomUserAdmin(UserAdmin):
@@ -25,6 +25,37 @@ class CustomUserAdmin(UserAdmin):
             "fields": ("email",  "password1", "password2", "is_staff", "is_active"),
         }),
     )
+    actions = ["mark_email_verified"]
+
+    @admin.action(description="Mark selected users' emails as verified")
+    def mark_email_verified(self, request, queryset):
+        verified = queryset.verify_emails()
+        self.message_user(request, f"Verified {verified} user(s).")
 
 
 admin.site.register(CustomUser, CustomUserAdmin)
+
+
+class EmailOutboxAdmin(admin.ModelAdmin):
+    model = EmailOutbox
+    list_display = ("to_email", "kind", "status", "attempts",
+                    "next_attempt_at", "created_at", "sent_at")
+    list_filter = ("status", "kind")
+    search_fields = ("to_email",)
+    ordering = ("-created_at",)
+    readonly_fields = ("user", "kind", "to_email", "context", "created_at",
+                       "sent_at", "last_error")
+
+
+admin.site.register(EmailOutbox, EmailOutboxAdmin)
+
+
+class RevokedTokenAdmin(admin.ModelAdmin):
+    model = RevokedToken
+    list_display = ("jti", "user", "created_at", "expires_at")
+    search_fields = ("jti", "user__email")
+    ordering = ("-created_at",)
+    raw_id_fields = ("user",)
+
+
+admin.site.register(RevokedToken, RevokedTokenAdmin)
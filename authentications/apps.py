@@ -6,3 +6,6 @@ from django.apps import AppConfig
 class AuthenticationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'authentications'
+
+    def ready(self):
+        from . import signals  # noqa: F401
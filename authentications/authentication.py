@@ -0,0 +1,19 @@
+# authentications/authentication.py
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from .revocation import revoked_tokens
+
+
+class ClaimsJWTAuthentication(JWTStatelessUserAuthentication):
+    """
+    Authenticates bearer access tokens from their claims alone. The user is a
+    ``ClaimsTokenUser`` and revocation is checked against the in-memory
+    revocation list, so a request costs no database queries.
+    """
+
+    def get_validated_token(self, raw_token):
+        validated_token = super().get_validated_token(raw_token)
+        if revoked_tokens.is_revoked(validated_token.payload):
+            raise InvalidToken(_("Token has been revoked"))
+        return validated_token
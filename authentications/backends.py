@@ -0,0 +1,44 @@
+# authentications/backends.py
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from .hashing import get_hashing_service
+
+
+class HashingServiceBackend(ModelBackend):
+    """
+    ``ModelBackend`` whose password checks run on the shared hashing pool,
+    so logins are bounded like registrations. Raises ``HashingServiceBusy``
+    when the pool is saturated.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        UserModel = get_user_model()
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        service = get_hashing_service()
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Hash anyway, so unknown emails take as long as wrong passwords
+            service.hash_password(password)
+            return None
+        if self.check_password(service, user, password) and self.user_can_authenticate(user):
+            return user
+        return None
+
+    def check_password(self, service, user, password):
+        """
+        ``user.check_password()`` on the pool, including the upgrade of
+        hashes made with outdated hasher parameters.
+        """
+        if not user.password:
+            return False
+        is_correct, must_update = service.verify_password(password, user.password)
+        if not is_correct:
+            return False
+        if must_update:
+            user.password = service.hash_password(password)
+            user.save(update_fields=['password'])
+        return True
@@ -0,0 +1,133 @@
+# authentications/email_filter.py
+"""
+In-process negative-lookup filter for registered email addresses.
+
+A Bloom filter answers "definitely not registered" without touching the
+database; only "maybe registered" answers fall through to the indexed
+lookup. It is loaded lazily, updated on every local user save and topped up
+from users who joined since the last refresh, so registrations made by
+other worker processes are picked up without a full reload. The top-up
+window overlaps the previous one by ``SYNC_OVERLAP``: a primary key is
+allocated before its transaction commits, so rows can become visible out
+of order, and the overlap catches those committed late.
+
+The filter never produces false negatives for users it has seen, but a user
+registered in another process may be missed until the next refresh. Callers
+that must be exact (registration) rely on the unique constraint as the
+final guard.
+"""
+import hashlib
+import math
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+# Each top-up re-reads this much before the previous one started
+SYNC_OVERLAP = timedelta(seconds=60)
+
+
+class BloomFilter:
+    """A fixed-size Bloom filter over strings."""
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = max(int(capacity), 1)
+        self.error_rate = error_rate
+        bits = -self.capacity * math.log(error_rate) / (math.log(2) ** 2)
+        self.size = max(int(math.ceil(bits)), 8)
+        self.hash_count = max(
+            int(round(self.size / self.capacity * math.log(2))), 1)
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, value):
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(value.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
+
+    def add(self, value):
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, value):
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(value)
+        )
+
+
+class RegisteredEmailFilter:
+    """Process-wide Bloom filter of lowercased registered emails."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.bloom = None
+        self.synced_until = None
+        self.last_refresh = 0.0
+
+    @property
+    def refresh_interval(self):
+        return getattr(settings, 'EMAIL_FILTER_REFRESH_SECONDS', 30)
+
+    def _load(self, queryset):
+        started = timezone.now()
+        for email in queryset.values_list('email', flat=True).iterator(chunk_size=2000):
+            email = email.lower()
+            # Overlapping top-ups see some users twice; count each once
+            if email not in self.bloom:
+                self.bloom.add(email)
+        self.synced_until = started
+        self.last_refresh = time.monotonic()
+
+    def _rebuild(self):
+        User = get_user_model()
+        capacity = max(
+            getattr(settings, 'EMAIL_FILTER_CAPACITY', 100000),
+            User.objects.count() * 2,
+        )
+        self.bloom = BloomFilter(
+            capacity, getattr(settings, 'EMAIL_FILTER_ERROR_RATE', 0.01))
+        self._load(User.objects.all())
+
+    def refresh(self, force=False):
+        """Pick up users created since the last refresh (or rebuild)."""
+        with self.lock:
+            if self.bloom is None or self.bloom.count >= self.bloom.capacity:
+                self._rebuild()
+            elif force or time.monotonic() - self.last_refresh >= self.refresh_interval:
+                self._load(get_user_model().objects.filter(
+                    date_joined__gte=self.synced_until - SYNC_OVERLAP))
+
+    def add(self, email):
+        email = email.lower()
+        with self.lock:
+            # Every save of a user lands here; count each address once
+            if self.bloom is not None and email not in self.bloom:
+                self.bloom.add(email)
+
+    def might_exist(self, email):
+        """False means the email is definitely not registered."""
+        self.refresh()
+        return email.lower() in self.bloom
+
+
+registered_emails = RegisteredEmailFilter()
+
+
+def email_is_registered(email):
+    """
+    Case-insensitive registration check that only queries the database when
+    the filter cannot rule the email out.
+    """
+    if not registered_emails.might_exist(email):
+        return False
+    return get_user_model().objects.email_exists(email)
@@ -0,0 +1,174 @@
+# authentications/hashing.py
+"""
+Bounded password hashing pool.
+
+PBKDF2 is pure CPU work. Registration, login and bulk provisioning hash on
+one shared thread pool per process instead of on their request threads;
+``hashlib`` releases the GIL while hashing, so the pool runs hashes in
+parallel, and no more than ``PASSWORD_HASHING_WORKERS`` run at once however
+many requests arrive. Sync views wait on the pool with ``hash_password`` and
+``verify_password``; async views under ASGI await ``make_password``,
+``check_password`` and ``check_user_password`` so the event loop is never
+blocked.
+
+The pool accepts at most ``PASSWORD_HASHING_MAX_PENDING`` queued or running
+jobs. Beyond that, ``HashingServiceBusy`` is raised immediately so callers
+can shed load (e.g. answer 503) rather than let latency grow without bound.
+Bulk callers use ``make_passwords``, which waits for free slots and holds
+at most one per worker, so a large batch queues behind interactive work
+instead of being rejected or crowding it out.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class HashingServiceBusy(Exception):
+    """Raised when the hashing pool has no free slots."""
+
+
+class HashingService:
+    def __init__(self, max_workers=None, max_pending=None):
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.max_pending = max_pending or self.max_workers * 8
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix='password-hash')
+        self.slots = threading.BoundedSemaphore(self.max_pending)
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.total_run = 0.0
+        self.max_wait = 0.0
+
+    def submit(self, func, *args, block=False):
+        """
+        Run ``func(*args)`` on the pool and return a concurrent future, or
+        raise ``HashingServiceBusy`` if the pool is saturated (unless
+        ``block`` is true, which waits for a free slot instead).
+        """
+        if not self.slots.acquire(blocking=block):
+            with self.lock:
+                self.rejected += 1
+            raise HashingServiceBusy(
+                "Password hashing is saturated, try again shortly.")
+        queued_at = time.perf_counter()
+        with self.lock:
+            self.submitted += 1
+            self.in_flight += 1
+
+        def run():
+            started = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                finished = time.perf_counter()
+                with self.lock:
+                    wait = started - queued_at
+                    self.in_flight -= 1
+                    self.completed += 1
+                    self.total_wait += wait
+                    self.total_run += finished - started
+                    self.max_wait = max(self.max_wait, wait)
+                self.slots.release()
+
+        try:
+            return self.executor.submit(run)
+        except Exception:
+            with self.lock:
+                self.in_flight -= 1
+            self.slots.release()
+            raise
+
+    def make_passwords(self, passwords):
+        """Hash ``passwords`` on the pool, at most ``max_workers`` at a time."""
+        hashed = []
+        for start in range(0, len(passwords), self.max_workers):
+            futures = [self.submit(hashers.make_password, password, block=True)
+                       for password in passwords[start:start + self.max_workers]]
+            hashed.extend(future.result() for future in futures)
+        return hashed
+
+    def hash_password(self, password):
+        """
+        Hash ``password`` with the default hasher on the pool, or raise
+        ``HashingServiceBusy`` if the pool is saturated.
+        """
+        return self.submit(hashers.make_password, password).result()
+
+    def verify_password(self, password, encoded):
+        """
+        ``(is_correct, must_update)`` for ``password`` against an encoded
+        hash, as Django's ``verify_password()``, checked on the pool; raises
+        ``HashingServiceBusy`` if the pool is saturated.
+        """
+        return self.submit(hashers.verify_password, password, encoded).result()
+
+    async def make_password(self, password):
+        """Hash ``password`` with the default hasher without blocking the loop."""
+        return await asyncio.wrap_future(self.submit(hashers.make_password, password))
+
+    async def check_password(self, password, encoded):
+        """Check ``password`` against an encoded hash without blocking the loop."""
+        return await asyncio.wrap_future(
+            self.submit(hashers.check_password, password, encoded))
+
+    async def check_user_password(self, user, password):
+        """
+        Async equivalent of ``user.check_password()``, including the upgrade
+        of hashes made with outdated hasher parameters.
+        """
+        if not user.password:
+            return False
+        is_correct, must_update = await asyncio.wrap_future(
+            self.submit(hashers.verify_password, password, user.password))
+        if not is_correct:
+            return False
+        if must_update:
+            user.password = await self.make_password(password)
+            await user.asave(update_fields=['password'])
+        return True
+
+    def metrics(self):
+        """A snapshot of pool usage counters."""
+        with self.lock:
+            return {
+                'workers': self.max_workers,
+                'max_pending': self.max_pending,
+                'in_flight': self.in_flight,
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'avg_wait_ms': round(self.total_wait / self.completed * 1000, 3)
+                if self.completed else 0.0,
+                'avg_run_ms': round(self.total_run / self.completed * 1000, 3)
+                if self.completed else 0.0,
+                'max_wait_ms': round(self.max_wait * 1000, 3),
+            }
+
+    def shutdown(self, wait=True):
+        self.executor.shutdown(wait=wait)
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_hashing_service():
+    """The process-wide hashing service, created on first use."""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = HashingService(
+                    max_workers=getattr(settings, 'PASSWORD_HASHING_WORKERS', None),
+                    max_pending=getattr(settings, 'PASSWORD_HASHING_MAX_PENDING', None),
+                )
+    return _service
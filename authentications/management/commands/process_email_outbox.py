@@ -0,0 +1,85 @@
+# authentications/management/commands/process_email_outbox.py
+import logging
+import threading
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from authentications.outbox import claim_batch, deliver_batch, drain_outbox
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Deliver queued emails from the outbox using a pool of workers."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=1,
+            help="Number of worker threads draining the outbox.")
+        parser.add_argument(
+            '--batch-size', type=int, default=None,
+            help="Rows claimed per batch (defaults to EMAIL_OUTBOX_BATCH_SIZE).")
+        parser.add_argument(
+            '--poll-interval', type=float, default=5.0,
+            help="Seconds to sleep when the outbox is empty.")
+        parser.add_argument(
+            '--once', action='store_true',
+            help="Drain everything that is currently due, then exit.")
+
+    def handle(self, *args, **options):
+        if options['once'] and options['workers'] == 1:
+            sent, failed = drain_outbox(batch_size=options['batch_size'])
+            self.stdout.write(f"Sent {sent} email(s), {failed} failed.")
+            return
+
+        self.stop = threading.Event()
+        self.totals = {'sent': 0, 'failed': 0}
+        self.lock = threading.Lock()
+
+        threads = [
+            threading.Thread(
+                target=self.work,
+                args=(options['batch_size'],
+                      options['poll_interval'], options['once']),
+                name=f"outbox-worker-{n}",
+                daemon=True,
+            )
+            for n in range(options['workers'])
+        ]
+        for thread in threads:
+            thread.start()
+
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(timeout=1)
+        except KeyboardInterrupt:
+            self.stop.set()
+            for thread in threads:
+                thread.join()
+
+        self.stdout.write(
+            f"Sent {self.totals['sent']} email(s), {self.totals['failed']} failed.")
+
+    def work(self, batch_size, poll_interval, once):
+        try:
+            while not self.stop.is_set():
+                try:
+                    entries = claim_batch(batch_size)
+                    if not entries:
+                        if once:
+                            return
+                        self.stop.wait(poll_interval)
+                        continue
+                    sent, failed = deliver_batch(entries)
+                except Exception:
+                    # Claimed rows become due again when their lease expires
+                    logger.exception("Outbox worker batch failed")
+                    self.stop.wait(poll_interval)
+                    continue
+                with self.lock:
+                    self.totals['sent'] += sent
+                    self.totals['failed'] += failed
+        finally:
+            # Each thread holds its own database connection
+            connections.close_all()
@@ -0,0 +1,58 @@
+# authentications/management/commands/provision_users.py
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+from authentications.provisioning import provision_users
+from organisations.models import Organisation
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-create users from a CSV file with an 'email' column and optional "
+        "'first_name', 'last_name' and 'password' columns."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_file', help="Path to the CSV file.")
+        parser.add_argument(
+            '--organisation',
+            help="Organisation id; emails must match its allowed_domains.")
+        parser.add_argument(
+            '--batch-size', type=int, default=None,
+            help="Rows per insert batch (defaults to PROVISIONING_BATCH_SIZE).")
+        parser.add_argument(
+            '--workers', type=int, default=None,
+            help="Password hashing processes (defaults to the CPU count).")
+        parser.add_argument(
+            '--base-url', default=None,
+            help="Base URL for verification links (defaults to VERIFICATION_BASE_URL).")
+        parser.add_argument(
+            '--no-email', action='store_true',
+            help="Do not queue verification emails.")
+
+    def handle(self, *args, **options):
+        organisation = None
+        if options['organisation']:
+            try:
+                organisation = Organisation.objects.get(
+                    pk=options['organisation'])
+            except (Organisation.DoesNotExist, ValueError):
+                raise CommandError(
+                    f"Organisation {options['organisation']} not found")
+
+        with open(options['csv_file'], newline='', encoding='utf-8') as handle:
+            result = provision_users(
+                csv.DictReader(handle),
+                organisation=organisation,
+                send_verification=not options['no_email'],
+                base_url=options['base_url'],
+                batch_size=options['batch_size'],
+                workers=options['workers'],
+            )
+
+        for error in result['errors']:
+            # Report the CSV line number (header is line 1)
+            self.stderr.write(
+                f"Line {error['row'] + 2} ({error['email']}): {error['errors']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {result['created']} user(s), {len(result['errors'])} row(s) failed."))
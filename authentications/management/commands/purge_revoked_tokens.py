@@ -0,0 +1,11 @@
+# authentications/management/commands/purge_revoked_tokens.py
+from django.core.management.base import BaseCommand
+from authentications.revocation import purge_expired_revocations
+
+
+class Command(BaseCommand):
+    help = "Delete token revocations whose tokens have all expired."
+
+    def handle(self, *args, **options):
+        deleted = purge_expired_revocations()
+        self.stdout.write(f"Deleted {deleted} expired revocation(s).")
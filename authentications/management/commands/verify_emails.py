@@ -0,0 +1,36 @@
+# authentications/management/commands/verify_emails.py
+import csv
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "Mark users as verified from a CSV file with an 'email' column, "
+        "e.g. after importing accounts whose addresses are already trusted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_file', help="Path to the CSV file.")
+        parser.add_argument(
+            '--batch-size', type=int, default=None,
+            help="Emails per UPDATE (defaults to PROVISIONING_BATCH_SIZE).")
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        batch_size = options['batch_size'] or getattr(
+            settings, 'PROVISIONING_BATCH_SIZE', 500)
+        verified = seen = 0
+
+        with open(options['csv_file'], newline='', encoding='utf-8') as handle:
+            emails = (row['email'].strip() for row in csv.DictReader(handle)
+                      if row.get('email', '').strip())
+            while batch := list(islice(emails, batch_size)):
+                seen += len(batch)
+                verified += User.objects.filter_emails(batch).verify_emails()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Verified {verified} user(s) from {seen} email(s)."))
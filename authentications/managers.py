@@ -1,13 +1,45 @@
 from django.contrib.auth.base_user import BaseUserManager
+from django.db import models
+from django.db.models.functions import Lower
 from django.utils.translation import gettext_lazy as _
+from .hashing import get_hashing_service
 
 
-class CustomUserManager(BaseUserManager):
+class CustomUserQuerySet(models.QuerySet):
+
+    def verify_emails(self):
+        """
+        Mark the unverified users in this queryset as verified and active
+        with a single conditional UPDATE that writes only those two columns.
+        Returns the number of users verified; already verified rows are left
+        untouched, so concurrent calls never verify the same user twice.
+        """
+        return self.filter(email_verified=False).update(
+            email_verified=True, is_active=True)
+
+
+class CustomUserManager(BaseUserManager.from_queryset(CustomUserQuerySet)):
     """
     Custom user model manager where email is the unique identifiers
     for authentications instead of usernames.
     """
 
+    def filter_email(self, email):
+        """
+        Case-insensitive email lookup. Compares LOWER(email) so the query
+        can use the functional unique index rather than a sequential scan.
+        """
+        return self.alias(email_lower=Lower('email')).filter(
+            email_lower=email.lower())
+
+    def email_exists(self, email):
+        return self.filter_email(email).exists()
+
+    def filter_emails(self, emails):
+        # Batched form of filter_email() for bulk operations
+        return self.alias(email_lower=Lower('email')).filter(
+            email_lower__in=[email.lower() for email in emails])
+
     def create_user(self, email, password, **extra_fields):
         # Create and save a user with the given email and password.
         if not email:
@@ -20,6 +52,20 @@ class CustomUserManager(BaseUserManager):
         user.save()
         return user
 
+    async def acreate_user(self, email, password, **extra_fields):
+        """
+        Async create_user() for ASGI views: the password is hashed on the
+        hashing service's pool instead of the event loop.
+        """
+        if not email:
+            raise ValueError(_("The Email must be set"))
+        email = self.normalize_email(email)
+        extra_fields.setdefault('is_active', False)
+        user = self.model(email=email, **extra_fields)
+        user.password = await get_hashing_service().make_password(password)
+        await user.asave()
+        return user
+
     def create_superuser(self, email, password, **extra_fields):
         """
         Create and save a SuperUser with the given email and password.
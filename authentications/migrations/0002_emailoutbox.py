@@ -0,0 +1,37 @@
+# Generated by Django 5.1.6 on 2026-10-18 11:12
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmailOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('VER', 'Email verification')], default='VER', max_length=3)),
+                ('to_email', models.EmailField(max_length=254, verbose_name='recipient')),
+                ('context', models.JSONField(default=dict, help_text='Template context used to render the message')),
+                ('status', models.CharField(choices=[('PEN', 'Pending'), ('SNT', 'Sent'), ('FLD', 'Failed')], default='PEN', max_length=3)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now, help_text='Earliest time the worker may (re)try delivery')),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='outbox_emails', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'outbox email',
+                'verbose_name_plural': 'outbox emails',
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='authenticat_status_7c7bd7_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.6 on 2026-10-18 11:17
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('authentications', '0002_emailoutbox'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='customuser',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('email'), name='authentications_user_email_ci_unique', violation_error_message='This email address is already in use.'),
+        ),
+    ]
@@ -1,6 +1,7 @@
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
 from django.contrib.auth.tokens import default_token_generator
 from django.db import models
+from django.db.models.functions import Lower
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.utils.http import urlsafe_base64_encode
@@ -17,7 +18,7 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
         blank=True, max_length=150, verbose_name='last name')
     is_staff = models.BooleanField(default=False)
     is_active = models.BooleanField(default=True)
-    date_joined = models.DateTimeField(default=timezone.now)
+    date_joined = models.DateTimeField(default=timezone.now, db_index=True)
     email_verified = models.BooleanField(default=False)
     verification_uuid = models.UUIDField(unique=True, default=uuid.uuid4)
     groups = models.ManyToManyField(
@@ -43,7 +44,109 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
     def __str__(self):
         return self.email
 
+    def set_password(self, raw_password):
+        super().set_password(raw_password)
+        # Outstanding verification links stop working when the password
+        # changes, as they did when they were password-reset style tokens
+        if not self.email_verified:
+            self.verification_uuid = uuid.uuid4()
+
     class Meta:
         verbose_name = _("user")
         verbose_name_plural = _("users")
         abstract = False
+        constraints = [
+            # Case-insensitive uniqueness; also serves LOWER(email) lookups
+            models.UniqueConstraint(
+                Lower('email'),
+                name='authentications_user_email_ci_unique',
+                violation_error_message=_(
+                    "This email address is already in use."),
+            ),
+        ]
+
+
+class OutboxStatus(models.TextChoices):
+    PENDING = 'PEN', _('Pending')
+    SENT = 'SNT', _('Sent')
+    FAILED = 'FLD', _('Failed')
+
+
+class OutboxKind(models.TextChoices):
+    VERIFICATION = 'VER', _('Email verification')
+
+
+class EmailOutbox(models.Model):
+    """
+    Durable queue of outgoing emails. Rows are written in the same
+    transaction as the change that triggers them and delivered by the
+    ``process_email_outbox`` worker.
+    """
+    user = models.ForeignKey(
+        CustomUser,
+        null=True,
+        blank=True,
+        on_delete=models.CASCADE,
+        related_name='outbox_emails'
+    )
+    kind = models.CharField(
+        max_length=3,
+        choices=OutboxKind.choices,
+        default=OutboxKind.VERIFICATION
+    )
+    to_email = models.EmailField(_("recipient"))
+    context = models.JSONField(
+        default=dict,
+        help_text=_("Template context used to render the message")
+    )
+    status = models.CharField(
+        max_length=3,
+        choices=OutboxStatus.choices,
+        default=OutboxStatus.PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now,
+        help_text=_("Earliest time the worker may (re)try delivery")
+    )
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = _("outbox email")
+        verbose_name_plural = _("outbox emails")
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} to {self.to_email} ({self.get_status_display()})"
+
+
+class RevokedToken(models.Model):
+    """
+    Revoked JWTs. A row with a ``jti`` revokes that one token; a row without
+    one revokes every token issued to ``user`` before ``created_at``. Rows
+    are kept until ``expires_at``, after which the tokens they cover would
+    be rejected anyway.
+    """
+    jti = models.CharField(max_length=255, blank=True, db_index=True)
+    user = models.ForeignKey(
+        CustomUser,
+        null=True,
+        blank=True,
+        on_delete=models.CASCADE,
+        related_name='revoked_tokens'
+    )
+    expires_at = models.DateTimeField(db_index=True)
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        verbose_name = _("revoked token")
+        verbose_name_plural = _("revoked tokens")
+
+    def __str__(self):
+        if self.jti:
+            return f"Token {self.jti}"
+        return f"All tokens for user {self.user_id} before {self.created_at}"
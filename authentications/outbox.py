@@ -0,0 +1,187 @@
+# authentications/outbox.py
+"""
+Transactional email outbox.
+
+Views enqueue messages inside their own database transaction; the
+``process_email_outbox`` management command claims due rows in batches,
+delivers them over a single reused SMTP connection per batch and
+reschedules failures with exponential backoff.
+"""
+from datetime import timedelta
+import logging
+import random
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.db import transaction
+from django.utils import timezone
+from .models import EmailOutbox, OutboxKind, OutboxStatus
+from .utils import build_verification_email
+
+logger = logging.getLogger(__name__)
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def enqueue_verification_email(user, verification_url):
+    """
+    Queue a verification email for ``user``. Call this inside the same
+    transaction that creates the user so both commit (or roll back) together.
+    """
+    return EmailOutbox.objects.create(
+        user=user,
+        kind=OutboxKind.VERIFICATION,
+        to_email=user.email,
+        context={
+            'first_name': user.first_name,
+            'verification_url': verification_url,
+        },
+    )
+
+
+def enqueue_verification_emails(users_and_urls, batch_size=500):
+    """
+    Queue verification emails for many users with batched inserts.
+    ``users_and_urls`` is an iterable of ``(user, verification_url)`` pairs.
+    """
+    return EmailOutbox.objects.bulk_create(
+        [
+            EmailOutbox(
+                user=user,
+                kind=OutboxKind.VERIFICATION,
+                to_email=user.email,
+                context={
+                    'first_name': user.first_name,
+                    'verification_url': verification_url,
+                },
+            )
+            for user, verification_url in users_and_urls
+        ],
+        batch_size=batch_size,
+    )
+
+
+def build_message(entry, connection=None):
+    """Build the email message for an outbox row."""
+    if entry.kind == OutboxKind.VERIFICATION:
+        return build_verification_email(
+            entry.to_email,
+            entry.context.get('first_name', ''),
+            entry.context['verification_url'],
+            connection=connection,
+        )
+    raise ValueError(f"Unknown outbox kind: {entry.kind}")
+
+
+def backoff_delay(attempts):
+    """Exponential backoff with jitter for the given number of attempts."""
+    base = _setting('EMAIL_OUTBOX_BACKOFF_SECONDS', 30)
+    cap = _setting('EMAIL_OUTBOX_MAX_BACKOFF_SECONDS', 3600)
+    delay = min(cap, base * (2 ** max(attempts - 1, 0)))
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def claim_batch(batch_size=None):
+    """
+    Claim up to ``batch_size`` due rows and return them.
+
+    Claiming pushes ``next_attempt_at`` forward by the lease time, so a worker
+    that dies mid-batch simply lets its rows become due again. Concurrent
+    workers skip each other's locked rows rather than waiting on them.
+    """
+    batch_size = batch_size or _setting('EMAIL_OUTBOX_BATCH_SIZE', 50)
+    lease = timedelta(seconds=_setting('EMAIL_OUTBOX_LEASE_SECONDS', 300))
+    now = timezone.now()
+
+    with transaction.atomic():
+        entries = list(
+            EmailOutbox.objects
+            .select_for_update(skip_locked=True)
+            .filter(status=OutboxStatus.PENDING, next_attempt_at__lte=now)
+            .order_by('next_attempt_at')[:batch_size]
+        )
+        if entries:
+            EmailOutbox.objects.filter(
+                pk__in=[entry.pk for entry in entries]
+            ).update(next_attempt_at=now + lease)
+    return entries
+
+
+def deliver_batch(entries):
+    """
+    Deliver claimed rows over one email connection.
+
+    Returns a ``(sent, failed)`` tuple of counts. Failed rows are rescheduled
+    with backoff until ``EMAIL_OUTBOX_MAX_ATTEMPTS`` is reached.
+    """
+    if not entries:
+        return 0, 0
+
+    max_attempts = _setting('EMAIL_OUTBOX_MAX_ATTEMPTS', 5)
+    sent_ids = []
+    failed = []
+
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as e:
+        # No connection, no sends: every row counts an attempt and backs off
+        logger.error(f"Could not open email connection for {len(entries)} "
+                     f"outbox email(s): {str(e)}")
+        failed = [(entry, str(e)) for entry in entries]
+    else:
+        try:
+            for entry in entries:
+                try:
+                    build_message(entry, connection=connection).send()
+                    sent_ids.append(entry.pk)
+                except Exception as e:
+                    logger.warning(
+                        f"Failed to send outbox email {entry.pk}: {str(e)}")
+                    failed.append((entry, str(e)))
+        finally:
+            try:
+                connection.close()
+            except Exception as e:
+                logger.warning(f"Failed to close email connection: {str(e)}")
+
+    now = timezone.now()
+    if sent_ids:
+        EmailOutbox.objects.filter(pk__in=sent_ids).update(
+            status=OutboxStatus.SENT, sent_at=now, last_error='')
+
+    for entry, error in failed:
+        entry.attempts += 1
+        entry.last_error = error
+        if entry.attempts >= max_attempts:
+            entry.status = OutboxStatus.FAILED
+            logger.error(
+                f"Giving up on outbox email {entry.pk} after {entry.attempts} attempts")
+        else:
+            entry.next_attempt_at = now + backoff_delay(entry.attempts)
+    if failed:
+        EmailOutbox.objects.bulk_update(
+            [entry for entry, _error in failed],
+            ['attempts', 'last_error', 'status', 'next_attempt_at'],
+        )
+
+    return len(sent_ids), len(failed)
+
+
+def drain_outbox(batch_size=None, max_batches=None):
+    """
+    Process due rows until none are left (or ``max_batches`` is reached).
+    Returns the total ``(sent, failed)`` counts.
+    """
+    total_sent = total_failed = batches = 0
+    while max_batches is None or batches < max_batches:
+        entries = claim_batch(batch_size)
+        if not entries:
+            break
+        sent, failed = deliver_batch(entries)
+        total_sent += sent
+        total_failed += failed
+        batches += 1
+    return total_sent, total_failed
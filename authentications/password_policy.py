@@ -0,0 +1,159 @@
+# authentications/password_policy.py
+"""
+Single-pass password policy.
+
+``PasswordPolicy`` compiles the configured ``AUTH_PASSWORD_VALIDATORS`` into
+a set of thresholds and classifies every character of a password in one
+loop, instead of running each validator's own regex scan in turn. Validators
+it does not know how to compile are still called as normal. When a compiled
+rule fails, the original validator is asked for its error so messages and
+codes stay exactly as they were.
+"""
+import functools
+import operator
+import re
+
+from django.contrib.auth import password_validation
+from django.core.exceptions import ValidationError
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from . import validators as custom
+
+UPPER, LOWER, DIGIT, SPECIAL = 'upper', 'lower', 'digit', 'special'
+
+USER_INFO_ATTRIBUTES = ('email', 'first_name', 'last_name')
+
+
+def _character_table(special_pattern):
+    # Every character class used by the validators is ASCII-only
+    table = {}
+    special = re.compile(special_pattern)
+    for code in range(128):
+        char = chr(code)
+        flags = []
+        if 'A' <= char <= 'Z':
+            flags.append(UPPER)
+        elif 'a' <= char <= 'z':
+            flags.append(LOWER)
+        elif '0' <= char <= '9':
+            flags.append(DIGIT)
+        if special.match(char):
+            flags.append(SPECIAL)
+        if flags:
+            table[char] = tuple(flags)
+    return table
+
+
+# Validator class -> (scan counter, threshold attribute, failure comparison)
+COMPILED_RULES = {
+    password_validation.MinimumLengthValidator: ('length', 'min_length', operator.lt),
+    custom.MaxLengthValidator: ('length', 'max_length', operator.gt),
+    custom.SpecialCharacterValidator: (SPECIAL, 'min_special_chars', operator.lt),
+    custom.UppercaseValidator: (UPPER, 'min_uppercase', operator.lt),
+    custom.LowercaseValidator: (LOWER, 'min_lowercase', operator.lt),
+    custom.NumberValidator: (DIGIT, 'min_digits', operator.lt),
+    custom.RepeatedCharacterValidator: ('longest_run', 'max_repeats', operator.ge),
+    custom.NoUserInfoValidator: ('shares_user_info', None, operator.eq),
+}
+
+
+def _trigrams(value):
+    return {value[i:i + 3] for i in range(len(value) - 2)}
+
+
+class PasswordPolicy:
+    """
+    Evaluate every configured password rule in a single pass and report all
+    failures together.
+    """
+
+    def __init__(self, password_validators=None):
+        if password_validators is None:
+            password_validators = password_validation.get_default_password_validators()
+        self.validators = list(password_validators)
+        self.check_user_info = False
+        special_pattern = custom.SpecialCharacterValidator().special_pattern
+
+        # (validator, compiled rule) in configured order; a rule of None
+        # means the validator is delegated to as-is
+        self.rules = []
+        for validator in self.validators:
+            rule = COMPILED_RULES.get(type(validator))
+            if type(validator) is custom.SpecialCharacterValidator:
+                special_pattern = validator.special_pattern
+            if type(validator) is custom.NoUserInfoValidator:
+                self.check_user_info = True
+            self.rules.append((validator, rule))
+
+        self.table = _character_table(special_pattern)
+
+    def user_trigrams(self, user):
+        """Trigrams of the user's identifying attributes, computed once."""
+        trigrams = set()
+        if user is None:
+            return trigrams
+        for attribute in USER_INFO_ATTRIBUTES:
+            value = getattr(user, attribute, None)
+            if value:
+                trigrams |= _trigrams(value.lower())
+        return trigrams
+
+    def scan(self, password, user=None):
+        """Classify the password in one pass and return the counters."""
+        counts = {UPPER: 0, LOWER: 0, DIGIT: 0, SPECIAL: 0}
+        table = self.table
+        longest_run = run = 0
+        previous = None
+        for char in password:
+            for flag in table.get(char, ()):
+                counts[flag] += 1
+            if char == previous:
+                run += 1
+            else:
+                run = 1
+                previous = char
+            if run > longest_run:
+                longest_run = run
+
+        result = dict(counts, length=len(password),
+                      longest_run=longest_run, shares_user_info=False)
+        if self.check_user_info and user is not None:
+            user_trigrams = self.user_trigrams(user)
+            result['shares_user_info'] = bool(
+                user_trigrams and not user_trigrams.isdisjoint(
+                    _trigrams(password.lower())))
+        return result
+
+    def errors(self, password, user=None):
+        """Return a list of every ``ValidationError`` the password triggers."""
+        result = self.scan(password, user)
+        errors = []
+        for validator, rule in self.rules:
+            if rule is not None:
+                counter, threshold, fails = rule
+                limit = getattr(validator, threshold) if threshold else True
+                if not fails(result[counter], limit):
+                    continue
+            try:
+                validator.validate(password, user)
+            except ValidationError as error:
+                errors.append(error)
+        return errors
+
+    def validate(self, password, user=None):
+        """Raise a ``ValidationError`` holding all failures, if any."""
+        errors = self.errors(password, user)
+        if errors:
+            raise ValidationError(errors)
+
+
+@functools.cache
+def get_password_policy():
+    """The policy compiled from ``AUTH_PASSWORD_VALIDATORS``."""
+    return PasswordPolicy()
+
+
+@receiver(setting_changed)
+def _reset_password_policy(setting, **kwargs):
+    if setting == 'AUTH_PASSWORD_VALIDATORS':
+        get_password_policy.cache_clear()
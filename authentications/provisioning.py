@@ -0,0 +1,257 @@
+# authentications/provisioning.py
+"""
+Bulk user provisioning.
+
+Rows are processed in batches: validated without per-row queries, checked
+against existing accounts with one lookup per batch, password-hashed across
+a process pool (or, in request handlers, the shared hashing service's
+threads), inserted with ``bulk_create`` and given verification emails
+through the outbox in the same transaction. Users provisioned for an
+organisation become its members in that transaction too, as far as its user
+limit allows. Invalid rows are reported with their index and never abort
+the rest of the import.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from itertools import islice
+import logging
+import os
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
+from organisations.models import OrganisationMember, Subscription, UsageMetric
+from organisations.usage import current_usage, record_usage
+from .email_filter import registered_emails
+from .hashing import get_hashing_service
+from .outbox import enqueue_verification_emails
+from .serializers import ProvisionUserSerializer
+from .utils import build_verification_url
+
+logger = logging.getLogger(__name__)
+User = get_user_model()
+
+
+def _init_hash_worker():
+    # Needed when the pool spawns rather than forks its workers
+    django.setup()
+
+
+def _with_unusable(passwords, hashed):
+    # Rows without a password get an unusable one, which needs no hashing
+    hashed = iter(hashed)
+    return [next(hashed) if password else make_password(None)
+            for password in passwords]
+
+
+def _batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class PasswordHasherPool:
+    """Hashes passwords across worker processes (or inline for one worker)."""
+
+    def __init__(self, workers=None):
+        if workers is None:
+            workers = getattr(settings, 'PROVISIONING_HASH_WORKERS', None)
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = None
+        if self.workers > 1:
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_hash_worker)
+
+    def hash(self, passwords):
+        to_hash = [password for password in passwords if password]
+        if self.executor and len(to_hash) > 1:
+            chunksize = max(len(to_hash) // (self.workers * 4), 1)
+            hashed = list(self.executor.map(
+                make_password, to_hash, chunksize=chunksize))
+        else:
+            hashed = [make_password(password) for password in to_hash]
+        return _with_unusable(passwords, hashed)
+
+    def close(self):
+        if self.executor:
+            self.executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class SharedPasswordHasher:
+    """
+    Hashes on the process-wide ``HashingService`` threads. Request handlers
+    use this rather than starting a process pool per request.
+    """
+
+    def __init__(self, service=None):
+        self.service = service or get_hashing_service()
+
+    def hash(self, passwords):
+        return _with_unusable(passwords, self.service.make_passwords(
+            [password for password in passwords if password]))
+
+
+def existing_emails(emails):
+    """Lowercased emails from ``emails`` that already have an account."""
+    found = User.objects.filter_emails(emails).values_list('email', flat=True)
+    return {email.lower() for email in found}
+
+
+def provision_users(rows, organisation=None, send_verification=True,
+                    base_url=None, batch_size=None, workers=None, hasher=None):
+    """
+    Create users from an iterable of dicts with ``email`` and optional
+    ``first_name``, ``last_name`` and ``password`` keys.
+
+    If ``organisation`` is given, every email must belong to one of its
+    ``allowed_domains`` and the users join it as members; rows beyond its
+    user limit are reported as errors. Passwords are hashed with ``hasher`` if given,
+    otherwise on a ``PasswordHasherPool`` of ``workers`` processes started
+    for this call. Returns ``{'created': int, 'errors': [...]}`` where
+    each error names the zero-based row index it refers to.
+    """
+    batch_size = batch_size or getattr(settings, 'PROVISIONING_BATCH_SIZE', 500)
+    base_url = base_url or getattr(
+        settings, 'VERIFICATION_BASE_URL', 'http://localhost:8000')
+    allowed_domains = None
+    if organisation is not None:
+        allowed_domains = {
+            domain.lower().lstrip('@') for domain in organisation.allowed_domains}
+
+    result = {'created': 0, 'errors': []}
+    seen = set()
+
+    pool = PasswordHasherPool(workers) if hasher is None else nullcontext(hasher)
+    with pool as hasher:
+        for batch in _batched(enumerate(rows), batch_size):
+            valid = _validate_batch(batch, allowed_domains, seen, result)
+            if not valid:
+                continue
+
+            passwords = hasher.hash([data['password'] for _i, data in valid])
+            users = [
+                User(
+                    email=data['email'],
+                    first_name=data['first_name'],
+                    last_name=data['last_name'],
+                    password=password,
+                    is_active=False,
+                    email_verified=False,
+                )
+                for (_i, data), password in zip(valid, passwords)
+            ]
+            indexes = [index for index, _data in valid]
+            with transaction.atomic():
+                subscription = None
+                if organisation is not None:
+                    subscription, indexes, users = _reserve_seats(
+                        organisation, indexes, users, result)
+                created = _insert_batch(indexes, users, result)
+                if organisation is not None and created:
+                    _add_members(organisation, subscription, created)
+                if send_verification and created:
+                    enqueue_verification_emails(
+                        (user, build_verification_url(base_url, user))
+                        for user in created
+                    )
+            for user in created:
+                registered_emails.add(user.email)
+            result['created'] += len(created)
+
+    result['errors'].sort(key=lambda error: error['row'])
+    return result
+
+
+def _validate_batch(batch, allowed_domains, seen, result):
+    valid = []
+    for index, row in batch:
+        serializer = ProvisionUserSerializer(data=row)
+        if not serializer.is_valid():
+            result['errors'].append(
+                {'row': index, 'email': row.get('email'), 'errors': serializer.errors})
+            continue
+        data = serializer.validated_data
+        email = data['email']
+        domain = email.rsplit('@', 1)[-1]
+        if allowed_domains is not None and domain not in allowed_domains:
+            error = "Email domain is not allowed for this organisation."
+        elif email in seen:
+            error = "Duplicate email in this import."
+        else:
+            seen.add(email)
+            valid.append((index, data))
+            continue
+        result['errors'].append(
+            {'row': index, 'email': email, 'errors': {'email': [error]}})
+
+    taken = existing_emails([data['email'] for _i, data in valid])
+    if taken:
+        for index, data in valid:
+            if data['email'] in taken:
+                result['errors'].append({
+                    'row': index, 'email': data['email'],
+                    'errors': {'email': ["This email address is already in use."]}})
+        valid = [(index, data) for index, data in valid
+                 if data['email'] not in taken]
+    return valid
+
+
+def _reserve_seats(organisation, indexes, users, result):
+    """
+    Trim a batch to the seats left under the organisation's user limit. The
+    subscription row stays locked until the batch commits, so concurrent
+    provisioning cannot over-fill it.
+    """
+    subscription = Subscription.objects.select_for_update().filter(
+        organisation=organisation).first()
+    if subscription is None:
+        return None, indexes, users
+    room = max(organisation.tier_policy.max_users
+               - current_usage(subscription)[UsageMetric.USERS], 0)
+    for index, user in zip(indexes[room:], users[room:]):
+        result['errors'].append({
+            'row': index, 'email': user.email,
+            'errors': {'email': ["The organisation's user limit has been reached."]}})
+    return subscription, indexes[:room], users[:room]
+
+
+def _add_members(organisation, subscription, users):
+    OrganisationMember.objects.bulk_create(
+        [OrganisationMember(user=user, organisation=organisation) for user in users])
+    if subscription is not None:
+        transaction.on_commit(
+            lambda: record_usage(subscription, UsageMetric.USERS, len(users)))
+
+
+def _insert_batch(indexes, users, result):
+    """
+    Insert a batch in one statement. If a concurrent registration makes the
+    batch violate a constraint, fall back to row-by-row inserts so only the
+    conflicting rows fail.
+    """
+    try:
+        with transaction.atomic():
+            return User.objects.bulk_create(users)
+    except IntegrityError:
+        logger.warning("Bulk insert conflicted; retrying batch row by row")
+
+    created = []
+    for index, user in zip(indexes, users):
+        try:
+            with transaction.atomic():
+                user.save(force_insert=True)
+            created.append(user)
+        except IntegrityError:
+            user.pk = None
+            result['errors'].append({
+                'row': index, 'email': user.email,
+                'errors': {'email': ["This email address is already in use."]}})
+    return created
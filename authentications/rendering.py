@@ -0,0 +1,85 @@
+# authentications/rendering.py
+"""
+Precompiled email templates.
+
+Transactional emails are large static documents with a handful of
+per-recipient values. Each template is rendered once with marker values in
+place of those fields, and both the HTML and the tag-stripped plain-text
+output are split into static segments. Rendering for a recipient is then a
+join of the cached segments with the (escaped) field values.
+"""
+import re
+import uuid
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.template.loader import get_template
+from django.utils.html import conditional_escape, strip_tags
+
+_compiled_templates = {}
+
+
+class CompiledEmailTemplate:
+    """
+    A template pre-rendered around a fixed set of context fields.
+
+    Fields must be output as plain ``{{ variable }}`` tags; filters or
+    branches that depend on a field's value cannot be precompiled.
+    """
+
+    def __init__(self, template_name, fields):
+        self.template_name = template_name
+        self.fields = tuple(fields)
+
+        marker = uuid.uuid4().hex
+        pattern = re.compile(f'{marker}(\\w+){marker}')
+        context = {field: f'{marker}{field}{marker}' for field in self.fields}
+
+        html = get_template(template_name).render(context)
+        text = strip_tags(html)
+
+        self.html_parts = self._split(pattern, marker, html)
+        self.text_parts = self._split(pattern, marker, text)
+
+    def _split(self, pattern, marker, rendered):
+        # re.split alternates static text and captured field names
+        parts = pattern.split(rendered)
+        if any(marker in part.lower() for part in parts[::2]):
+            raise ImproperlyConfigured(
+                f"{self.template_name} transforms a precompiled field; "
+                "output fields as plain variables.")
+        return tuple(parts)
+
+    def _join(self, parts, values):
+        pieces = list(parts)
+        pieces[1::2] = [values[field] for field in parts[1::2]]
+        return ''.join(pieces)
+
+    def render(self, context):
+        """Return ``(html, text)`` for the given context."""
+        values = {
+            field: str(conditional_escape(context.get(field, '')))
+            for field in self.fields
+        }
+        return self._join(self.html_parts, values), self._join(self.text_parts, values)
+
+
+def get_email_template(template_name, fields):
+    """Return the cached compiled template, compiling it on first use."""
+    key = (template_name, tuple(fields))
+    compiled = _compiled_templates.get(key)
+    if compiled is None:
+        compiled = _compiled_templates[key] = CompiledEmailTemplate(
+            template_name, fields)
+    return compiled
+
+
+def clear_email_template_cache():
+    _compiled_templates.clear()
+
+
+@receiver(setting_changed)
+def _reset_on_template_settings_change(setting, **kwargs):
+    if setting == 'TEMPLATES':
+        clear_email_template_cache()
@@ -0,0 +1,123 @@
+# authentications/revocation.py
+"""
+In-process JWT revocation list.
+
+Access tokens are authenticated from their claims alone, so revocation has
+to be checked without a query per request. Every process keeps the
+unexpired ``RevokedToken`` rows in memory: token ids in a dict and
+"everything issued before" cut-offs per user. Revocations made locally apply
+immediately; those made by other processes are picked up by an incremental
+sync every ``JWT_REVOCATION_SYNC_SECONDS``.
+
+The sync reads rows created since the last one, less an overlap window, so
+a revocation whose transaction committed late is still seen. Entries are
+dropped from memory once the tokens they cover have expired.
+"""
+from datetime import datetime, timedelta, timezone as dt_timezone
+import threading
+import time
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+from .models import RevokedToken
+
+SYNC_OVERLAP = timedelta(seconds=60)
+
+
+class TokenRevocationList:
+    """Process-wide set of revoked token ids and per-user cut-offs."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.jtis = {}
+        self.user_cutoffs = {}
+        self.synced_until = None
+        self.last_sync = 0.0
+
+    @property
+    def sync_interval(self):
+        return getattr(settings, 'JWT_REVOCATION_SYNC_SECONDS', 5)
+
+    def _apply(self, jti, user_id, created_at, expires_at):
+        expires = expires_at.timestamp()
+        if jti:
+            self.jtis[jti] = expires
+        elif user_id is not None:
+            # ``iat`` has one-second resolution, so tokens issued in the
+            # same second as the revocation are still accepted
+            cutoff = int(created_at.timestamp())
+            current = self.user_cutoffs.get(user_id)
+            if current is None or cutoff > current[0]:
+                self.user_cutoffs[user_id] = (cutoff, expires)
+
+    def _prune(self, now):
+        self.jtis = {jti: exp for jti, exp in self.jtis.items() if exp > now}
+        self.user_cutoffs = {
+            user_id: entry for user_id, entry in self.user_cutoffs.items()
+            if entry[1] > now
+        }
+
+    def sync(self, force=False):
+        """Load revocations created since the last sync."""
+        if not force and self.synced_until is not None and \
+                time.monotonic() - self.last_sync < self.sync_interval:
+            return
+        with self.lock:
+            started = timezone.now()
+            rows = RevokedToken.objects.filter(expires_at__gt=started)
+            if self.synced_until is not None:
+                rows = rows.filter(created_at__gte=self.synced_until - SYNC_OVERLAP)
+            for jti, user_id, created_at, expires_at in rows.values_list(
+                    'jti', 'user_id', 'created_at', 'expires_at').iterator():
+                self._apply(jti, user_id, created_at, expires_at)
+            self._prune(started.timestamp())
+            self.synced_until = started
+            self.last_sync = time.monotonic()
+
+    def is_revoked(self, payload):
+        """True if the token with this payload has been revoked."""
+        self.sync()
+        if payload.get(api_settings.JTI_CLAIM) in self.jtis:
+            return True
+        cutoff = self.user_cutoffs.get(payload.get(api_settings.USER_ID_CLAIM))
+        return cutoff is not None and payload.get('iat', 0) < cutoff[0]
+
+    def revoke(self, token):
+        """Revoke a single token until it expires."""
+        jti = token[api_settings.JTI_CLAIM]
+        expires_at = datetime.fromtimestamp(token['exp'], tz=dt_timezone.utc)
+        entry = RevokedToken.objects.create(
+            jti=jti,
+            user_id=token.get(api_settings.USER_ID_CLAIM),
+            expires_at=expires_at,
+        )
+        with self.lock:
+            self._apply(entry.jti, entry.user_id, entry.created_at, entry.expires_at)
+        return entry
+
+    def revoke_user(self, user):
+        """
+        Revoke every token issued to ``user`` so far, e.g. after a password
+        change or when the account is disabled.
+        """
+        entry = RevokedToken.objects.create(
+            user=user,
+            expires_at=timezone.now() + api_settings.REFRESH_TOKEN_LIFETIME,
+        )
+        with self.lock:
+            self._apply('', entry.user_id, entry.created_at, entry.expires_at)
+        return entry
+
+
+revoked_tokens = TokenRevocationList()
+
+
+def purge_expired_revocations():
+    """Delete revocation rows whose tokens have all expired."""
+    deleted, _counts = RevokedToken.objects.filter(
+        expires_at__lte=timezone.now()).delete()
+    return deleted
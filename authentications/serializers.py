@@ -1,9 +1,18 @@
 # authentications/serializers.py
-from django.contrib.auth import get_user_model, password_validation
+from django.contrib.auth import get_user_model
 from django.core import validators
 from django.core.exceptions import ValidationError
+from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from .email_filter import email_is_registered
+from .hashing import get_hashing_service
 from .models import CustomUser
+from .password_policy import get_password_policy
+from .revocation import revoked_tokens
+from .tokens import ClaimsRefreshToken, token_claims
 
 
 class RegistrationSerializer(serializers.ModelSerializer):
@@ -27,16 +36,15 @@ class RegistrationSerializer(serializers.ModelSerializer):
     def validate_email(self, value):
 
         # Custom email validation - check if email already exists
-        if CustomUser.objects.filter(email__iexact=value).exists():
+        if email_is_registered(value):
             raise serializers.ValidationError(
                 "This email address is already in use.")
         return value.lower()
 
     def validate_password(self, value):
-        # Validate password using Django's password validators
+        # Validate password against every rule in AUTH_PASSWORD_VALIDATORS
         try:
-            # This will use all validators from AUTH_PASSWORD_VALIDATORS
-            password_validation.validate_password(value)
+            get_password_policy().validate(value)
         except ValidationError as e:
             raise serializers.ValidationError(list(e.messages))
         return value
@@ -54,13 +62,16 @@ class RegistrationSerializer(serializers.ModelSerializer):
         # Remove password_confirm from the data
         validated_data.pop('password_confirm')
 
-        # Create the user using the custom manager
-        user = CustomUser.objects.create_user(
-            email=validated_data['email'],
-            password=validated_data['password'],
+        # Hash on the shared pool, which raises HashingServiceBusy when
+        # saturated rather than queueing registrations without bound
+        user = CustomUser(
+            email=CustomUser.objects.normalize_email(validated_data['email']),
             first_name=validated_data.get('first_name', ''),
             last_name=validated_data.get('last_name', ''),
+            is_active=False,
+            password=get_hashing_service().hash_password(validated_data['password']),
         )
+        user.save()
 
         return user
 
@@ -74,3 +85,88 @@ class UserSerializer(serializers.ModelSerializer):
         fields = ('email', 'first_name', 'last_name',
                   'is_active', 'email_verified')
         read_only_fields = ('is_active', 'email_verified')
+
+
+class ProvisionUserSerializer(serializers.Serializer):
+    """
+    Validates one row of a bulk provisioning request. Database checks
+    (existing emails, allowed domains) are done once for the whole batch.
+    """
+    email = serializers.EmailField(
+        validators=[
+            validators.EmailValidator(message="Enter a valid email address.")
+        ]
+    )
+    first_name = serializers.CharField(
+        max_length=150, required=False, allow_blank=True, default='')
+    last_name = serializers.CharField(
+        max_length=150, required=False, allow_blank=True, default='')
+    password = serializers.CharField(
+        write_only=True, required=False, allow_blank=True, default='')
+
+    def validate_email(self, value):
+        return value.lower()
+
+    def validate_password(self, value):
+        # Rows without a password get an unusable one
+        if not value:
+            return value
+        try:
+            get_password_policy().validate(value)
+        except ValidationError as e:
+            raise serializers.ValidationError(list(e.messages))
+        return value
+
+
+class ProvisionRequestSerializer(serializers.Serializer):
+    organisation = serializers.UUIDField(required=False, allow_null=True)
+    send_verification = serializers.BooleanField(default=True)
+    users = serializers.ListField(
+        child=serializers.DictField(), allow_empty=False)
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Issues a token pair carrying the user's organisation claims."""
+    token_class = ClaimsRefreshToken
+
+
+class ClaimsTokenRefreshSerializer(serializers.Serializer):
+    """
+    Issues a new access token for a refresh token that has not been revoked,
+    re-reading the organisation claims so tier or role changes take effect.
+    """
+    refresh = serializers.CharField()
+    access = serializers.CharField(read_only=True)
+
+    def validate(self, attrs):
+        refresh = ClaimsRefreshToken(attrs['refresh'])
+        if revoked_tokens.is_revoked(refresh.payload):
+            raise InvalidToken(_("Token has been revoked"))
+
+        user = (
+            User.objects
+            .select_related('owned_organisation', 'organisation_membership__organisation')
+            .filter(pk=refresh[jwt_settings.USER_ID_CLAIM], is_active=True)
+            .first()
+        )
+        if user is None:
+            raise InvalidToken(_("User not found or inactive"))
+
+        for claim, value in token_claims(user).items():
+            refresh[claim] = value
+        return {'access': str(refresh.access_token)}
+
+
+class LogoutSerializer(serializers.Serializer):
+    refresh = serializers.CharField()
+
+    def validate_refresh(self, value):
+        try:
+            token = ClaimsRefreshToken(value)
+        except TokenError as e:
+            raise serializers.ValidationError(str(e))
+        user = self.context['request'].user
+        if token.get(jwt_settings.USER_ID_CLAIM) != user.pk:
+            raise serializers.ValidationError(
+                _("Token does not belong to the current user"))
+        return token
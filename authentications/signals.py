@@ -0,0 +1,11 @@
+# authentications/signals.py
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from .email_filter import registered_emails
+from .models import CustomUser
+
+
+@receiver(post_save, sender=CustomUser)
+def track_registered_email(sender, instance, **kwargs):
+    # Keep the negative-lookup filter in step with local saves
+    registered_emails.add(instance.email)
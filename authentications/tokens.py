@@ -0,0 +1,77 @@
+# authentications/tokens.py
+"""
+JWTs that carry the caller's organisation context.
+
+Access tokens embed ``organisation_id``, ``subscription_tier``, ``role`` and,
+for members, ``member_role`` (their role in the organisation's
+``role_hierarchy``), plus the staff flags DRF permissions look at, so
+requests can be authenticated and authorised from the token alone. Claims are read from the
+database when a token pair is issued and again on every refresh, so changes
+such as a tier upgrade reach clients within one access token lifetime.
+"""
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class Role:
+    OWNER = 'owner'
+    MEMBER = 'member'
+
+
+def token_claims(user):
+    """The organisation claims for ``user``."""
+    organisation = getattr(user, 'owned_organisation', None)
+    role, member_role = Role.OWNER, None
+    if organisation is None:
+        membership = getattr(user, 'organisation_membership', None)
+        organisation = membership.organisation if membership else None
+        role = Role.MEMBER
+        member_role = membership.role if membership else None
+    return {
+        'email': user.email,
+        'is_staff': user.is_staff,
+        'is_superuser': user.is_superuser,
+        'organisation_id': str(organisation.pk) if organisation else None,
+        'subscription_tier': organisation.subscription_tier if organisation else None,
+        'role': role,
+        'member_role': member_role,
+    }
+
+
+class ClaimsRefreshToken(RefreshToken):
+    """Refresh token whose claims are copied into each access token."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for claim, value in token_claims(user).items():
+            token[claim] = value
+        return token
+
+
+class ClaimsTokenUser(TokenUser):
+    """A user built from validated token claims, without a database query."""
+
+    @cached_property
+    def email(self):
+        return self.token.get('email', '')
+
+    @cached_property
+    def organisation_id(self):
+        return self.token.get('organisation_id')
+
+    @cached_property
+    def subscription_tier(self):
+        return self.token.get('subscription_tier')
+
+    @cached_property
+    def role(self):
+        return self.token.get('role', Role.MEMBER)
+
+    @cached_property
+    def member_role(self):
+        return self.token.get('member_role')
+
+    def __str__(self):
+        return self.email or super().__str__()
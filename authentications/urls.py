@@ -10,4 +10,11 @@ urlpatterns = [
          views.EmailVerificationView.as_view(), name='verify-email'),
     path('check-email/', views.EmailCheckView.as_view(), name='check-email'),
     path('check-password/', views.PasswordCheckView.as_view(), name='check-password'),
+    path('provision/', views.BulkProvisionView.as_view(), name='provision'),
+    path('hashing-metrics/', views.HashingMetricsView.as_view(),
+         name='hashing-metrics'),
+    path('token/', views.TokenObtainView.as_view(), name='token'),
+    path('token/refresh/', views.TokenRefreshClaimsView.as_view(),
+         name='token-refresh'),
+    path('logout/', views.LogoutView.as_view(), name='logout'),
 ]
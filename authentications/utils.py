@@ -1,41 +1,121 @@
 # authentications/utils.py
+from django.contrib.auth import get_user_model
+from django.contrib.auth.tokens import default_token_generator
+from django.core import signing
 from django.core.mail import EmailMultiAlternatives
-from django.template.loader import render_to_string
-from django.utils.html import strip_tags
 from django.conf import settings
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+from .rendering import get_email_template
 
+VERIFICATION_TEMPLATE = 'authentications/activation.html'
+VERIFICATION_FIELDS = ('first_name', 'verification_url',
+                       'email_address', 'plain_email_address')
+VERIFICATION_SALT = 'authentications.email-verification'
 
-def send_verification_email(user, verification_url):
+
+class VerificationResult:
+    VERIFIED = 'verified'
+    ALREADY_VERIFIED = 'already_verified'
+    INVALID_TOKEN = 'invalid_token'
+
+
+def make_verification_token(user):
     """
-    Send an email verification link to the user.
+    A signed, timestamped token for the user's ``verification_uuid``. It can
+    be checked without reading the user row, so verifying costs one UPDATE.
+    """
+    return signing.TimestampSigner(salt=VERIFICATION_SALT).sign(
+        user.verification_uuid.hex)
+
+
+def build_verification_url(base_url, user):
+    """
+    Build the email verification link for a saved user under ``base_url``.
+    """
+    uid = urlsafe_base64_encode(force_bytes(user.pk))
+    token = make_verification_token(user)
+    return f"{base_url.rstrip('/')}/verify-email/{uid}/{token}"
+
+
+def verify_email(uid, token):
+    """
+    Verify the user ``uid`` with a token from their verification link and
+    return a ``VerificationResult``.
+
+    Signed tokens are checked in memory and applied with one conditional
+    UPDATE; the row is only read again when that update matches nothing, to
+    tell an already verified user from a bad token. Tokens made by the
+    default token generator, as sent before signed tokens were introduced,
+    are still accepted. Raises ``DoesNotExist`` (or ``ValueError`` for a
+    malformed ``uid``) when the user cannot be found.
+    """
+    User = get_user_model()
+    try:
+        verification_uuid = signing.TimestampSigner(salt=VERIFICATION_SALT).unsign(
+            token, max_age=settings.PASSWORD_RESET_TIMEOUT)
+    except signing.BadSignature:
+        return _verify_legacy_token(User, uid, token)
+
+    if User.objects.filter(pk=uid, verification_uuid=verification_uuid).verify_emails():
+        return VerificationResult.VERIFIED
+    user = User.objects.only('email_verified', 'verification_uuid').get(pk=uid)
+    if user.verification_uuid.hex != verification_uuid:
+        return VerificationResult.INVALID_TOKEN
+    return VerificationResult.ALREADY_VERIFIED
+
+
+def _verify_legacy_token(User, uid, token):
+    # Only the fields the token hash depends on are loaded
+    user = User.objects.only(
+        'password', 'last_login', 'email', 'email_verified').get(pk=uid)
+    if not default_token_generator.check_token(user, token):
+        return VerificationResult.INVALID_TOKEN
+    if user.email_verified or not User.objects.filter(pk=user.pk).verify_emails():
+        return VerificationResult.ALREADY_VERIFIED
+    return VerificationResult.VERIFIED
+
+
+def build_verification_email(email, first_name, verification_url, connection=None):
+    """
+    Build (but do not send) the email verification message for an address.
     """
     # Format the plain email address with spaces around @ for anti-spam
     plain_email_address = 'This message was sent to ' + \
-        user.email.replace('@', ' @ ')
+        email.replace('@', ' @ ')
 
     context = {
-        'first_name': user.first_name,
+        'first_name': first_name,
         'verification_url': verification_url,
-        'email_address': user.email,
+        'email_address': email,
         'plain_email_address': plain_email_address,
     }
 
     # Create email content
     subject = "Please verify your email address"
-    html_message = render_to_string(
-        'authentications/activation.html', context)
-    plain_message = strip_tags(html_message)
+    html_message, plain_message = get_email_template(
+        VERIFICATION_TEMPLATE, VERIFICATION_FIELDS).render(context)
 
     # Create the email message
     message = EmailMultiAlternatives(
         subject=subject,
         body=plain_message,
         from_email=None,
-        to=[user.email],
+        to=[email],
+        connection=connection,
     )
 
     # Attach HTML version
     message.attach_alternative(html_message, "text/html")
+    return message
+
+
+def send_verification_email(user, verification_url):
+    """
+    Send an email verification link to the user.
+    """
+    message = build_verification_email(
+        user.email, user.first_name, verification_url)
 
     # Send the email
     message.send(fail_silently=False)
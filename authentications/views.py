@@ -1,18 +1,30 @@
 # authentications/views.py
 from rest_framework import status, views
 from rest_framework.response import Response
-from rest_framework.permissions import AllowAny
-from django.contrib.auth import get_user_model, password_validation
-from django.contrib.auth.tokens import default_token_generator
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 from django.core.validators import validate_email as django_validate_email
-from django.utils.encoding import force_bytes, force_str
-from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
+from django.db import IntegrityError, transaction
+from django.utils.encoding import force_str
+from django.utils.http import urlsafe_base64_decode
 from django.utils.translation import gettext_lazy as _
-from django_ratelimit.decorators import ratelimit
 from django.utils.decorators import method_decorator
-from .serializers import RegistrationSerializer, UserSerializer
-from .utils import send_verification_email
+from backlogger_api.ratelimit import ratelimit
+from organisations.domains import join_organisation_by_domain
+from organisations.models import Organisation
+from .serializers import (
+    ClaimsTokenObtainPairSerializer, ClaimsTokenRefreshSerializer, LogoutSerializer,
+    ProvisionRequestSerializer, RegistrationSerializer, UserSerializer,
+)
+from .email_filter import email_is_registered
+from .hashing import HashingServiceBusy, get_hashing_service
+from .outbox import enqueue_verification_email
+from .password_policy import get_password_policy
+from .provisioning import SharedPasswordHasher, provision_users
+from .revocation import revoked_tokens
+from .utils import VerificationResult, build_verification_url, verify_email
 import logging
 
 logger = logging.getLogger(__name__)
@@ -25,32 +37,35 @@ class RegistrationView(views.APIView):
 
     @method_decorator(ratelimit(key='ip', rate='5/m', method=['POST']))
     def post(self, request):
-        # Register a new user and send verification email.
+        # Register a new user and queue their verification email.
         serializer = self.serializer_class(data=request.data)
 
         try:
             if serializer.is_valid():
-                # Create inactive user
-                user = serializer.save(is_active=False)
-
-                # Generate verification URL
-                uid = urlsafe_base64_encode(force_bytes(user.pk))
-                token = default_token_generator.make_token(user)
-
-                # Build verification URL
-                verification_url = f"{request.build_absolute_uri(
-                    '/').rstrip('/')}/verify-email/{uid}/{token}"
-
-                # Send verification email
                 try:
-                    send_verification_email(user, verification_url)
-                except Exception as e:
-                    logger.error(
-                        f"Failed to send verification email: {str(e)}")
-                    user.delete()  # Rollback user creation if email fails
+                    with transaction.atomic():
+                        # Create inactive user; it joins an organisation
+                        # by domain once its email is verified
+                        user = serializer.save(is_active=False)
+
+                        # Build verification URL
+                        verification_url = build_verification_url(
+                            request.build_absolute_uri('/'), user)
+
+                        # Queue the verification email; it is only delivered
+                        # once the user row has committed alongside it
+                        enqueue_verification_email(user, verification_url)
+                except IntegrityError:
+                    # Lost a race with a concurrent registration for the
+                    # same email; the unique constraint is the final guard
                     return Response(
-                        {'error': 'Failed to send verification email'},
-                        status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                        {'email': ['This email address is already in use.']},
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
+                except HashingServiceBusy:
+                    return Response(
+                        {'error': 'Too many registrations in progress, please try again shortly.'},
+                        status=status.HTTP_503_SERVICE_UNAVAILABLE
                     )
 
                 return Response({
@@ -74,25 +89,28 @@ class EmailVerificationView(views.APIView):
     def get(self, request, uidb64, token):
         try:
             uid = force_str(urlsafe_base64_decode(uidb64))
-            user = User.objects.get(pk=uid)
 
-            # Check if the token is valid
-            if not default_token_generator.check_token(user, token):
+            with transaction.atomic():
+                # Check the token and mark the user verified in one conditional
+                # update, so concurrent clicks cannot both succeed
+                result = verify_email(uid, token)
+
+                # Only a verified address takes a seat in the organisation
+                # that owns its domain
+                if result == VerificationResult.VERIFIED:
+                    join_organisation_by_domain(User.objects.only('email').get(pk=uid))
+
+            if result == VerificationResult.INVALID_TOKEN:
                 return Response({
                     'error': 'Invalid or expired verification token'
                 }, status=status.HTTP_400_BAD_REQUEST)
 
             # Prevent already verified users from re-verifying
-            if user.email_verified:
+            if result == VerificationResult.ALREADY_VERIFIED:
                 return Response({
                     'error': 'Email has already been verified'
                 }, status=status.HTTP_400_BAD_REQUEST)
 
-            # Mark the email as verified
-            user.email_verified = True
-            user.is_active = True
-            user.save()
-
             return Response({
                 'message': 'Email successfully verified'
             }, status=status.HTTP_200_OK)
@@ -121,8 +139,8 @@ class EmailCheckView(views.APIView):
             # Validate email format
             django_validate_email(email)
 
-            # Check if email already exists
-            if User.objects.filter(email=email).exists():
+            # Check if email already exists (case-insensitive)
+            if email_is_registered(email):
                 return Response(
                     {'error': 'This email address is already registered'},
                     status=status.HTTP_400_BAD_REQUEST
@@ -150,14 +168,93 @@ class PasswordCheckView(views.APIView):
                 'error': 'Password is required'
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        try:
-            # Use Django's password validation utility
-            password_validation.validate_password(password)
+        # Evaluate every password rule in one pass
+        errors = get_password_policy().errors(password)
+        if errors:
             return Response({
-                'message': 'Password meets requirements'
-            }, status=status.HTTP_200_OK)
-
-        except ValidationError as e:
-            return Response({
-                'error': e.messages[0] if e.messages else 'Invalid password'
+                'error': errors[0].messages[0],
+                'errors': [
+                    {'code': item.code, 'message': item.messages[0]}
+                    for error in errors for item in error.error_list
+                ]
             }, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            'message': 'Password meets requirements'
+        }, status=status.HTTP_200_OK)
+
+
+class BulkProvisionView(views.APIView):
+    permission_classes = [IsAdminUser]
+    serializer_class = ProvisionRequestSerializer
+
+    def post(self, request):
+        """Create many users at once, reporting per-row errors."""
+        serializer = self.serializer_class(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        organisation = None
+        organisation_id = serializer.validated_data.get('organisation')
+        if organisation_id:
+            try:
+                organisation = Organisation.objects.get(pk=organisation_id)
+            except Organisation.DoesNotExist:
+                return Response(
+                    {'organisation': ['Organisation not found']},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+        result = provision_users(
+            serializer.validated_data['users'],
+            organisation=organisation,
+            send_verification=serializer.validated_data['send_verification'],
+            base_url=request.build_absolute_uri('/'),
+            hasher=SharedPasswordHasher(),
+        )
+        response_status = status.HTTP_201_CREATED if result['created'] \
+            else status.HTTP_400_BAD_REQUEST
+        return Response(result, status=response_status)
+
+
+class HashingMetricsView(views.APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        """Usage counters for the password hashing pool."""
+        return Response(get_hashing_service().metrics(), status=status.HTTP_200_OK)
+
+
+class TokenObtainView(TokenObtainPairView):
+    serializer_class = ClaimsTokenObtainPairSerializer
+
+    @method_decorator(ratelimit(key='ip', rate='10/m', method=['POST']))
+    def post(self, request, *args, **kwargs):
+        """Exchange credentials for an access/refresh token pair."""
+        try:
+            return super().post(request, *args, **kwargs)
+        except HashingServiceBusy:
+            return Response(
+                {'error': 'Too many logins in progress, please try again shortly.'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+
+
+class TokenRefreshClaimsView(TokenRefreshView):
+    serializer_class = ClaimsTokenRefreshSerializer
+
+
+class LogoutView(views.APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        """Revoke the given refresh token and the access token in use."""
+        serializer = LogoutSerializer(data=request.data, context={'request': request})
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        revoked_tokens.revoke(serializer.validated_data['refresh'])
+        if request.auth is not None and hasattr(request.auth, 'payload'):
+            revoked_tokens.revoke(request.auth)
+
+        return Response({'message': 'Logged out'}, status=status.HTTP_200_OK)
@@ -0,0 +1,58 @@
+# backlogger_api/dirty_fields.py
+"""
+Model mixin that tracks which fields changed since the instance was loaded
+or last saved, so ``save()`` can validate and write only those fields.
+"""
+import copy
+
+
+def _snapshot(value):
+    # JSON fields hold mutable containers that may be changed in place
+    return copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+
+
+class DirtyFieldsMixin:
+    """
+    Remembers the value of every loaded concrete field. ``get_dirty_fields()``
+    returns the names of fields whose value has changed since then, or None
+    for instances not yet saved (where every field counts as changed).
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot_fields()
+        return instance
+
+    def _snapshot_fields(self, names=None):
+        loaded = getattr(self, '_loaded_values', None)
+        if names is None or loaded is None:
+            deferred = self.get_deferred_fields()
+            fields = [field for field in self._meta.concrete_fields
+                      if field.attname not in deferred]
+            loaded = self._loaded_values = {}
+        else:
+            fields = [self._meta.get_field(name) for name in names]
+        for field in fields:
+            loaded[field.attname] = _snapshot(getattr(self, field.attname))
+
+    def get_dirty_fields(self):
+        loaded = getattr(self, '_loaded_values', None)
+        if self._state.adding or loaded is None:
+            return None
+        deferred = self.get_deferred_fields()
+        return {
+            field.name for field in self._meta.concrete_fields
+            if field.attname not in deferred and (
+                field.attname not in loaded
+                or getattr(self, field.attname) != loaded[field.attname])
+        }
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Fields left out of update_fields are still unsaved, so stay dirty
+        self._snapshot_fields(kwargs.get('update_fields'))
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        self._snapshot_fields(fields)
@@ -0,0 +1,38 @@
+# backlogger_api/pagination.py
+"""
+Paginators that avoid ``COUNT(*)`` over large tables.
+"""
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Uses PostgreSQL's row estimate (``pg_class.reltuples``) as the count of
+    an unfiltered queryset, once the table holds more than
+    ``ADMIN_ESTIMATED_COUNT_THRESHOLD`` rows. Filtered querysets, small
+    tables and other databases get an exact count.
+    """
+
+    def estimated_count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql' or queryset.query.where:
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+                [connection.ops.quote_name(queryset.model._meta.db_table)],
+            )
+            row = cursor.fetchone()
+        # reltuples is -1 until the table is first analysed
+        if row and row[0] >= getattr(settings, 'ADMIN_ESTIMATED_COUNT_THRESHOLD', 100000):
+            return int(row[0])
+        return None
+
+    @cached_property
+    def count(self):
+        estimate = self.estimated_count()
+        return super().count if estimate is None else estimate
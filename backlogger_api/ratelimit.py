@@ -0,0 +1,226 @@
+# backlogger_api/ratelimit.py
+"""
+Host-wide sliding-window rate limiting without an external cache.
+
+Counters live in a memory-mapped file (``/dev/shm`` where available), so
+every worker process on the host enforces one shared limit instead of each
+keeping its own LocMem counters. The file is a fixed-size open-addressing
+table of slots::
+
+    key hash (u64) | window index (i64) | current count (u32) | previous count (u32)
+
+Each check locks one stripe of the table (a thread lock plus a POSIX
+byte-range lock for other processes), estimates the sliding-window count as
+``previous * (1 - elapsed / period) + current`` and, if allowed, increments
+the current window. Where ``fcntl`` is unavailable the table is still used,
+but only within the current process.
+"""
+from functools import wraps
+import hashlib
+import mmap
+import os
+import re
+import struct
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django_ratelimit.exceptions import Ratelimited
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+SLOT = struct.Struct('<QqII')
+PROBES = 8
+STRIPES = 256
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+RATE_RE = re.compile(r'^(\d+)/(\d*)([smhd])$')
+
+
+def parse_rate(rate):
+    """Parse ``'5/m'`` or ``'100/15m'`` into ``(limit, period_seconds)``."""
+    match = RATE_RE.match(rate)
+    if not match:
+        raise ImproperlyConfigured(f"Invalid rate limit: {rate!r}")
+    count, multiplier, unit = match.groups()
+    return int(count), int(multiplier or 1) * PERIODS[unit]
+
+
+def default_path():
+    directory = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+    return os.path.join(directory, 'backlogger_api-ratelimit')
+
+
+class SharedRateLimiter:
+    """Sliding-window counters in a memory-mapped table shared by processes."""
+
+    def __init__(self, path, slots):
+        self.path = path
+        self.stripe_size = max(slots // STRIPES, 1)
+        # Whole stripes only, so probing never runs past the table
+        self.slots = slots - slots % self.stripe_size
+        self.size = self.slots * SLOT.size
+        self.thread_locks = [threading.Lock() for _ in range(STRIPES)]
+        self.pid = None
+        self.fd = None
+        self.map = None
+
+    def _open(self):
+        # Re-open after fork so each process has its own descriptor
+        if self.pid == os.getpid():
+            return
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        if os.fstat(fd).st_size < self.size:
+            os.ftruncate(fd, self.size)
+        self.map = mmap.mmap(fd, self.size)
+        self.fd = fd
+        self.pid = os.getpid()
+
+    def _hash(self, key):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest()
+        return int.from_bytes(digest, 'little') or 1
+
+    def _acquire(self, stripe):
+        self.thread_locks[stripe % STRIPES].acquire()
+        if fcntl is not None:
+            fcntl.lockf(self.fd, fcntl.LOCK_EX, self.stripe_size * SLOT.size,
+                        stripe * self.stripe_size * SLOT.size)
+
+    def _release(self, stripe):
+        if fcntl is not None:
+            fcntl.lockf(self.fd, fcntl.LOCK_UN, self.stripe_size * SLOT.size,
+                        stripe * self.stripe_size * SLOT.size)
+        self.thread_locks[stripe % STRIPES].release()
+
+    def hit(self, key, limit, period, now=None):
+        """
+        Count one request for ``key`` and return ``(allowed, estimate)``.
+        Rejected requests are not counted against the window.
+        """
+        self._open()
+        now = time.time() if now is None else now
+        window = int(now // period)
+        key_hash = self._hash(key)
+        home = key_hash % self.slots
+        stripe = home // self.stripe_size
+
+        self._acquire(stripe)
+        try:
+            slot = self._find(key_hash, home, window)
+            stored_hash, stored_window, stored_current, stored_previous = \
+                SLOT.unpack_from(self.map, slot * SLOT.size)
+            if stored_hash == key_hash and stored_window == window:
+                current, previous = stored_current, stored_previous
+            elif stored_hash == key_hash and stored_window == window - 1:
+                current, previous = 0, stored_current
+            else:
+                current, previous = 0, 0
+
+            elapsed = (now % period) / period
+            estimate = previous * (1 - elapsed) + current
+            allowed = estimate + 1 <= limit
+            if allowed:
+                current += 1
+            SLOT.pack_into(self.map, slot * SLOT.size,
+                           key_hash, window, current, previous)
+        finally:
+            self._release(stripe)
+        return allowed, estimate + (1 if allowed else 0)
+
+    def _find(self, key_hash, home, window):
+        """
+        Probe for the key's slot; otherwise take an empty or expired slot,
+        or as a last resort evict the stalest one in the probe range.
+        """
+        # Probes stay inside the home slot's stripe so one lock covers them
+        stripe_start = home - home % self.stripe_size
+        candidates = [
+            stripe_start + (home - stripe_start + i) % self.stripe_size
+            for i in range(min(PROBES, self.stripe_size))
+        ]
+        free = None
+        stalest = None
+        for slot in candidates:
+            stored_hash, stored_window, _current, _previous = \
+                SLOT.unpack_from(self.map, slot * SLOT.size)
+            if stored_hash == key_hash:
+                return slot
+            if free is None and (stored_hash == 0 or stored_window < window - 1):
+                free = slot
+            if stalest is None or stored_window < stalest[1]:
+                stalest = (slot, stored_window)
+        return free if free is not None else stalest[0]
+
+    def reset(self):
+        """Clear every counter (used by tests)."""
+        self._open()
+        self.map[:] = bytes(self.size)
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter():
+    path = getattr(settings, 'RATELIMIT_SHM_PATH', None) or default_path()
+    slots = getattr(settings, 'RATELIMIT_SHM_SLOTS', 65536)
+    key = (path, slots)
+    limiter = _limiters.get(key)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.setdefault(key, SharedRateLimiter(path, slots))
+    return limiter
+
+
+def client_ip(group, request):
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def user_or_ip(group, request):
+    if request.user.is_authenticated:
+        return str(request.user.pk)
+    return client_ip(group, request)
+
+
+KEYS = {
+    'ip': client_ip,
+    'user_or_ip': user_or_ip,
+}
+
+
+def ratelimit(key='ip', rate=None, method=None, group=None, block=True):
+    """
+    Decorator with the same shape as ``django_ratelimit.decorators.ratelimit``
+    for function views (wrap with ``method_decorator`` for class-based views),
+    backed by the shared-memory limiter. Sets ``request.limited`` and, when
+    ``block`` is true, raises ``Ratelimited`` (a 403) once the limit is hit.
+    """
+    limit, period = parse_rate(rate)
+    key_func = KEYS.get(key, key)
+    if not callable(key_func):
+        raise ImproperlyConfigured(f"Unknown rate limit key: {key!r}")
+    methods = {method} if isinstance(method, str) else (
+        set(method) if method else None)
+
+    def decorator(fn):
+        name = group or f"{fn.__module__}.{fn.__qualname__}"
+
+        @wraps(fn)
+        def _wrapped(request, *args, **kwargs):
+            limited = False
+            if getattr(settings, 'RATELIMIT_ENABLE', True) and (
+                    methods is None or request.method in methods):
+                value = key_func(name, request)
+                allowed, _estimate = get_limiter().hit(
+                    f"{name}:{rate}:{value}", limit, period)
+                limited = not allowed
+            request.limited = limited or getattr(request, 'limited', False)
+            if limited and block:
+                raise Ratelimited()
+            return fn(request, *args, **kwargs)
+        return _wrapped
+    return decorator
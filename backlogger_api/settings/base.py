@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+from datetime import timedelta
 from pathlib import Path
 import os
 
@@ -55,6 +56,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'organisations.tenancy.TenantContextMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -149,6 +151,95 @@ AUTH_PASSWORD_VALIDATORS = [
 # Use custom user model
 AUTH_USER_MODEL = 'authentications.CustomUser'
 
+# Password checks run on the shared hashing pool (see authentications/hashing.py)
+AUTHENTICATION_BACKENDS = ['authentications.backends.HashingServiceBackend']
+
+# Token authentication: access tokens carry organisation claims and are
+# authenticated without database queries (see authentications/tokens.py)
+REST_FRAMEWORK = {
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'authentications.authentication.ClaimsJWTAuthentication',
+        'rest_framework.authentication.SessionAuthentication',
+    ],
+}
+
+SIMPLE_JWT = {
+    'ACCESS_TOKEN_LIFETIME': timedelta(minutes=5),
+    'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
+    'UPDATE_LAST_LOGIN': False,
+    'AUTH_HEADER_TYPES': ('Bearer',),
+    'TOKEN_USER_CLASS': 'authentications.tokens.ClaimsTokenUser',
+    'TOKEN_OBTAIN_SERIALIZER': 'authentications.serializers.ClaimsTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'authentications.serializers.ClaimsTokenRefreshSerializer',
+}
+
+# How often each process picks up revocations made elsewhere
+JWT_REVOCATION_SYNC_SECONDS = 5
+
+# In-process Bloom filter of registered emails (see authentications/email_filter.py)
+EMAIL_FILTER_CAPACITY = 100000
+EMAIL_FILTER_ERROR_RATE = 0.01
+EMAIL_FILTER_REFRESH_SECONDS = 30
+
+# Shared password hashing pool (see authentications/hashing.py)
+PASSWORD_HASHING_WORKERS = None  # defaults to min(4, CPU count)
+PASSWORD_HASHING_MAX_PENDING = None  # defaults to 8 jobs per worker
+
+# Host-wide shared-memory rate limiting (see backlogger_api/ratelimit.py)
+RATELIMIT_SHM_PATH = os.getenv('RATELIMIT_SHM_PATH')  # defaults to /dev/shm
+RATELIMIT_SHM_SLOTS = 65536
+
+# Bulk user provisioning (see authentications/provisioning.py)
+PROVISIONING_BATCH_SIZE = 500
+PROVISIONING_HASH_WORKERS = None  # provision_users command; defaults to the number of CPUs
+VERIFICATION_BASE_URL = os.getenv('VERIFICATION_BASE_URL', 'http://localhost:8000')
+
+# Subscription tier policies (see organisations/tiers.py). Overrides map a
+# tier code to TierPolicy fields, e.g. {'PRO': {'max_users': 75}}; the
+# JSON file, if set, is re-read when it changes
+TIER_POLICY_OVERRIDES = {}
+TIER_POLICY_FILE = os.getenv('TIER_POLICY_FILE')
+TIER_POLICY_CHECK_SECONDS = 30
+
+# Subscription usage metering (see organisations/usage.py)
+USAGE_COUNTER_SHARDS = 8
+USAGE_FLUSH_SECONDS = 5
+USAGE_FLUSH_MAX_PENDING = 1000
+
+# Usage history (see organisations/metering.py)
+METERING_BATCH_SIZE = 1000
+METERING_HOURLY_RETENTION_DAYS = 90  # then rolled up to daily peaks
+
+# Organisation audit trail (see organisations/audit.py)
+AUDIT_BATCH_SIZE = 500
+
+# Per-process cache of request tenant contexts (see organisations/tenancy.py)
+TENANT_CACHE_SIZE = 1024
+TENANT_CACHE_TTL = 30  # seconds
+
+# Email domain to organisation map used at registration; other processes'
+# changes are picked up on reload (see organisations/domains.py)
+ORGANISATION_DOMAIN_REFRESH_SECONDS = 60
+
+# Compiled role hierarchies kept per process (see organisations/rbac.py)
+RBAC_CACHE_SIZE = 1024
+
+# Subscription lifecycle sweeper (see organisations/lifecycle.py)
+SUBSCRIPTION_SWEEP_CHUNK_SIZE = 500
+
+# Bulk item import (see items/imports.py)
+ITEM_IMPORT_BATCH_SIZE = 1000
+ITEM_IMPORT_MAX_ERRORS = 1000  # row errors kept on each ImportJob
+ITEM_IMPORT_LEASE_SECONDS = 600  # running jobs not updated for this long are reclaimed
+
+# Streaming item export; rows fetched per cursor round trip (see items/exports.py)
+ITEM_EXPORT_CHUNK_SIZE = 2000
+ITEM_EXPORT_STATEMENT_TIMEOUT_SECONDS = 60  # per cursor fetch, PostgreSQL only
+
+# Admin changelists on tables larger than this show PostgreSQL's row
+# estimate instead of running COUNT(*) (see backlogger_api/pagination.py)
+ADMIN_ESTIMATED_COUNT_THRESHOLD = 100000
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.1/topics/i18n/
 
@@ -166,6 +257,10 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Uploaded files, e.g. queued item imports
+MEDIA_URL = 'media/'
+MEDIA_ROOT = os.getenv('MEDIA_ROOT', BASE_DIR / 'media')
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
@@ -178,6 +273,13 @@ EMAIL_PORT = os.getenv('EMAIL_PORT')
 EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD')
 
+# Email outbox worker (see authentications/outbox.py)
+EMAIL_OUTBOX_BATCH_SIZE = 50
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+EMAIL_OUTBOX_BACKOFF_SECONDS = 30
+EMAIL_OUTBOX_MAX_BACKOFF_SECONDS = 3600
+EMAIL_OUTBOX_LEASE_SECONDS = 300
+
 SECURE_HEADERS = {
     'X-Frame-Options': 'DENY',
     'X-XSS-Protection': '1; mode=block',
@@ -1,3 +1,39 @@
+# items/admin.py
 from django.contrib import admin
+from backlogger_api.pagination import EstimatedCountPaginator
+from .models import ImportJob, Item
 
-# Register your models here.
+
+class ItemAdmin(admin.ModelAdmin):
+    model = Item
+    list_display = ("title", "node_type", "organisation", "depth", "updated_at")
+    list_filter = ("node_type",)
+    list_select_related = ("organisation",)
+    search_fields = ("title",)
+    raw_id_fields = ("organisation", "parent")
+    readonly_fields = ("path", "depth", "created_at", "updated_at")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_readonly_fields(self, request, obj=None):
+        # Reparenting must go through Item.move_to() to rewrite the subtree
+        if obj is not None:
+            return self.readonly_fields + ("organisation", "parent")
+        return self.readonly_fields
+
+
+admin.site.register(Item, ItemAdmin)
+
+
+class ImportJobAdmin(admin.ModelAdmin):
+    model = ImportJob
+    list_display = ("id", "organisation", "format", "status", "items_created",
+                    "rows_failed", "created_at")
+    list_filter = ("status", "format")
+    list_select_related = ("organisation",)
+    raw_id_fields = ("organisation", "created_by")
+    readonly_fields = ("rows_processed", "items_created", "rows_failed", "errors",
+                       "message", "created_at", "started_at", "finished_at", "updated_at")
+
+
+admin.site.register(ImportJob, ImportJobAdmin)
@@ -0,0 +1,104 @@
+# items/closure.py
+"""
+Maintenance of the ``ItemClosure`` ancestry table.
+
+The table holds one row for every (ancestor, descendant) pair of live
+items, so "everything above X" and "everything below Y" are one indexed
+join for any set of items, not just a single path prefix. Rows are kept
+in step incrementally, inside the transaction that changes the tree:
+
+- a new item gets its rows from its path in one INSERT (``Item.save``);
+- a moved subtree loses its rows to its old ancestors and gains the cross
+  product of its new ancestors and its own members, one DELETE and one
+  INSERT ... SELECT whatever its size (``relink_subtree``);
+- a soft-deleted subtree drops out of the table (``unlink_subtree``).
+
+``rebuild_closure()`` regenerates the rows for everything, an
+organisation or a subtree set-based, one INSERT ... SELECT per level of
+depth, for repairs and after items are created with ``bulk_create``.
+"""
+from django.db import connection, transaction
+from django.db.models import Max, Q
+from .models import Item, ItemClosure
+
+
+def _table(model):
+    return connection.ops.quote_name(model._meta.db_table)
+
+
+def _subtree_rows(item):
+    return ItemClosure.objects.filter(ancestor=item).values('descendant_id')
+
+
+def unlink_subtree(item):
+    """Delete every closure row of ``item``'s subtree."""
+    return ItemClosure.objects.filter(descendant__in=_subtree_rows(item)).delete()[0]
+
+
+def relink_subtree(item, old_ancestor_ids):
+    """
+    Replace the rows joining ``item``'s subtree to ``old_ancestor_ids`` with
+    rows joining it to its current ancestors. Call after the move.
+    """
+    if old_ancestor_ids:
+        ItemClosure.objects.filter(
+            descendant__in=_subtree_rows(item),
+            ancestor_id__in=old_ancestor_ids,
+        ).delete()
+    if item.parent_id is None:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {_table(ItemClosure)} (ancestor_id, descendant_id, depth) "
+            f"SELECT above.ancestor_id, below.descendant_id, above.depth + below.depth + 1 "
+            f"FROM {_table(ItemClosure)} above, {_table(ItemClosure)} below "
+            f"WHERE above.descendant_id = %s AND below.ancestor_id = %s",
+            [item.parent_id, item.pk],
+        )
+
+
+def rebuild_closure(organisation=None, subtree=None):
+    """
+    Regenerate the closure rows of every live item, of ``organisation``'s
+    items, or of ``subtree`` (an item and its descendants, whose ancestors'
+    rows must already be correct). Returns the number of rows written.
+    """
+    items = Item.objects.all()
+    where, params = ["item.deleted_at IS NULL"], []
+    if organisation is not None:
+        items = items.filter(organisation=organisation)
+        where.append("item.organisation_id = %s")
+        params.append(Item._meta.get_field('organisation').target_field
+                      .get_db_prep_value(organisation.pk, connection))
+    if subtree is not None:
+        items = items.filter(Q(pk=subtree.pk) | Q(path__startswith=subtree.subtree_path))
+        where.append("(item.id = %s OR item.path LIKE %s)")
+        params.extend([subtree.pk, subtree.subtree_path + '%'])
+
+    first_level = subtree.depth if subtree is not None else 1
+    where = " AND ".join(where)
+    written = 0
+    with transaction.atomic(), connection.cursor() as cursor:
+        # Deleted items' rows go too, in case any were left behind
+        ItemClosure.objects.filter(descendant__in=items.values('pk')).delete()
+        bounds = items.active().aggregate(deepest=Max('depth'))
+        if bounds['deepest'] is None:
+            return 0
+        cursor.execute(
+            f"INSERT INTO {_table(ItemClosure)} (ancestor_id, descendant_id, depth) "
+            f"SELECT item.id, item.id, 0 FROM {_table(Item)} item WHERE {where}",
+            params,
+        )
+        written += cursor.rowcount
+        # Each level copies its parents' rows, which the previous level wrote
+        for level in range(first_level, bounds['deepest'] + 1):
+            cursor.execute(
+                f"INSERT INTO {_table(ItemClosure)} (ancestor_id, descendant_id, depth) "
+                f"SELECT closure.ancestor_id, item.id, closure.depth + 1 "
+                f"FROM {_table(Item)} item "
+                f"JOIN {_table(ItemClosure)} closure ON closure.descendant_id = item.parent_id "
+                f"WHERE {where} AND item.depth = %s",
+                params + [level],
+            )
+            written += cursor.rowcount
+    return written
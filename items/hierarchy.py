@@ -0,0 +1,223 @@
+# items/hierarchy.py
+"""
+Parent/child rules for item types, per methodology and subscription tier.
+
+``RULES`` transcribes ``_documentation/hierarchy_v2.txt``: each rule lets
+some child types sit under some parent types (``None`` being the top of the
+organisation) in some methodologies, on some tiers, when some organisation
+feature flags are on. Scrum and Waterfall rules also need the organisation's
+``enable_scrum_hierarchy`` and ``enable_waterfall`` flags.
+
+``HierarchyMatrix`` compiles the rules once into a dense array indexed by
+(methodology, tier, parent type, child type). Each cell is -1 where the
+placement is never allowed, and otherwise the mask of feature flags it
+needs. Validating a placement is a few dict lookups, one array read and a
+bitwise AND, with no queries, so creates, moves and bulk imports can check
+every item cheaply.
+"""
+from array import array
+from dataclasses import dataclass
+import threading
+
+from django.core.exceptions import ValidationError
+from django.utils.translation import gettext_lazy as _
+from organisations.models import ProjectFramework, SubscriptionTier
+from organisations.tiers import FEATURE_FLAGS, get_tier_policy
+from .models import NodeType
+
+DENIED = -1
+
+FLAG_BITS = {flag: 1 << index for index, flag in enumerate(FEATURE_FLAGS)}
+
+METHODOLOGY_FLAGS = {
+    ProjectFramework.SCRUM: 'enable_scrum_hierarchy',
+    ProjectFramework.WATERFALL: 'enable_waterfall',
+}
+
+EVERY_METHODOLOGY = frozenset(ProjectFramework.values)
+EVERY_TIER = frozenset(SubscriptionTier.values)
+STARTER_ONLY = frozenset({SubscriptionTier.STARTER})
+PRO_AND_ABOVE = EVERY_TIER - STARTER_ONLY
+BUSINESS_AND_ABOVE = frozenset({SubscriptionTier.BUSINESS, SubscriptionTier.ENTERPRISE})
+
+KANBAN = frozenset({ProjectFramework.KANBAN})
+SCRUM = frozenset({ProjectFramework.SCRUM})
+WATERFALL = frozenset({ProjectFramework.WATERFALL})
+
+# Layers above projects, shared by every methodology
+TOP_LAYERS = frozenset({None, NodeType.OBJECTIVE, NodeType.PLATFORM})
+
+WORK_ITEMS = (NodeType.TASK, NodeType.BUG, NodeType.IMPROVEMENT)
+ADVANCED_ITEMS = (NodeType.TECHNICAL_DEBT, NodeType.SPIKE, NodeType.TEST, NodeType.IMPEDIMENT)
+BUSINESS_ITEMS = (NodeType.DEFECT, NodeType.SUPPORT_TICKET, NodeType.CHANGE_REQUEST)
+WATERFALL_PHASES = (
+    NodeType.REQUIREMENTS_PHASE, NodeType.DESIGN_PHASE, NodeType.IMPLEMENTATION_PHASE,
+    NodeType.TESTING_PHASE, NodeType.DEPLOYMENT_PHASE, NodeType.MAINTENANCE_PHASE,
+)
+
+
+@dataclass(frozen=True)
+class HierarchyRule:
+    methodologies: frozenset
+    parents: tuple
+    children: tuple
+    tiers: frozenset = EVERY_TIER
+    flags: tuple = ()
+
+
+RULES = (
+    # Objective and platform layers
+    HierarchyRule(EVERY_METHODOLOGY, (None,), (NodeType.OBJECTIVE,),
+                  flags=('enable_objective_layer',)),
+    HierarchyRule(EVERY_METHODOLOGY, (None,), (NodeType.PLATFORM,),
+                  flags=('enable_platform_layer',)),
+    HierarchyRule(EVERY_METHODOLOGY, (NodeType.OBJECTIVE,), (NodeType.PLATFORM,),
+                  flags=('enable_objective_layer', 'enable_platform_layer')),
+    HierarchyRule(EVERY_METHODOLOGY, (None,), (NodeType.PROJECT,)),
+    HierarchyRule(EVERY_METHODOLOGY, (NodeType.OBJECTIVE,), (NodeType.PROJECT,),
+                  flags=('enable_objective_layer',)),
+    HierarchyRule(EVERY_METHODOLOGY, (NodeType.PLATFORM,), (NodeType.PROJECT,),
+                  flags=('enable_platform_layer',)),
+
+    # Kanban: Starter has no structure between projects and work items
+    HierarchyRule(KANBAN, (NodeType.PROJECT,), WORK_ITEMS, STARTER_ONLY),
+    HierarchyRule(KANBAN, (NodeType.PROJECT,), (NodeType.FEATURE,), PRO_AND_ABOVE),
+    HierarchyRule(KANBAN, (NodeType.FEATURE,), (NodeType.EPIC,), PRO_AND_ABOVE),
+    HierarchyRule(KANBAN, (NodeType.EPIC,), WORK_ITEMS + ADVANCED_ITEMS, PRO_AND_ABOVE),
+    HierarchyRule(KANBAN, (NodeType.EPIC,), BUSINESS_ITEMS, BUSINESS_AND_ABOVE),
+
+    # Scrum
+    HierarchyRule(SCRUM, (NodeType.PROJECT,), (
+        NodeType.FEATURE, NodeType.SPRINT_TASK, NodeType.SPRINT_BUG,
+        NodeType.SPRINT_IMPEDIMENT), PRO_AND_ABOVE),
+    HierarchyRule(SCRUM, (NodeType.FEATURE,), (NodeType.EPIC,), PRO_AND_ABOVE),
+    HierarchyRule(SCRUM, (NodeType.EPIC,), (NodeType.USER_STORY,) + ADVANCED_ITEMS,
+                  PRO_AND_ABOVE),
+    HierarchyRule(SCRUM, (NodeType.USER_STORY,), WORK_ITEMS, PRO_AND_ABOVE),
+
+    # Waterfall
+    HierarchyRule(WATERFALL, (NodeType.PROJECT,), WATERFALL_PHASES, BUSINESS_AND_ABOVE),
+    HierarchyRule(WATERFALL, (NodeType.REQUIREMENTS_PHASE,), (
+        NodeType.BUSINESS_REQUIREMENT, NodeType.FUNCTIONAL_REQUIREMENT,
+        NodeType.NON_FUNCTIONAL_REQUIREMENT, NodeType.CHANGE_REQUEST), BUSINESS_AND_ABOVE),
+    HierarchyRule(WATERFALL, (NodeType.DESIGN_PHASE,), (
+        NodeType.SYSTEM_DESIGN_DOCUMENT, NodeType.ARCHITECTURE_SPECIFICATION,
+        NodeType.UI_UX_DESIGN, NodeType.WIREFRAME, NodeType.PROTOTYPE), BUSINESS_AND_ABOVE),
+    HierarchyRule(WATERFALL, (NodeType.IMPLEMENTATION_PHASE,), (
+        NodeType.TASK, NodeType.CODE_MODULE, NodeType.INTEGRATION_TASK,
+        NodeType.CONFIGURATION_ITEM, NodeType.TECHNICAL_DEBT), BUSINESS_AND_ABOVE),
+    HierarchyRule(WATERFALL, (NodeType.TESTING_PHASE,), (
+        NodeType.TEST_PLAN, NodeType.TEST_CASE, NodeType.DEFECT, NodeType.BUG,
+        NodeType.REGRESSION_TEST, NodeType.PERFORMANCE_TEST,
+        NodeType.SECURITY_TEST), BUSINESS_AND_ABOVE),
+    HierarchyRule(WATERFALL, (NodeType.DEPLOYMENT_PHASE,), (
+        NodeType.RELEASE_PLAN, NodeType.DEPLOYMENT_TASK, NodeType.ROLLBACK_PLAN,
+        NodeType.DEPLOYMENT_VALIDATION), BUSINESS_AND_ABOVE),
+    HierarchyRule(WATERFALL, (NodeType.MAINTENANCE_PHASE,), (
+        NodeType.SUPPORT_TICKET, NodeType.INCIDENT_REPORT, NodeType.CHANGE_REQUEST,
+        NodeType.PATCH, NodeType.ENHANCEMENT), BUSINESS_AND_ABOVE),
+)
+
+
+def organisation_flags(organisation):
+    """The mask of ``organisation``'s enabled feature flags."""
+    mask = 0
+    for flag, bit in FLAG_BITS.items():
+        if getattr(organisation, flag):
+            mask |= bit
+    return mask
+
+
+class HierarchyMatrix:
+    """Dense lookup of the flags each (methodology, tier, parent, child) needs."""
+
+    def __init__(self, rules):
+        self.methodologies = {value: index for index, value in enumerate(ProjectFramework.values)}
+        self.tiers = {value: index for index, value in enumerate(SubscriptionTier.values)}
+        self.children = {value: index for index, value in enumerate(NodeType.values)}
+        # Parent index 0 is the top of the organisation
+        self.parents = {None: 0, **{value: index + 1 for value, index in self.children.items()}}
+
+        self.cells = array('b', [DENIED]) * (
+            len(self.methodologies) * len(self.tiers) * len(self.parents) * len(self.children))
+        for rule in rules:
+            for methodology in rule.methodologies:
+                flags = rule.flags + ((METHODOLOGY_FLAGS[methodology],)
+                                      if methodology in METHODOLOGY_FLAGS else ())
+                mask = 0
+                for flag in flags:
+                    mask |= FLAG_BITS[flag]
+                for tier in rule.tiers:
+                    for parent in rule.parents:
+                        for child in rule.children:
+                            index = self.index(methodology, tier, parent, child)
+                            # Where rules overlap, keep the one needing fewer flags
+                            if self.cells[index] == DENIED or not mask & ~self.cells[index]:
+                                self.cells[index] = mask
+
+    def index(self, methodology, tier, parent_type, child_type):
+        return ((self.methodologies[methodology] * len(self.tiers) + self.tiers[tier])
+                * len(self.parents) + self.parents[parent_type]) * len(self.children) \
+            + self.children[child_type]
+
+    def required_flags(self, methodology, tier, parent_type, child_type):
+        """The mask of flags the placement needs, or ``DENIED``."""
+        try:
+            return self.cells[self.index(methodology, tier, parent_type, child_type)]
+        except KeyError:
+            return DENIED
+
+    def allows(self, methodology, tier, parent_type, child_type, flags):
+        required = self.required_flags(methodology, tier, parent_type, child_type)
+        return required != DENIED and required & flags == required
+
+
+_lock = threading.Lock()
+_matrix = None
+
+
+def hierarchy_matrix():
+    """The matrix compiled from ``RULES``, built once per process."""
+    global _matrix
+    if _matrix is None:
+        with _lock:
+            if _matrix is None:
+                _matrix = HierarchyMatrix(RULES)
+    return _matrix
+
+
+def placement_error(organisation, parent_type, child_type, methodology, flags=None):
+    """
+    Why ``child_type`` cannot go under ``parent_type`` (None for the top
+    level) in a ``methodology`` project of ``organisation``, or None if it
+    can. ``flags`` is ``organisation_flags(organisation)``, passed in by
+    callers checking many items.
+    """
+    tier = organisation.subscription_tier
+    if methodology not in get_tier_policy(tier).methodologies:
+        return _("This methodology is not available on the current tier")
+    if flags is None:
+        flags = organisation_flags(organisation)
+
+    required = hierarchy_matrix().required_flags(methodology, tier, parent_type, child_type)
+    context = {
+        'child': NodeType(child_type).label,
+        'parent': NodeType(parent_type).label if parent_type else _('the organisation'),
+        'methodology': ProjectFramework(methodology).label,
+    }
+    if required == DENIED:
+        return _("%(child)s items cannot be placed under %(parent)s in %(methodology)s "
+                 "projects on this tier") % context
+    missing = [flag for flag, bit in FLAG_BITS.items() if required & bit and not flags & bit]
+    if missing:
+        context['flags'] = ', '.join(missing)
+        return _("%(child)s items under %(parent)s in %(methodology)s projects need "
+                 "%(flags)s") % context
+    return None
+
+
+def validate_placement(organisation, parent_type, child_type, methodology):
+    """Raise ``ValidationError`` unless the placement is allowed."""
+    error = placement_error(organisation, parent_type, child_type, methodology)
+    if error:
+        raise ValidationError({'node_type': error})
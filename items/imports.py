@@ -0,0 +1,414 @@
+# items/imports.py
+"""
+Bulk item import from CSV or NDJSON.
+
+Files are read a row at a time (``read_rows``) and imported in batches of
+``ITEM_IMPORT_BATCH_SIZE`` rows, so memory stays flat however large the
+file. Each row may have these columns:
+
+- ``ref``: the item's key in the source tool, stored as ``external_id``;
+- ``parent_ref``: the ``ref`` of its parent, which must appear earlier in
+  the file or have been imported before, or ``parent``: the id of an
+  existing item;
+- ``node_type`` (a code or label), ``title``, ``description`` and
+  ``framework`` (defaults to the parent's or the organisation's).
+
+For each batch, duplicate refs and parents are resolved with one indexed
+query (two if rows also name parents by id), each distinct placement is
+checked once against the compiled hierarchy rules, and in one transaction
+the subscription's item limit is checked, the items are inserted with one
+``bulk_create`` per level of the batch, their closure rows with another,
+and the job's progress is updated once. The created items are recorded
+against the subscription's usage when the batch commits.
+Invalid rows, and rows below them, are reported on the ``ImportJob`` with
+their zero-based index and never abort the rest of the import.
+
+A job's ``rows_processed`` commits with each batch, so it is always the
+number of leading rows already imported; running the job again resumes
+after them rather than creating their items twice. Each batch also
+refreshes the job's ``updated_at``, and a running job that has not been
+updated for ``ITEM_IMPORT_LEASE_SECONDS`` is taken to have lost its worker
+and is claimed again.
+"""
+from datetime import timedelta
+from itertools import islice
+import codecs
+import csv
+import json
+import logging
+import os
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+from organisations.models import ProjectFramework, Subscription, UsageMetric
+from organisations.usage import current_usage, record_usage
+from .hierarchy import TOP_LAYERS, organisation_flags, placement_error
+from .models import (
+    MAX_PATH_LENGTH, PATH_STEP, ImportFormat, ImportJob, ImportStatus, Item, ItemClosure,
+    NodeType,
+)
+
+logger = logging.getLogger(__name__)
+
+FORMAT_EXTENSIONS = {
+    '.csv': ImportFormat.CSV,
+    '.ndjson': ImportFormat.NDJSON,
+    '.jsonl': ImportFormat.NDJSON,
+}
+
+MAX_DEPTH = MAX_PATH_LENGTH // PATH_STEP - 1
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _choices(choices):
+    """Codes of ``choices`` keyed by lowercased code and label."""
+    lookup = {}
+    for value, label in choices.choices:
+        lookup[value.lower()] = value
+        lookup[str(label).lower()] = value
+    return lookup
+
+
+def _text(row, key):
+    value = row.get(key)
+    return '' if value is None else str(value).strip()
+
+
+def format_for_name(name):
+    """The ``ImportFormat`` implied by a file name's extension, or None."""
+    return FORMAT_EXTENSIONS.get(os.path.splitext(name or '')[1].lower())
+
+
+def read_rows(stream, format):
+    """
+    Yield the rows of a binary ``stream`` of UTF-8 CSV or NDJSON as dicts,
+    one line at a time. NDJSON lines that are not JSON objects yield a
+    ``ValueError`` in their place, reported as that row's error.
+    """
+    lines = codecs.iterdecode(stream, 'utf-8-sig')
+    if format == ImportFormat.CSV:
+        yield from csv.DictReader(lines)
+        return
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield ValueError(f"Invalid JSON: {e}")
+            continue
+        yield row if isinstance(row, dict) else ValueError("Each line must be a JSON object")
+
+
+class ItemImporter:
+    """Imports rows into a job's organisation, one batch per transaction."""
+
+    def __init__(self, job, batch_size=None):
+        self.job = job
+        self.organisation = job.organisation
+        self.batch_size = batch_size or _setting('ITEM_IMPORT_BATCH_SIZE', 1000)
+        self.max_errors = _setting('ITEM_IMPORT_MAX_ERRORS', 1000)
+        self.subscription_id = Subscription.objects.filter(
+            organisation=self.organisation).values_list('pk', flat=True).first()
+        self.max_items = self.organisation.tier_policy.max_items
+        self.flags = organisation_flags(self.organisation)
+        self.node_types = _choices(NodeType)
+        self.frameworks = _choices(ProjectFramework)
+        # (framework, parent type, child type) -> error or None
+        self.placements = {}
+        self.limit_reached = False
+        self.failed = 0
+
+    def run(self, rows):
+        # Skip the rows that earlier runs of this job committed
+        start = self.job.rows_processed
+        for batch in _batched(enumerate(islice(rows, start, None), start), self.batch_size):
+            self.import_batch(batch)
+            if self.limit_reached:
+                break
+        return self.job
+
+    def fail(self, index, ref, errors):
+        self.failed += 1
+        if len(self.job.errors) < self.max_errors:
+            self.job.errors.append({'row': index, 'ref': ref, 'errors': errors})
+
+    def parse(self, row):
+        """Clean one row without queries: ``(data, None)`` or ``(None, errors)``."""
+        if isinstance(row, ValueError):
+            return None, {'row': [str(row)]}
+        data = {name: _text(row, name) for name in (
+            'ref', 'parent_ref', 'parent', 'node_type', 'framework', 'title', 'description')}
+        errors = {}
+        if len(data['ref']) > Item._meta.get_field('external_id').max_length:
+            errors['ref'] = ["Ensure this field has no more than 100 characters."]
+        if not data['title']:
+            errors['title'] = ["This field is required."]
+        elif len(data['title']) > Item._meta.get_field('title').max_length:
+            errors['title'] = ["Ensure this field has no more than 255 characters."]
+
+        node_type = self.node_types.get(data['node_type'].lower())
+        if node_type is None:
+            errors['node_type'] = [f"Unknown item type '{data['node_type']}'."]
+        data['node_type'] = node_type
+        if data['framework']:
+            framework = self.frameworks.get(data['framework'].lower())
+            if framework is None:
+                errors['framework'] = [f"Unknown methodology '{data['framework']}'."]
+            data['framework'] = framework
+
+        if data['parent'] and data['parent_ref']:
+            errors['parent'] = ["Give parent or parent_ref, not both."]
+        elif data['parent']:
+            try:
+                data['parent'] = int(data['parent'])
+            except ValueError:
+                errors['parent'] = ["A valid item id is required."]
+        return (None, errors) if errors else (data, None)
+
+    def lookup(self, rows):
+        """
+        Existing items of the organisation by ``external_id`` and by id,
+        for every ref and parent the batch names. Each is one indexed
+        query; OR-ing them together would scan the organisation's items.
+        """
+        refs = {data['ref'] for _i, data in rows if data['ref']}
+        refs.update(data['parent_ref'] for _i, data in rows if data['parent_ref'])
+        ids = {data['parent'] for _i, data in rows if data['parent']}
+        items = Item.objects.filter(organisation=self.organisation).order_by().only(
+            'organisation_id', 'node_type', 'framework', 'external_id', 'path', 'depth',
+            'deleted_at')
+        by_ref, by_id = {}, {}
+        if refs:
+            # Repeats the unique constraint's condition so its index is used
+            for item in items.filter(~Q(external_id=''), external_id__in=refs):
+                by_ref[item.external_id] = item
+        if ids:
+            by_id = {item.pk: item for item in items.filter(pk__in=ids)}
+        return by_ref, by_id
+
+    def placement(self, framework, parent_type, child_type):
+        key = (framework, parent_type, child_type)
+        if key not in self.placements:
+            error = placement_error(self.organisation, parent_type, child_type, framework,
+                                    flags=self.flags)
+            self.placements[key] = str(error) if error else None
+        return self.placements[key]
+
+    def validate(self, rows):
+        """
+        Resolve each row's parent and check its placement, returning
+        ``(index, item, parent)`` for the rows that can be created, in file
+        order, so every in-batch parent precedes its children.
+        """
+        by_ref, by_id = self.lookup(rows)
+        accepted = []
+        batch_refs = {}
+        for index, data in rows:
+            ref = data['ref']
+            if ref and (ref in by_ref or ref in batch_refs):
+                self.fail(index, ref, {'ref': ["An item with this ref already exists."]})
+                continue
+
+            parent = None
+            if data['parent_ref']:
+                parent = batch_refs.get(data['parent_ref']) or by_ref.get(data['parent_ref'])
+                if parent is None:
+                    self.fail(index, ref, {'parent_ref': [
+                        "No item with this ref; parents must come before their children."]})
+                    continue
+            elif data['parent']:
+                parent = by_id.get(data['parent'])
+                if parent is None:
+                    self.fail(index, ref, {'parent': ["Item not found."]})
+                    continue
+            if parent is not None and parent.deleted_at:
+                self.fail(index, ref, {'parent': ["Parent has been deleted."]})
+                continue
+
+            framework = data['framework'] or (
+                parent.framework if parent else self.organisation.default_framework)
+            parent_type = parent.node_type if parent else None
+            if parent_type not in TOP_LAYERS and parent.framework != framework:
+                self.fail(index, ref, {'framework': [
+                    "Items must use the same methodology as their parent."]})
+                continue
+            error = self.placement(framework, parent_type, data['node_type'])
+            if error:
+                self.fail(index, ref, {'node_type': [error]})
+                continue
+            depth = parent.depth + 1 if parent else 0
+            if depth > MAX_DEPTH:
+                self.fail(index, ref, {'parent': ["The hierarchy is too deep."]})
+                continue
+
+            item = Item(organisation=self.organisation, node_type=data['node_type'],
+                        framework=framework, title=data['title'],
+                        description=data['description'], external_id=ref, depth=depth)
+            if ref:
+                batch_refs[ref] = item
+            accepted.append((index, item, parent))
+        return accepted
+
+    def reserve(self, accepted):
+        """
+        Trim ``accepted`` to the room left under the tier's item limit. The
+        subscription row stays locked until the batch commits, so concurrent
+        imports cannot both take the last places; imports in other processes
+        see the batch's items once the usage meter has flushed them.
+        """
+        if self.subscription_id is None:
+            return accepted
+        subscription = Subscription.objects.select_for_update().get(pk=self.subscription_id)
+        room = max(self.max_items - current_usage(subscription)[UsageMetric.ITEMS], 0)
+        if len(accepted) > room:
+            # Parents precede their children, so no kept row loses its parent
+            for index, item, _parent in accepted[room:]:
+                self.fail(index, item.external_id, {'node_type': [
+                    "The subscription's item limit has been reached."]})
+            accepted = accepted[:room]
+            self.limit_reached = True
+        return accepted
+
+    def insert(self, accepted):
+        """
+        Create the items level by level, since children need their parents'
+        ids for their paths, then every closure row at once.
+        """
+        created = []
+        pending = accepted
+        while pending:
+            level, waiting = [], []
+            for row in pending:
+                _index, item, parent = row
+                if parent is None or parent.pk is not None:
+                    item.set_parent(parent)
+                    level.append(item)
+                else:
+                    waiting.append(row)
+            created.extend(Item.objects.bulk_create(level))
+            pending = waiting
+        ItemClosure.objects.bulk_create(
+            [row for item in created for row in item.closure_rows()])
+        return created
+
+    def import_batch(self, batch):
+        self.failed = 0
+        rows = []
+        for index, row in batch:
+            data, errors = self.parse(row)
+            if errors:
+                self.fail(index, _text(row, 'ref') if isinstance(row, dict) else '', errors)
+            else:
+                rows.append((index, data))
+
+        accepted = self.validate(rows) if rows else []
+        created = []
+        with transaction.atomic():
+            accepted = self.reserve(accepted) if accepted else accepted
+            if accepted:
+                try:
+                    with transaction.atomic():
+                        created = self.insert(accepted)
+                except IntegrityError:
+                    # A concurrent import took some of these refs first
+                    logger.warning(f"Item import {self.job.pk}: batch conflicted, skipped")
+                    for index, item, _parent in accepted:
+                        item.pk = None
+                        self.fail(index, item.external_id, {'ref': [
+                            "Conflicted with a concurrent import; retry this row."]})
+            if created and self.subscription_id is not None:
+                # Recorded once committed, so a rolled back batch is never counted
+                subscription_id, count = self.subscription_id, len(created)
+                transaction.on_commit(
+                    lambda: record_usage(subscription_id, UsageMetric.ITEMS, count))
+
+            job = self.job
+            job.rows_processed += len(batch)
+            job.items_created += len(created)
+            job.rows_failed += self.failed
+            ImportJob.objects.filter(pk=job.pk).update(
+                rows_processed=job.rows_processed,
+                items_created=job.items_created,
+                rows_failed=job.rows_failed,
+                errors=job.errors,
+                updated_at=timezone.now(),
+            )
+
+
+def import_items(job, rows, batch_size=None):
+    """
+    Import ``rows`` (dicts, e.g. from ``read_rows()``) into ``job``'s
+    organisation, recording progress on ``job`` as each batch commits, then
+    mark it completed, or failed if the file could not be read. Returns the
+    job.
+    """
+    job.status = ImportStatus.RUNNING
+    job.started_at = job.started_at or timezone.now()
+    job.save(update_fields=['status', 'started_at', 'updated_at'])
+
+    importer = ItemImporter(job, batch_size)
+    try:
+        importer.run(rows)
+    except Exception as e:
+        logger.exception(f"Item import {job.pk} failed")
+        job.status, job.message = ImportStatus.FAILED, str(e)
+    else:
+        job.status = ImportStatus.COMPLETED
+        if importer.limit_reached:
+            job.message = "Stopped at the subscription's item limit."
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'message', 'finished_at', 'updated_at'])
+    return job
+
+
+def _source_rows(job):
+    # Opened on first read, so a missing file fails the job like a bad one
+    with job.source.open('rb') as source:
+        yield from read_rows(source, job.format)
+
+
+def run_import_job(job, batch_size=None):
+    """Import a queued job's uploaded file, then delete the file."""
+    try:
+        import_items(job, _source_rows(job), batch_size)
+    finally:
+        if job.source:
+            job.source.delete(save=False)
+            job.save(update_fields=['source', 'updated_at'])
+    return job
+
+
+def claim_import_job():
+    """
+    Mark the oldest pending job running and return it, or None. A running
+    job whose lease has lapsed, because its worker died, is claimed again
+    and resumes after its committed rows. Concurrent workers skip each
+    other's locked rows rather than waiting on them.
+    """
+    lease = timedelta(seconds=_setting('ITEM_IMPORT_LEASE_SECONDS', 600))
+    with transaction.atomic():
+        job = (ImportJob.objects.select_for_update(skip_locked=True)
+               .filter(Q(status=ImportStatus.PENDING)
+                       | Q(status=ImportStatus.RUNNING, updated_at__lt=timezone.now() - lease))
+               .order_by('created_at')
+               .first())
+        if job is None:
+            return None
+        if job.status == ImportStatus.RUNNING:
+            logger.warning(f"Item import {job.pk}: lease lapsed, resuming at row {job.rows_processed}")
+        job.status = ImportStatus.RUNNING
+        job.started_at = job.started_at or timezone.now()
+        job.save(update_fields=['status', 'started_at', 'updated_at'])
+    return job
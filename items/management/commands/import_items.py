@@ -0,0 +1,57 @@
+# items/management/commands/import_items.py
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from items.imports import format_for_name, import_items, read_rows
+from items.models import ImportFormat, ImportJob, ImportStatus
+from organisations.models import Organisation
+
+
+class Command(BaseCommand):
+    help = (
+        "Import items into an organisation from a CSV or NDJSON file with "
+        "'node_type' and 'title' columns and optional 'ref', 'parent_ref', "
+        "'parent', 'framework' and 'description' columns."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('file', help="Path to the CSV or NDJSON file.")
+        parser.add_argument(
+            '--organisation', required=True,
+            help="Id of the organisation to import into.")
+        parser.add_argument(
+            '--format', choices=[choice.label.lower() for choice in ImportFormat],
+            help="File format (defaults to the one implied by the file extension).")
+        parser.add_argument(
+            '--batch-size', type=int, default=None,
+            help="Rows per batch (defaults to ITEM_IMPORT_BATCH_SIZE).")
+
+    def handle(self, *args, **options):
+        try:
+            organisation = Organisation.objects.get(pk=options['organisation'])
+        except (Organisation.DoesNotExist, ValidationError):
+            raise CommandError(f"No organisation {options['organisation']}")
+        if options['format']:
+            format = ImportFormat.CSV if options['format'] == 'csv' else ImportFormat.NDJSON
+        else:
+            format = format_for_name(options['file'])
+        if not format:
+            raise CommandError("Give --format, or use a .csv, .ndjson or .jsonl file")
+
+        try:
+            handle = open(options['file'], 'rb')
+        except OSError as e:
+            raise CommandError(str(e))
+        # Recorded as a job so its progress can be followed through the API
+        job = ImportJob.objects.create(organisation=organisation, format=format)
+        with handle:
+            import_items(job, read_rows(handle, format), batch_size=options['batch_size'])
+
+        for error in job.errors:
+            self.stderr.write(f"Row {error['row']} ({error['ref'] or '-'}): {error['errors']}")
+        if job.rows_failed > len(job.errors):
+            self.stderr.write(f"... and {job.rows_failed - len(job.errors)} more.")
+        summary = (f"Created {job.items_created} item(s), {job.rows_failed} row(s) failed."
+                   + (f" {job.message}" if job.message else ""))
+        if job.status == ImportStatus.FAILED:
+            raise CommandError(summary)
+        self.stdout.write(self.style.SUCCESS(summary))
@@ -0,0 +1,39 @@
+# items/management/commands/process_item_imports.py
+import time
+
+from django.core.management.base import BaseCommand
+from items.imports import claim_import_job, run_import_job
+
+
+class Command(BaseCommand):
+    help = "Run item imports queued through the API, oldest first."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=None,
+            help="Rows per batch (defaults to ITEM_IMPORT_BATCH_SIZE).")
+        parser.add_argument(
+            '--poll-interval', type=float, default=5.0,
+            help="Seconds to sleep when no import is queued.")
+        parser.add_argument(
+            '--once', action='store_true',
+            help="Run every import that is currently queued, then exit.")
+
+    def handle(self, *args, **options):
+        ran = 0
+        try:
+            while True:
+                job = claim_import_job()
+                if job is None:
+                    if options['once']:
+                        break
+                    time.sleep(options['poll_interval'])
+                    continue
+                run_import_job(job, batch_size=options['batch_size'])
+                ran += 1
+                self.stdout.write(
+                    f"Import {job.pk}: {job.get_status_display()}, "
+                    f"{job.items_created} item(s) created, {job.rows_failed} row(s) failed.")
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(f"Ran {ran} import(s).")
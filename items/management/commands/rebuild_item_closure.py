@@ -0,0 +1,27 @@
+# items/management/commands/rebuild_item_closure.py
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from items.closure import rebuild_closure
+from organisations.models import Organisation
+
+
+class Command(BaseCommand):
+    help = (
+        "Regenerate the item closure table from item parents, for every "
+        "organisation or just one."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--organisation',
+            help="Only rebuild the items of the organisation with this id.")
+
+    def handle(self, *args, **options):
+        organisation = None
+        if options['organisation']:
+            try:
+                organisation = Organisation.objects.get(pk=options['organisation'])
+            except (Organisation.DoesNotExist, ValidationError):
+                raise CommandError(f"No organisation {options['organisation']}")
+        written = rebuild_closure(organisation=organisation)
+        self.stdout.write(f"Wrote {written} closure row(s).")
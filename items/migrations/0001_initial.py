@@ -0,0 +1,35 @@
+# Generated by Django 5.1.6 on 2026-10-18 12:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('organisations', '0010_usageseries'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Item',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('node_type', models.CharField(choices=[('PLT', 'Platform'), ('PRJ', 'Project'), ('FEA', 'Feature'), ('EPC', 'Epic'), ('UST', 'User Story'), ('TSK', 'Task'), ('BUG', 'Bug'), ('IMP', 'Improvement'), ('TDB', 'Technical Debt'), ('SPK', 'Spike'), ('TST', 'Test'), ('IMD', 'Impediment'), ('DEF', 'Defect'), ('SUP', 'Support Ticket'), ('CHR', 'Change Request'), ('STK', 'Sprint Task'), ('SBG', 'Sprint Bug'), ('SIM', 'Sprint Impediment'), ('PRQ', 'Requirements Phase'), ('PDS', 'Design Phase'), ('PIM', 'Implementation Phase'), ('PTS', 'Testing Phase'), ('PDP', 'Deployment Phase'), ('PMT', 'Maintenance Phase'), ('BRQ', 'Business Requirement'), ('FRQ', 'Functional Requirement'), ('NRQ', 'Non-Functional Requirement'), ('SDD', 'System Design Document'), ('ASP', 'Architecture Specification'), ('UXD', 'UI/UX Design'), ('WFR', 'Wireframe'), ('PRT', 'Prototype'), ('CMD', 'Code Module'), ('ITK', 'Integration Task'), ('CFG', 'Configuration Item'), ('TPL', 'Test Plan'), ('TCS', 'Test Case'), ('RGT', 'Regression Test'), ('PFT', 'Performance Test'), ('SCT', 'Security Test'), ('RPL', 'Release Plan'), ('DTK', 'Deployment Task'), ('RBP', 'Rollback Plan'), ('DVL', 'Deployment Validation'), ('INC', 'Incident Report'), ('PCH', 'Patch'), ('ENH', 'Enhancement')], max_length=3)),
+                ('title', models.CharField(max_length=255)),
+                ('description', models.TextField(blank=True)),
+                ('path', models.CharField(blank=True, db_index=True, editable=False, help_text='Encoded ids of every ancestor, root first', max_length=255)),
+                ('depth', models.PositiveSmallIntegerField(default=0, editable=False, help_text='Number of ancestors; roots are 0')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('organisation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items', to='organisations.organisation')),
+                ('parent', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='children', to='items.item')),
+            ],
+            options={
+                'ordering': ['path', 'id'],
+                'indexes': [models.Index(fields=['organisation', 'depth'], name='items_item_organis_4c96ab_idx'), models.Index(fields=['organisation', 'node_type'], name='items_item_organis_ee1983_idx')],
+            },
+        ),
+    ]
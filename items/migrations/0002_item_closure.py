@@ -0,0 +1,32 @@
+# Generated by Django 5.1.6 on 2026-10-18 12:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('items', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='item',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.CreateModel(
+            name='ItemClosure',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveSmallIntegerField(help_text='Levels between ancestor and descendant')),
+                ('ancestor', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='descendant_links', to='items.item')),
+                ('descendant', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='ancestor_links', to='items.item')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['descendant', 'depth'], name='item_closure_ancestors_idx')],
+                'constraints': [models.UniqueConstraint(fields=('ancestor', 'descendant'), name='item_closure_unique')],
+            },
+        ),
+    ]
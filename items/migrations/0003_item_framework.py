@@ -0,0 +1,23 @@
+# Generated by Django 5.1.6 on 2026-10-18 12:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('items', '0002_item_closure'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='item',
+            name='framework',
+            field=models.CharField(blank=True, choices=[('KAN', 'Kanban'), ('SCR', 'Scrum'), ('WAT', 'Waterfall')], help_text='Methodology; inherited from the parent or the organisation default', max_length=3),
+        ),
+        migrations.AlterField(
+            model_name='item',
+            name='node_type',
+            field=models.CharField(choices=[('OBJ', 'Objective'), ('PLT', 'Platform'), ('PRJ', 'Project'), ('FEA', 'Feature'), ('EPC', 'Epic'), ('UST', 'User Story'), ('TSK', 'Task'), ('BUG', 'Bug'), ('IMP', 'Improvement'), ('TDB', 'Technical Debt'), ('SPK', 'Spike'), ('TST', 'Test'), ('IMD', 'Impediment'), ('DEF', 'Defect'), ('SUP', 'Support Ticket'), ('CHR', 'Change Request'), ('STK', 'Sprint Task'), ('SBG', 'Sprint Bug'), ('SIM', 'Sprint Impediment'), ('PRQ', 'Requirements Phase'), ('PDS', 'Design Phase'), ('PIM', 'Implementation Phase'), ('PTS', 'Testing Phase'), ('PDP', 'Deployment Phase'), ('PMT', 'Maintenance Phase'), ('BRQ', 'Business Requirement'), ('FRQ', 'Functional Requirement'), ('NRQ', 'Non-Functional Requirement'), ('SDD', 'System Design Document'), ('ASP', 'Architecture Specification'), ('UXD', 'UI/UX Design'), ('WFR', 'Wireframe'), ('PRT', 'Prototype'), ('CMD', 'Code Module'), ('ITK', 'Integration Task'), ('CFG', 'Configuration Item'), ('TPL', 'Test Plan'), ('TCS', 'Test Case'), ('RGT', 'Regression Test'), ('PFT', 'Performance Test'), ('SCT', 'Security Test'), ('RPL', 'Release Plan'), ('DTK', 'Deployment Task'), ('RBP', 'Rollback Plan'), ('DVL', 'Deployment Validation'), ('INC', 'Incident Report'), ('PCH', 'Patch'), ('ENH', 'Enhancement')], max_length=3),
+        ),
+    ]
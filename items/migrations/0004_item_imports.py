@@ -0,0 +1,62 @@
+# Generated by Django 5.1.6 on 2026-10-18 12:40
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('items', '0003_item_framework'),
+        ('organisations', '0010_usageseries'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('format', models.CharField(choices=[('CSV', 'CSV'), ('NDJ', 'NDJSON')], max_length=3)),
+                ('source', models.FileField(blank=True, help_text='Uploaded file, removed once the import has run', upload_to='item_imports/')),
+                ('status', models.CharField(choices=[('PEN', 'Pending'), ('RUN', 'Running'), ('CMP', 'Completed'), ('FLD', 'Failed')], default='PEN', max_length=3)),
+                ('rows_processed', models.PositiveIntegerField(default=0)),
+                ('items_created', models.PositiveIntegerField(default=0)),
+                ('rows_failed', models.PositiveIntegerField(default=0)),
+                ('errors', models.JSONField(default=list, help_text='The first ITEM_IMPORT_MAX_ERRORS row errors')),
+                ('message', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='item',
+            name='external_id',
+            field=models.CharField(blank=True, help_text='Key of the item in the tool it was imported from', max_length=100),
+        ),
+        migrations.AddConstraint(
+            model_name='item',
+            constraint=models.UniqueConstraint(condition=models.Q(('external_id', ''), _negated=True), fields=('organisation', 'external_id'), name='item_external_id_unique'),
+        ),
+        migrations.AddField(
+            model_name='importjob',
+            name='created_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='item_import_jobs', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='importjob',
+            name='organisation',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='import_jobs', to='organisations.organisation'),
+        ),
+        migrations.AddIndex(
+            model_name='importjob',
+            index=models.Index(fields=['status', 'created_at'], name='items_impor_status_3a457b_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-18 12:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('items', '0004_item_imports'),
+        ('organisations', '0010_usageseries'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['organisation', 'path', 'id'], name='items_item_organis_4dd409_idx'),
+        ),
+    ]
@@ -1,3 +1,467 @@
-from django.db import models
+# items/models.py
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.db.models import Case, F, Max, Q, Value, When
+from django.db.models.functions import Concat, Length, Substr
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from organisations.models import ProjectFramework
+import uuid
 
-# Create your models here.
+# Each ancestor id takes PATH_STEP base-36 characters of Item.path
+PATH_STEP = 8
+PATH_DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+MAX_PATH_LENGTH = 255
+
+
+def encode_segment(pk):
+    """Fixed-width base-36 encoding of an item id, so paths sort and slice evenly."""
+    digits = []
+    while pk:
+        pk, digit = divmod(pk, 36)
+        digits.append(PATH_DIGITS[digit])
+    return ''.join(reversed(digits)).rjust(PATH_STEP, '0')
+
+
+def decode_path(path):
+    """The ancestor ids encoded in ``path``, root first."""
+    return [int(path[start:start + PATH_STEP], 36)
+            for start in range(0, len(path), PATH_STEP)]
+
+
+class NodeType(models.TextChoices):
+    # Structure
+    OBJECTIVE = 'OBJ', _('Objective')
+    PLATFORM = 'PLT', _('Platform')
+    PROJECT = 'PRJ', _('Project')
+
+    # Agile structure
+    FEATURE = 'FEA', _('Feature')
+    EPIC = 'EPC', _('Epic')
+    USER_STORY = 'UST', _('User Story')
+
+    # Work items
+    TASK = 'TSK', _('Task')
+    BUG = 'BUG', _('Bug')
+    IMPROVEMENT = 'IMP', _('Improvement')
+
+    # Advanced items
+    TECHNICAL_DEBT = 'TDB', _('Technical Debt')
+    SPIKE = 'SPK', _('Spike')
+    TEST = 'TST', _('Test')
+    IMPEDIMENT = 'IMD', _('Impediment')
+
+    # Business items
+    DEFECT = 'DEF', _('Defect')
+    SUPPORT_TICKET = 'SUP', _('Support Ticket')
+    CHANGE_REQUEST = 'CHR', _('Change Request')
+
+    # Sprint items
+    SPRINT_TASK = 'STK', _('Sprint Task')
+    SPRINT_BUG = 'SBG', _('Sprint Bug')
+    SPRINT_IMPEDIMENT = 'SIM', _('Sprint Impediment')
+
+    # Waterfall phases and their items
+    REQUIREMENTS_PHASE = 'PRQ', _('Requirements Phase')
+    DESIGN_PHASE = 'PDS', _('Design Phase')
+    IMPLEMENTATION_PHASE = 'PIM', _('Implementation Phase')
+    TESTING_PHASE = 'PTS', _('Testing Phase')
+    DEPLOYMENT_PHASE = 'PDP', _('Deployment Phase')
+    MAINTENANCE_PHASE = 'PMT', _('Maintenance Phase')
+    BUSINESS_REQUIREMENT = 'BRQ', _('Business Requirement')
+    FUNCTIONAL_REQUIREMENT = 'FRQ', _('Functional Requirement')
+    NON_FUNCTIONAL_REQUIREMENT = 'NRQ', _('Non-Functional Requirement')
+    SYSTEM_DESIGN_DOCUMENT = 'SDD', _('System Design Document')
+    ARCHITECTURE_SPECIFICATION = 'ASP', _('Architecture Specification')
+    UI_UX_DESIGN = 'UXD', _('UI/UX Design')
+    WIREFRAME = 'WFR', _('Wireframe')
+    PROTOTYPE = 'PRT', _('Prototype')
+    CODE_MODULE = 'CMD', _('Code Module')
+    INTEGRATION_TASK = 'ITK', _('Integration Task')
+    CONFIGURATION_ITEM = 'CFG', _('Configuration Item')
+    TEST_PLAN = 'TPL', _('Test Plan')
+    TEST_CASE = 'TCS', _('Test Case')
+    REGRESSION_TEST = 'RGT', _('Regression Test')
+    PERFORMANCE_TEST = 'PFT', _('Performance Test')
+    SECURITY_TEST = 'SCT', _('Security Test')
+    RELEASE_PLAN = 'RPL', _('Release Plan')
+    DEPLOYMENT_TASK = 'DTK', _('Deployment Task')
+    ROLLBACK_PLAN = 'RBP', _('Rollback Plan')
+    DEPLOYMENT_VALIDATION = 'DVL', _('Deployment Validation')
+    INCIDENT_REPORT = 'INC', _('Incident Report')
+    PATCH = 'PCH', _('Patch')
+    ENHANCEMENT = 'ENH', _('Enhancement')
+
+
+class ItemQuerySet(models.QuerySet):
+
+    def subtree(self, item):
+        """``item`` and everything below it."""
+        return self.filter(Q(pk=item.pk) | Q(path__startswith=item.subtree_path))
+
+    def descendants(self, item):
+        """Everything below ``item``, in one prefix scan of the path index."""
+        return self.filter(path__startswith=item.subtree_path)
+
+    def ancestors(self, item):
+        """Everything above ``item``, by primary key, root first."""
+        return self.filter(pk__in=decode_path(item.path)).order_by('depth')
+
+    def active(self):
+        return self.filter(deleted_at__isnull=True)
+
+    def descendants_of(self, items):
+        """
+        Live items below any of ``items`` (an item, a list or a queryset),
+        through the closure table, so it also works for sets of items from
+        different projects.
+        """
+        return self.filter(ancestor_links__ancestor__in=_as_ids(items),
+                           ancestor_links__depth__gt=0).distinct()
+
+    def ancestors_of(self, items):
+        """Live items above any of ``items``, through the closure table."""
+        return self.filter(descendant_links__descendant__in=_as_ids(items),
+                           descendant_links__depth__gt=0).distinct()
+
+
+def _as_ids(items):
+    if isinstance(items, models.Model):
+        return [items.pk]
+    if isinstance(items, models.QuerySet):
+        return items.values('pk')
+    return [item.pk for item in items]
+
+
+class Item(models.Model):
+    """
+    A work item in an organisation's hierarchy.
+
+    ``path`` holds the ids of every ancestor, root first, as fixed-width
+    base-36 segments, and ``depth`` their count. Subtrees are prefix
+    matches on ``path`` and ancestors are decoded from it, so neither needs
+    a recursive query, and moving a subtree rewrites every path under it in
+    one UPDATE. ``ItemClosure`` indexes the same ancestry for set-based
+    queries across many items.
+
+    ``soft_delete()`` hides a subtree by setting ``deleted_at``; use
+    ``Item.objects.active()`` for live items.
+    """
+    organisation = models.ForeignKey(
+        'organisations.Organisation',
+        on_delete=models.CASCADE,
+        related_name='items'
+    )
+    parent = models.ForeignKey(
+        'self',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='children'
+    )
+    node_type = models.CharField(
+        max_length=3,
+        choices=NodeType.choices
+    )
+    framework = models.CharField(
+        max_length=3,
+        choices=ProjectFramework.choices,
+        blank=True,
+        help_text=_("Methodology; inherited from the parent or the organisation default")
+    )
+    title = models.CharField(max_length=255)
+    description = models.TextField(blank=True)
+    external_id = models.CharField(
+        max_length=100,
+        blank=True,
+        help_text=_("Key of the item in the tool it was imported from")
+    )
+
+    # Hierarchy
+    path = models.CharField(
+        max_length=MAX_PATH_LENGTH,
+        blank=True,
+        editable=False,
+        db_index=True,
+        help_text=_("Encoded ids of every ancestor, root first")
+    )
+    depth = models.PositiveSmallIntegerField(
+        default=0,
+        editable=False,
+        help_text=_("Number of ancestors; roots are 0")
+    )
+
+    # Timestamps
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = ItemQuerySet.as_manager()
+
+    class Meta:
+        ordering = ['path', 'id']
+        indexes = [
+            models.Index(fields=['organisation', 'depth']),
+            models.Index(fields=['organisation', 'node_type']),
+            # Organisation trees in path order, for streaming exports
+            models.Index(fields=['organisation', 'path', 'id']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['organisation', 'external_id'],
+                condition=~Q(external_id=''),
+                name='item_external_id_unique'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.get_node_type_display()}: {self.title}"
+
+    @property
+    def subtree_path(self):
+        """The path prefix shared by every descendant of this item."""
+        return self.path + encode_segment(self.pk)
+
+    def set_parent(self, parent):
+        self.parent = parent
+        if parent is None:
+            self.path, self.depth = '', 0
+        else:
+            self.path, self.depth = parent.subtree_path, parent.depth + 1
+
+    def closure_rows(self):
+        """
+        This item's ``ItemClosure`` rows, read from its path, for creating
+        alongside it; callers that ``bulk_create`` items use this too.
+        """
+        ancestors = decode_path(self.path)
+        return [
+            ItemClosure(ancestor_id=ancestor_id, descendant_id=self.pk,
+                        depth=len(ancestors) - index)
+            for index, ancestor_id in enumerate(ancestors)
+        ] + [ItemClosure(ancestor_id=self.pk, descendant_id=self.pk, depth=0)]
+
+    def clean(self):
+        from .hierarchy import TOP_LAYERS, validate_placement
+
+        parent = self.parent if self.parent_id else None
+        if parent and parent.organisation_id != self.organisation_id:
+            raise ValidationError({
+                'parent': _("Parent must belong to the same organisation")
+            })
+        if parent and parent.deleted_at and not self.deleted_at:
+            raise ValidationError({
+                'parent': _("Parent has been deleted")
+            })
+        if parent and parent.node_type not in TOP_LAYERS and parent.framework != self.framework:
+            raise ValidationError({
+                'framework': _("Items must use the same methodology as their parent")
+            })
+        validate_placement(self.organisation, parent.node_type if parent else None,
+                           self.node_type, self.framework)
+        if len(self.path) + PATH_STEP > MAX_PATH_LENGTH:
+            raise ValidationError({
+                'parent': _("The hierarchy is too deep")
+            })
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        if adding:
+            self.set_parent(self.parent)
+            if not self.framework:
+                self.framework = (self.parent.framework if self.parent
+                                  else self.organisation.default_framework)
+            # Parent and organisation are instances in hand; skip their queries
+            self.clean_fields(exclude=['organisation', 'parent'])
+            self.clean()
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if adding and self.deleted_at is None:
+                ItemClosure.objects.bulk_create(self.closure_rows())
+
+    def move_to(self, parent):
+        """
+        Move this item and its subtree under ``parent`` (None to make it a
+        root). Every path below it is rewritten by a single set-based
+        UPDATE, and the subtree's closure rows are relinked to its new
+        ancestors in the same transaction. Raises ``ValidationError`` for a parent in another
+        organisation, inside the subtree itself, or too deep to fit.
+        """
+        if parent is not None and (
+                parent.pk == self.pk or parent.path.startswith(self.subtree_path)):
+            raise ValidationError({
+                'parent': _("An item cannot be moved below itself")
+            })
+
+        old_parent = self.parent if self.parent_id else None
+        old_path, old_prefix, old_depth = self.path, self.subtree_path, self.depth
+        self.set_parent(parent)
+        try:
+            self.clean()
+            longest = Item.objects.filter(path__startswith=old_prefix).aggregate(
+                longest=Max(Length('path')))['longest']
+            if longest and longest - len(old_path) + len(self.path) + PATH_STEP > MAX_PATH_LENGTH:
+                raise ValidationError({
+                    'parent': _("The hierarchy is too deep")
+                })
+        except ValidationError:
+            self.set_parent(old_parent)
+            raise
+
+        from .closure import relink_subtree
+
+        with transaction.atomic():
+            moved = Item.objects.filter(
+                Q(pk=self.pk) | Q(path__startswith=old_prefix)
+            ).update(
+                path=Concat(Value(self.path), Substr('path', len(old_path) + 1),
+                            output_field=models.CharField()),
+                depth=F('depth') + (self.depth - old_depth),
+                parent=Case(
+                    When(pk=self.pk, then=Value(self.parent_id)),
+                    default=F('parent'),
+                    output_field=models.BigIntegerField(),
+                ),
+            )
+            relink_subtree(self, decode_path(old_path))
+        return moved
+
+    def soft_delete(self):
+        """
+        Mark this item and everything below it deleted, and drop them from
+        the closure table. Returns the number of items deleted.
+        """
+        from .closure import unlink_subtree
+
+        now = timezone.now()
+        with transaction.atomic():
+            unlink_subtree(self)
+            deleted = Item.objects.subtree(self).active().update(deleted_at=now)
+        self.deleted_at = now
+        return deleted
+
+    def restore(self):
+        """Undelete this item and its subtree and rebuild their closure rows."""
+        from .closure import rebuild_closure
+
+        if self.parent_id and self.parent.deleted_at:
+            raise ValidationError({
+                'parent': _("Parent has been deleted")
+            })
+        with transaction.atomic():
+            restored = Item.objects.subtree(self).update(deleted_at=None)
+            rebuild_closure(subtree=self)
+        self.deleted_at = None
+        return restored
+
+
+class ItemClosure(models.Model):
+    """
+    Every (ancestor, descendant) pair of live items, including each item
+    paired with itself at depth 0. Kept in step with ``Item`` inside the
+    transaction of every insert, move and soft delete (see items/closure.py).
+    """
+    ancestor = models.ForeignKey(
+        Item,
+        on_delete=models.CASCADE,
+        related_name='descendant_links',
+        db_index=False
+    )
+    descendant = models.ForeignKey(
+        Item,
+        on_delete=models.CASCADE,
+        related_name='ancestor_links',
+        db_index=False
+    )
+    depth = models.PositiveSmallIntegerField(
+        help_text=_("Levels between ancestor and descendant")
+    )
+
+    class Meta:
+        constraints = [
+            # Also the index for descendant lookups
+            models.UniqueConstraint(
+                fields=['ancestor', 'descendant'],
+                name='item_closure_unique'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['descendant', 'depth'], name='item_closure_ancestors_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.ancestor_id} > {self.descendant_id} ({self.depth})"
+
+
+class ImportFormat(models.TextChoices):
+    CSV = 'CSV', _('CSV')
+    NDJSON = 'NDJ', _('NDJSON')
+
+
+class ImportStatus(models.TextChoices):
+    PENDING = 'PEN', _('Pending')
+    RUNNING = 'RUN', _('Running')
+    COMPLETED = 'CMP', _('Completed')
+    FAILED = 'FLD', _('Failed')
+
+
+class ImportJob(models.Model):
+    """
+    A bulk item import and its progress. Jobs uploaded through the API are
+    queued with their file and run by the ``process_item_imports`` worker;
+    counters and errors are updated as each batch commits (see
+    items/imports.py).
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    organisation = models.ForeignKey(
+        'organisations.Organisation',
+        on_delete=models.CASCADE,
+        related_name='import_jobs'
+    )
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='item_import_jobs'
+    )
+    format = models.CharField(
+        max_length=3,
+        choices=ImportFormat.choices
+    )
+    source = models.FileField(
+        upload_to='item_imports/',
+        blank=True,
+        help_text=_("Uploaded file, removed once the import has run")
+    )
+    status = models.CharField(
+        max_length=3,
+        choices=ImportStatus.choices,
+        default=ImportStatus.PENDING
+    )
+
+    # Progress
+    rows_processed = models.PositiveIntegerField(default=0)
+    items_created = models.PositiveIntegerField(default=0)
+    rows_failed = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(
+        default=list,
+        help_text=_("The first ITEM_IMPORT_MAX_ERRORS row errors")
+    )
+    message = models.TextField(blank=True)
+
+    # Timestamps
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.get_format_display()} import ({self.get_status_display()})"
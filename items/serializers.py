@@ -0,0 +1,31 @@
+# items/serializers.py
+from django.utils.translation import gettext_lazy as _
+from rest_framework import serializers
+from .imports import format_for_name
+from .models import ImportFormat, ImportJob
+
+
+class ImportJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ImportJob
+        fields = ('id', 'format', 'status', 'rows_processed', 'items_created',
+                  'rows_failed', 'errors', 'message', 'created_at', 'started_at',
+                  'finished_at', 'updated_at')
+        read_only_fields = fields
+
+
+class ImportUploadSerializer(serializers.Serializer):
+    """
+    A CSV or NDJSON file to import. The format is taken from the file
+    extension unless given.
+    """
+    file = serializers.FileField()
+    format = serializers.ChoiceField(choices=ImportFormat.choices, required=False)
+
+    def validate(self, attrs):
+        attrs['format'] = attrs.get('format') or format_for_name(attrs['file'].name)
+        if not attrs['format']:
+            raise serializers.ValidationError({
+                'format': [_("Give the format, or upload a .csv, .ndjson or .jsonl file.")]
+            })
+        return attrs
@@ -1,8 +1,13 @@
 # items/urls.py
 from django.urls import path
+from . import views
 
 app_name = 'items'
 
 urlpatterns = [
-    # Will add URL patterns here later
+    path('imports/', views.ImportJobListView.as_view(), name='imports'),
+    path('imports/<uuid:pk>/', views.ImportJobDetailView.as_view(), name='import-detail'),
+    path('export/ndjson/', views.ItemExportView.as_view(export_format='ndjson'),
+         name='export-ndjson'),
+    path('export/csv/', views.ItemExportView.as_view(export_format='csv'), name='export-csv'),
 ]
@@ -0,0 +1,18 @@
+# items/usage.py
+"""True item totals for ``reconcile_usage()`` (see organisations/usage.py)."""
+from django.db.models import Count
+from organisations.models import UsageMetric
+from organisations.usage import register_usage_source
+from .models import Item
+
+
+@register_usage_source(UsageMetric.ITEMS)
+def item_totals(subscription_ids):
+    """Live items of each subscription's organisation."""
+    return dict(
+        Item.objects.active()
+        .filter(organisation__subscription__in=subscription_ids)
+        .values('organisation__subscription')
+        .annotate(total=Count('pk'))
+        .values_list('organisation__subscription', 'total')
+    )
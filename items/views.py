@@ -1,3 +1,81 @@
-from django.shortcuts import render
+# items/views.py
+import re
 
-# Create your views here.
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.cache import patch_vary_headers
+from rest_framework import status, views
+from rest_framework.negotiation import DefaultContentNegotiation
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from organisations.permissions import HasOrganisationPermission
+from .exports import CONTENT_TYPES, async_pieces, export_items
+from .models import ImportJob
+from .serializers import ImportJobSerializer, ImportUploadSerializer
+
+
+class ImportJobListView(views.APIView):
+    permission_classes = [IsAuthenticated, HasOrganisationPermission]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request):
+        """
+        Queue a CSV or NDJSON file for import. The ``process_item_imports``
+        worker runs it; poll the returned job for progress.
+        """
+        serializer = ImportUploadSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        job = ImportJob(
+            organisation=request.tenant.organisation,
+            created_by_id=request.user.pk,
+            format=serializer.validated_data['format'],
+        )
+        job.source.save(serializer.validated_data['file'].name,
+                        serializer.validated_data['file'], save=False)
+        job.save()
+        return Response(ImportJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+
+class ImportJobDetailView(views.APIView):
+    permission_classes = [IsAuthenticated, HasOrganisationPermission]
+
+    def get(self, request, pk):
+        """Status, progress and row errors of one of the organisation's imports."""
+        job = get_object_or_404(
+            ImportJob, pk=pk, organisation_id=request.tenant.organisation_id)
+        return Response(ImportJobSerializer(job).data, status=status.HTTP_200_OK)
+
+
+class ExportContentNegotiation(DefaultContentNegotiation):
+    """Errors render as JSON, whatever file type the client asked for."""
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
+
+
+class ItemExportView(views.APIView):
+    permission_classes = [IsAuthenticated, HasOrganisationPermission]
+    content_negotiation_class = ExportContentNegotiation
+    export_format = None
+
+    def get(self, request):
+        """
+        Stream every live item of the organisation as a file, gzipped on
+        the fly for clients that accept it.
+        """
+        compress = bool(re.search(r'\bgzip\b', request.META.get('HTTP_ACCEPT_ENCODING', '')))
+        pieces = export_items(request.tenant.organisation, self.export_format, compress=compress)
+        if isinstance(request._request, ASGIRequest):
+            # ASGI reads a sync iterator to the end before sending anything
+            pieces = async_pieces(pieces)
+        response = StreamingHttpResponse(
+            pieces, content_type=CONTENT_TYPES[self.export_format])
+        if compress:
+            response['Content-Encoding'] = 'gzip'
+        patch_vary_headers(response, ('Accept-Encoding',))
+        response['Content-Disposition'] = f'attachment; filename="items.{self.export_format}"'
+        return response
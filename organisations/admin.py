@@ -1,3 +1,92 @@
+# organisations/admin.py
 from django.contrib import admin
+from django.db.models import Case, F, FloatField, Value, When
+from django.db.models.functions import Cast, NullIf
+from backlogger_api.pagination import EstimatedCountPaginator
+from .models import Organisation, Subscription
+from .tiers import tier_policies
 
-# Register your models here.
+
+def percentage(used, limit):
+    """SQL for ``used`` as a percentage of ``limit``; NULL when the limit is 0."""
+    return Cast(used, FloatField()) * Value(100.0) / NullIf(Cast(limit, FloatField()), Value(0.0))
+
+
+def tier_limit(attribute, tier_field):
+    """SQL for a ``TierPolicy`` quota, picked by the row's subscription tier."""
+    return Case(
+        *[When(**{tier_field: tier}, then=Value(getattr(policy, attribute)))
+          for tier, policy in tier_policies.all().items()],
+        default=Value(None),
+    )
+
+
+def percentage_display(value):
+    return '-' if value is None else f"{value:.0f}%"
+
+
+class OrganisationAdmin(admin.ModelAdmin):
+    model = Organisation
+    list_display = ("name", "owner_email", "subscription_tier", "status",
+                    "payment_status", "renewal_date", "storage_usage")
+    list_filter = ("subscription_tier", "status", "payment_status")
+    search_fields = ("name", "owner_email")
+    ordering = ("name",)
+    raw_id_fields = ("owner",)
+    readonly_fields = ("created_at", "updated_at")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            storage_pct=percentage('subscription__current_storage_used', 'storage_limit'),
+        )
+
+    @admin.display(description="Storage used", ordering="storage_pct")
+    def storage_usage(self, obj):
+        return percentage_display(obj.storage_pct)
+
+
+admin.site.register(Organisation, OrganisationAdmin)
+
+
+class SubscriptionAdmin(admin.ModelAdmin):
+    model = Subscription
+    list_display = ("__str__", "tier", "status", "billing_interval",
+                    "current_period_end", "user_usage", "item_usage",
+                    "storage_usage")
+    list_filter = ("status", "billing_interval", "organisation__subscription_tier")
+    list_select_related = ("organisation",)
+    search_fields = ("organisation__name", "billing_email", "billing_name")
+    ordering = ("current_period_end",)
+    raw_id_fields = ("organisation",)
+    readonly_fields = ("created_at", "updated_at")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        tier = 'organisation__subscription_tier'
+        return super().get_queryset(request).annotate(
+            user_pct=percentage('current_user_count', tier_limit('max_users', tier)),
+            item_pct=percentage('current_item_count', tier_limit('max_items', tier)),
+            storage_pct=percentage('current_storage_used', F('organisation__storage_limit')),
+        )
+
+    @admin.display(description="Tier", ordering="organisation__subscription_tier")
+    def tier(self, obj):
+        return obj.organisation.get_subscription_tier_display()
+
+    @admin.display(description="Users", ordering="user_pct")
+    def user_usage(self, obj):
+        return percentage_display(obj.user_pct)
+
+    @admin.display(description="Items", ordering="item_pct")
+    def item_usage(self, obj):
+        return percentage_display(obj.item_pct)
+
+    @admin.display(description="Storage used", ordering="storage_pct")
+    def storage_usage(self, obj):
+        return percentage_display(obj.storage_pct)
+
+
+admin.site.register(Subscription, SubscriptionAdmin)
@@ -0,0 +1,164 @@
+# organisations/domains.py
+"""
+Email domain to organisation registry.
+
+Each entry of an Enterprise organisation's ``allowed_domains`` has a row in
+``OrganisationDomain`` (unique on ``domain``), kept in step whenever the
+list is saved. Every process also holds the whole mapping in a dict, so
+email verification can tell whether a user's domain belongs to anyone with
+no query at all, which is the answer for nearly every user. Only a hit goes
+to the database, through the unique index, to confirm the organisation
+before the user joins it.
+
+Local changes update the dict when their transaction commits; changes made
+by other processes are picked up by a reload every
+``ORGANISATION_DOMAIN_REFRESH_SECONDS``.
+"""
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.utils.translation import gettext_lazy as _
+from .models import (
+    Organisation, OrganisationDomain, OrganisationMember, OrganisationStatus,
+    SubscriptionTier, UsageMetric,
+)
+from .usage import record_usage, within_limit
+
+logger = logging.getLogger(__name__)
+
+
+def normalise_domain(domain):
+    return domain.strip().lstrip('@').lower()
+
+
+def email_domain(email):
+    return normalise_domain(email.rpartition('@')[2])
+
+
+class DomainRegistry:
+    """Process-wide mapping of email domain to organisation id."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.invalidate()
+
+    def invalidate(self):
+        self.domains = None
+        self.last_load = 0.0
+
+    @property
+    def refresh_interval(self):
+        return getattr(settings, 'ORGANISATION_DOMAIN_REFRESH_SECONDS', 60)
+
+    def _load(self):
+        self.domains = dict(
+            OrganisationDomain.objects.values_list('domain', 'organisation_id'))
+        self.last_load = time.monotonic()
+
+    def get(self, domain):
+        """The id of the organisation that owns ``domain``, or None."""
+        if self.domains is None or \
+                time.monotonic() - self.last_load >= self.refresh_interval:
+            with self.lock:
+                if self.domains is None or \
+                        time.monotonic() - self.last_load >= self.refresh_interval:
+                    self._load()
+        return self.domains.get(normalise_domain(domain))
+
+    def update(self, organisation_id, domains):
+        """Replace ``organisation_id``'s domains after a local change."""
+        with self.lock:
+            if self.domains is None:
+                return
+            # Swap in a new dict so readers never see it half-updated
+            mapping = {domain: owner for domain, owner in self.domains.items()
+                       if owner != organisation_id}
+            mapping.update(dict.fromkeys(domains, organisation_id))
+            self.domains = mapping
+
+
+domain_registry = DomainRegistry()
+
+
+def sync_organisation_domains(organisation, created=False):
+    """
+    Make ``organisation``'s ``OrganisationDomain`` rows match its
+    ``allowed_domains``. Must run inside the transaction that saved the
+    organisation. Raises ``ValidationError`` if a domain already belongs to
+    another organisation.
+    """
+    wanted = {normalise_domain(domain) for domain in organisation.allowed_domains or []}
+    existing = set() if created else set(
+        organisation.domains.values_list('domain', flat=True))
+
+    removed = existing - wanted
+    if removed:
+        OrganisationDomain.objects.filter(
+            organisation=organisation, domain__in=removed).delete()
+
+    added = wanted - existing
+    if added:
+        taken = sorted(
+            OrganisationDomain.objects.filter(domain__in=added)
+            .values_list('domain', flat=True))
+        if taken:
+            raise ValidationError({
+                'allowed_domains': _("Already used by another organisation: %(domains)s")
+                % {'domains': ', '.join(taken)}
+            })
+        try:
+            with transaction.atomic():
+                OrganisationDomain.objects.bulk_create([
+                    OrganisationDomain(organisation=organisation, domain=domain)
+                    for domain in added
+                ])
+        except IntegrityError:
+            # Claimed by a concurrent save since the check above
+            raise ValidationError({
+                'allowed_domains': _("One or more domains are already used by another organisation")
+            })
+
+    if removed or added:
+        transaction.on_commit(
+            lambda: domain_registry.update(organisation.pk, wanted))
+
+
+def join_organisation_by_domain(user):
+    """
+    Add ``user`` as a member of the active Enterprise organisation that
+    owns their email domain, if there is one and it has room for another
+    user. Called once the user's email is verified, so unverified sign-ups
+    never take a seat. Returns the organisation joined, or None.
+    """
+    domain = email_domain(user.email)
+    if domain_registry.get(domain) is None:
+        return None
+    if OrganisationMember.objects.filter(user=user).exists():
+        # Already placed, e.g. provisioned into an organisation
+        return None
+
+    organisation = (
+        Organisation.objects
+        .select_related('subscription')
+        .filter(domains__domain=domain,
+                subscription_tier=SubscriptionTier.ENTERPRISE,
+                status=OrganisationStatus.ACTIVE)
+        .first()
+    )
+    if organisation is None:
+        return None
+
+    subscription = getattr(organisation, 'subscription', None)
+    if subscription and not within_limit(subscription, UsageMetric.USERS):
+        logger.warning(
+            f"Not adding {user.email} to {organisation.name}: user limit reached")
+        return None
+
+    OrganisationMember.objects.create(user=user, organisation=organisation)
+    if subscription:
+        transaction.on_commit(lambda: record_usage(subscription, UsageMetric.USERS))
+    return organisation
@@ -0,0 +1,190 @@
+# organisations/lifecycle.py
+"""
+Subscription lifecycle sweeper.
+
+Subscriptions whose trial or billing period has ended are moved on:
+
+* a trial that ends becomes ``ACTIVE`` with a new billing period, or
+  ``PAST_DUE`` if the organisation's payment status is not active;
+* an active period that ends is renewed for the next period, becomes
+  ``CANCELLED`` if cancellation was requested, or ``PAST_DUE`` if payment
+  is not active.
+
+Due rows are found with keyset-paginated scans on ``(status, <date>, id)``
+and claimed a chunk at a time with ``SELECT ... FOR UPDATE SKIP LOCKED``,
+so any number of workers (threads or separate cron runs) can sweep at once
+without touching the same rows. Each transition moves a row out of the due
+set, so re-running the sweeper, or running it after a crash, is safe.
+"""
+from collections import Counter
+import calendar
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from .audit import AuditBatch
+from .models import (
+    BillingInterval, Organisation, PaymentStatus, Subscription, SubscriptionStatus,
+)
+
+INTERVAL_MONTHS = {
+    BillingInterval.MONTHLY: 1,
+    BillingInterval.ANNUAL: 12,
+}
+
+# (status swept, date that makes it due)
+SWEEPS = (
+    (SubscriptionStatus.TRIALING, 'trial_end'),
+    (SubscriptionStatus.ACTIVE, 'current_period_end'),
+)
+
+SUBSCRIPTION_FIELDS = ('status', 'current_period_start', 'current_period_end',
+                       'cancelled_at', 'updated_at')
+
+
+class Outcome:
+    ACTIVATED = 'activated'
+    RENEWED = 'renewed'
+    PAST_DUE = 'past_due'
+    CANCELLED = 'cancelled'
+
+
+def add_months(value, months):
+    """``value`` moved by ``months``, clamping the day to the month's length."""
+    month = value.month - 1 + months
+    year = value.year + month // 12
+    month = month % 12 + 1
+    day = min(value.day, calendar.monthrange(year, month)[1])
+    return value.replace(year=year, month=month, day=day)
+
+
+def next_period(anchor, interval, now):
+    """
+    The ``(start, end)`` of the billing period containing ``now``, for
+    periods of ``interval`` counted from ``anchor``. Counting from a fixed
+    anchor keeps the billing day stable across short months.
+    """
+    step = INTERVAL_MONTHS[interval]
+    months = (now.year - anchor.year) * 12 + now.month - anchor.month
+    n = max(months // step, 1)
+    while add_months(anchor, n * step) <= now:
+        n += 1
+    return add_months(anchor, (n - 1) * step), add_months(anchor, n * step)
+
+
+def advance(subscription, now):
+    """
+    Apply the transition due for ``subscription`` in memory and return its
+    ``Outcome``, or None if nothing is due. The organisation's
+    ``renewal_date`` is updated to match.
+    """
+    organisation = subscription.organisation
+    paid = organisation.payment_status == PaymentStatus.ACTIVE
+
+    if subscription.status == SubscriptionStatus.TRIALING:
+        if not subscription.trial_end or subscription.trial_end > now:
+            return None
+        if not paid:
+            subscription.status = SubscriptionStatus.PAST_DUE
+            return Outcome.PAST_DUE
+        subscription.status = SubscriptionStatus.ACTIVE
+        start, end = next_period(subscription.trial_end, subscription.billing_interval, now)
+        outcome = Outcome.ACTIVATED
+
+    elif subscription.status == SubscriptionStatus.ACTIVE:
+        if subscription.current_period_end > now:
+            return None
+        if subscription.cancelled_at:
+            subscription.status = SubscriptionStatus.CANCELLED
+            organisation.renewal_date = None
+            return Outcome.CANCELLED
+        if not paid:
+            subscription.status = SubscriptionStatus.PAST_DUE
+            return Outcome.PAST_DUE
+        anchor = subscription.trial_end or subscription.start_date
+        start, end = next_period(anchor, subscription.billing_interval, now)
+        start = max(start, subscription.current_period_end)
+        outcome = Outcome.RENEWED
+
+    else:
+        return None
+
+    subscription.current_period_start = start
+    subscription.current_period_end = end
+    organisation.renewal_date = end
+    return outcome
+
+
+def _due(status, field, now, after=None):
+    due = Subscription.objects.filter(status=status, **{f'{field}__lte': now})
+    if after is not None:
+        value, pk = after
+        due = due.filter(Q(**{f'{field}__gt': value}) | Q(**{field: value, 'pk__gt': pk}))
+    return due.order_by(field, 'pk')
+
+
+def sweep_chunk(status, field, now, after=None, chunk_size=None):
+    """
+    Claim up to ``chunk_size`` due subscriptions after the keyset position
+    ``after`` and advance them in one transaction. Rows locked by another
+    worker are skipped. Returns ``(next_after, outcomes)``, with
+    ``next_after`` None when nothing was left to claim.
+    """
+    chunk_size = chunk_size or getattr(settings, 'SUBSCRIPTION_SWEEP_CHUNK_SIZE', 500)
+    with transaction.atomic():
+        subscriptions = list(
+            _due(status, field, now, after)
+            .select_related('organisation')
+            .only('pk', 'billing_interval', 'start_date', 'trial_end',
+                  *SUBSCRIPTION_FIELDS, 'organisation__payment_status',
+                  'organisation__renewal_date')
+            .select_for_update(skip_locked=True, of=('self',))[:chunk_size]
+        )
+        if not subscriptions:
+            return None, Counter()
+        # Read the keyset position before advancing changes the date
+        last = subscriptions[-1]
+        next_after = (getattr(last, field), last.pk)
+
+        outcomes = Counter()
+        changed = []
+        with AuditBatch() as audit:
+            for subscription in subscriptions:
+                outcome = advance(subscription, now)
+                if outcome is None:
+                    continue
+                subscription.updated_at = now
+                subscription.organisation.updated_at = now
+                changed.append(subscription)
+                outcomes[outcome] += 1
+                audit.add(subscription.organisation, f'subscription_{outcome}',
+                          details=subscription.get_status_display(),
+                          period_end=subscription.current_period_end.isoformat())
+
+        Subscription.objects.bulk_update(changed, SUBSCRIPTION_FIELDS)
+        Organisation.objects.bulk_update(
+            [subscription.organisation for subscription in changed],
+            ['renewal_date', 'updated_at'],
+        )
+
+    return next_after, outcomes
+
+
+def sweep_subscriptions(now=None, chunk_size=None, stop=None):
+    """
+    Advance every subscription due at ``now``, chunk by chunk. Safe to run
+    from several workers at once. ``stop`` is an optional
+    ``threading.Event`` checked between chunks. Returns a ``Counter`` of
+    outcomes.
+    """
+    now = now or timezone.now()
+    totals = Counter()
+    for status, field in SWEEPS:
+        after = None
+        while stop is None or not stop.is_set():
+            after, outcomes = sweep_chunk(status, field, now, after, chunk_size)
+            if after is None:
+                break
+            totals.update(outcomes)
+    return totals
@@ -0,0 +1,19 @@
+# organisations/management/commands/purge_audit_events.py
+from django.core.management.base import BaseCommand
+from organisations.audit import purge_expired_events
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete audit events older than each organisation's "
+        "data_retention_policy['audit_logs_days']."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=5000,
+            help="Rows deleted per statement.")
+
+    def handle(self, *args, **options):
+        deleted = purge_expired_events(batch_size=options['batch_size'])
+        self.stdout.write(f"Deleted {deleted} expired audit event(s).")
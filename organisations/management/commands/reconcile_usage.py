@@ -0,0 +1,26 @@
+# organisations/management/commands/reconcile_usage.py
+from django.core.management.base import BaseCommand
+from organisations.usage import fold_counters, reconcile_usage
+
+
+class Command(BaseCommand):
+    help = (
+        "Fold sharded usage counters into subscriptions and reset each metric "
+        "to the true total reported by its registered source."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fold-only', action='store_true',
+            help="Only fold shard totals; skip recomputing true totals.")
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help="Subscriptions reconciled per transaction.")
+
+    def handle(self, *args, **options):
+        if options['fold_only']:
+            folded = fold_counters()
+            self.stdout.write(f"Folded {folded} usage counter(s).")
+            return
+        corrected = reconcile_usage(batch_size=options['batch_size'])
+        self.stdout.write(f"Corrected {corrected} usage total(s).")
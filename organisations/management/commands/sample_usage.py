@@ -0,0 +1,25 @@
+# organisations/management/commands/sample_usage.py
+from django.core.management.base import BaseCommand
+from organisations.metering import rollup_usage, sample_usage
+
+
+class Command(BaseCommand):
+    help = (
+        "Record every subscription's current usage in the usage history, "
+        "then roll old hourly samples up to daily peaks. Run hourly."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--skip-rollup', action='store_true',
+            help="Only record samples; leave old hourly rows as they are.")
+        parser.add_argument(
+            '--batch-size', type=int, default=None,
+            help="Rows written per transaction (defaults to METERING_BATCH_SIZE).")
+
+    def handle(self, *args, **options):
+        recorded = sample_usage(batch_size=options['batch_size'])
+        self.stdout.write(f"Recorded {recorded} usage sample(s).")
+        if not options['skip_rollup']:
+            rolled = rollup_usage(batch_size=options['batch_size'])
+            self.stdout.write(f"Rolled up {rolled} day(s) of hourly samples.")
@@ -0,0 +1,67 @@
+# organisations/management/commands/sweep_subscriptions.py
+from collections import Counter
+import threading
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.utils import timezone
+from organisations.lifecycle import sweep_subscriptions
+
+
+class Command(BaseCommand):
+    help = (
+        "Move subscriptions whose trial or billing period has ended on to "
+        "their next state. Safe to run on a schedule and from several hosts."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=1,
+            help="Number of worker threads claiming chunks in parallel.")
+        parser.add_argument(
+            '--chunk-size', type=int, default=None,
+            help="Subscriptions per transaction (defaults to SUBSCRIPTION_SWEEP_CHUNK_SIZE).")
+
+    def handle(self, *args, **options):
+        # Every worker sweeps up to the same instant
+        now = timezone.now()
+        self.totals = Counter()
+        self.lock = threading.Lock()
+        self.stop = threading.Event()
+
+        if options['workers'] == 1:
+            self.totals.update(sweep_subscriptions(now, options['chunk_size']))
+        else:
+            threads = [
+                threading.Thread(
+                    target=self.work,
+                    args=(now, options['chunk_size']),
+                    name=f"subscription-sweeper-{n}",
+                    daemon=True,
+                )
+                for n in range(options['workers'])
+            ]
+            for thread in threads:
+                thread.start()
+            try:
+                for thread in threads:
+                    while thread.is_alive():
+                        thread.join(timeout=1)
+            except KeyboardInterrupt:
+                self.stop.set()
+                for thread in threads:
+                    thread.join()
+
+        summary = ', '.join(
+            f"{count} {outcome.replace('_', ' ')}"
+            for outcome, count in sorted(self.totals.items())) or "nothing due"
+        self.stdout.write(f"Swept subscriptions: {summary}.")
+
+    def work(self, now, chunk_size):
+        try:
+            outcomes = sweep_subscriptions(now, chunk_size, stop=self.stop)
+            with self.lock:
+                self.totals.update(outcomes)
+        finally:
+            # Each thread holds its own database connection
+            connections.close_all()
@@ -0,0 +1,274 @@
+# organisations/metering.py
+"""
+Usage history for billing disputes and capacity planning.
+
+Samples are stored packed, not one row each: an hourly ``UsageSeries`` row
+holds one organisation's metric for a whole day as 24 int64 slots, and a
+daily row holds a month of daily peaks as 31 slots. Missing samples are
+``MISSING`` (-1). A year of hourly history for one metric is 365 rows of
+192 bytes rather than 8,760 rows.
+
+``sample_usage()`` (run hourly by the ``sample_usage`` command) records
+every subscription's current usage. ``rollup_usage()`` folds hourly rows
+older than ``METERING_HOURLY_RETENTION_DAYS`` into daily peaks and deletes
+them. Range reads unpack the rows into arrays and aggregate them with NumPy
+where it is installed, falling back to plain Python otherwise.
+"""
+from array import array
+from collections import defaultdict
+from datetime import datetime, time as dt_time, timedelta, timezone as dt_timezone
+import sys
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+from .models import Subscription, UsageCounter, UsageResolution, UsageSeries
+from .usage import METRIC_FIELDS, usage_meter
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+MISSING = -1
+
+SLOTS = {
+    UsageResolution.HOURLY: 24,
+    UsageResolution.DAILY: 31,
+}
+
+STEP_SECONDS = {
+    UsageResolution.HOURLY: 3600,
+    UsageResolution.DAILY: 86400,
+}
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def pack(values):
+    packed = array('q', values)
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def unpack(data):
+    values = array('q')
+    values.frombytes(bytes(data))
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+def _utc(moment):
+    return moment.astimezone(dt_timezone.utc)
+
+
+def _epoch(day):
+    return int(datetime.combine(day, dt_time.min, tzinfo=dt_timezone.utc).timestamp())
+
+
+def _merge(resolution, updates, combine):
+    """
+    Write ``updates`` ({(organisation_id, metric, period_start): {slot:
+    value}}) into rows of ``resolution``, combining each new value with the
+    stored one. Rows are created if missing and locked while merged, so
+    concurrent writers cannot lose each other's slots.
+    """
+    empty = pack([MISSING] * SLOTS[resolution])
+    with transaction.atomic():
+        UsageSeries.objects.bulk_create(
+            [UsageSeries(organisation_id=organisation_id, metric=metric,
+                         resolution=resolution, period_start=period_start, values=empty)
+             for organisation_id, metric, period_start in updates],
+            ignore_conflicts=True,
+        )
+        rows = (
+            UsageSeries.objects
+            .select_for_update()
+            .filter(resolution=resolution,
+                    organisation_id__in={key[0] for key in updates},
+                    metric__in={key[1] for key in updates},
+                    period_start__in={key[2] for key in updates})
+            .order_by('pk')
+        )
+        changed = []
+        for row in rows:
+            slots = updates.get((row.organisation_id, row.metric, row.period_start))
+            if not slots:
+                continue
+            values = unpack(row.values)
+            for slot, value in slots.items():
+                values[slot] = combine(values[slot], value)
+            row.values = pack(values)
+            changed.append(row)
+        UsageSeries.objects.bulk_update(changed, ['values'])
+
+
+def _latest(stored, new):
+    return new
+
+
+def record_samples(samples, batch_size=None):
+    """
+    Store an iterable of ``(organisation_id, metric, moment, value)``
+    samples in hourly rows; a later sample for the same hour replaces the
+    earlier one. Up to ``batch_size`` rows are written per transaction.
+    Returns the number of samples stored.
+    """
+    batch_size = batch_size or _setting('METERING_BATCH_SIZE', 1000)
+    updates = defaultdict(dict)
+    count = 0
+    for organisation_id, metric, moment, value in samples:
+        moment = _utc(moment)
+        key = (organisation_id, metric, moment.date())
+        if key not in updates and len(updates) >= batch_size:
+            _merge(UsageResolution.HOURLY, updates, _latest)
+            updates = defaultdict(dict)
+        updates[key][moment.hour] = value
+        count += 1
+    if updates:
+        _merge(UsageResolution.HOURLY, updates, _latest)
+    return count
+
+
+def _current_samples(moment, batch_size):
+    last_pk = None
+    while True:
+        subscriptions = Subscription.objects.order_by('pk')
+        if last_pk is not None:
+            subscriptions = subscriptions.filter(pk__gt=last_pk)
+        chunk = list(subscriptions.values(
+            'pk', 'organisation_id', *METRIC_FIELDS.values())[:batch_size])
+        if not chunk:
+            return
+        last_pk = chunk[-1]['pk']
+        shards = {
+            (row['subscription_id'], row['metric']): row['total']
+            for row in UsageCounter.objects
+            .filter(subscription_id__in=[row['pk'] for row in chunk])
+            .values('subscription_id', 'metric')
+            .annotate(total=Sum('value'))
+        }
+        for row in chunk:
+            for metric, field in METRIC_FIELDS.items():
+                value = (row[field] + (shards.get((row['pk'], metric)) or 0)
+                         + usage_meter.pending_delta(row['pk'], metric))
+                yield row['organisation_id'], metric, moment, value
+
+
+def sample_usage(now=None, batch_size=None):
+    """Record every subscription's current usage for this hour."""
+    batch_size = batch_size or _setting('METERING_BATCH_SIZE', 1000)
+    moment = now or timezone.now()
+    return record_samples(_current_samples(moment, batch_size), batch_size)
+
+
+def rollup_usage(now=None, batch_size=None):
+    """
+    Fold hourly rows older than ``METERING_HOURLY_RETENTION_DAYS`` into
+    daily peaks and delete them, a batch per transaction. Safe to run
+    repeatedly or from several workers. Returns the number of hourly rows
+    rolled up.
+    """
+    batch_size = batch_size or _setting('METERING_BATCH_SIZE', 1000)
+    cutoff = _utc(now or timezone.now()).date() - timedelta(
+        days=_setting('METERING_HOURLY_RETENTION_DAYS', 90))
+    rolled = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                UsageSeries.objects
+                .select_for_update(skip_locked=True)
+                .filter(resolution=UsageResolution.HOURLY, period_start__lt=cutoff)
+                .order_by('period_start', 'pk')[:batch_size]
+            )
+            if not rows:
+                return rolled
+            updates = defaultdict(dict)
+            for row in rows:
+                peak = max(unpack(row.values))
+                if peak == MISSING:
+                    continue
+                day = row.period_start
+                slots = updates[(row.organisation_id, row.metric, day.replace(day=1))]
+                slots[day.day - 1] = max(slots.get(day.day - 1, MISSING), peak)
+            if updates:
+                _merge(UsageResolution.DAILY, updates, max)
+            UsageSeries.objects.filter(pk__in=[row.pk for row in rows]).delete()
+            rolled += len(rows)
+
+
+def _rows(organisation, metric, start, end):
+    # Rows can start up to a month before ``start`` and still overlap it
+    return (
+        UsageSeries.objects
+        .filter(organisation=organisation, metric=metric,
+                period_start__gt=_utc(start).date() - timedelta(days=31),
+                period_start__lte=_utc(end).date())
+        .values_list('resolution', 'period_start', 'values')
+    )
+
+
+def usage_points(organisation, metric, start, end):
+    """
+    ``(timestamps, values)`` of the samples in ``[start, end)``, oldest
+    first, with timestamps in epoch seconds. Hourly samples are returned
+    where they are kept and daily peaks before that. NumPy arrays when
+    NumPy is installed, otherwise lists.
+    """
+    start_ts, end_ts = _utc(start).timestamp(), _utc(end).timestamp()
+    rows = list(_rows(organisation, metric, start, end))
+
+    if np is not None:
+        if not rows:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        values = np.concatenate([np.frombuffer(bytes(data), dtype='<i8') for _r, _p, data in rows])
+        times = np.concatenate([
+            _epoch(period_start) + np.arange(SLOTS[resolution], dtype=np.int64)
+            * STEP_SECONDS[resolution]
+            for resolution, period_start, _data in rows
+        ])
+        keep = (values != MISSING) & (times >= start_ts) & (times < end_ts)
+        times, values = times[keep], values[keep]
+        order = np.argsort(times, kind='stable')
+        return times[order], values[order]
+
+    points = []
+    for resolution, period_start, data in rows:
+        base, step = _epoch(period_start), STEP_SECONDS[resolution]
+        for slot, value in enumerate(unpack(data)):
+            moment = base + slot * step
+            if value != MISSING and start_ts <= moment < end_ts:
+                points.append((moment, value))
+    points.sort()
+    return [moment for moment, _value in points], [value for _moment, value in points]
+
+
+def usage_summary(organisation, metric, start, end):
+    """
+    Sample count, minimum, maximum, mean and latest value of ``metric``
+    over ``[start, end)``. Days that were rolled up count once, at their
+    peak. All but ``samples`` are None when there is no data.
+    """
+    times, values = usage_points(organisation, metric, start, end)
+    if not len(values):
+        return {'samples': 0, 'min': None, 'max': None, 'mean': None, 'latest': None}
+    if np is not None:
+        return {
+            'samples': int(values.size),
+            'min': int(values.min()),
+            'max': int(values.max()),
+            'mean': float(values.mean()),
+            'latest': int(values[-1]),
+        }
+    return {
+        'samples': len(values),
+        'min': min(values),
+        'max': max(values),
+        'mean': sum(values) / len(values),
+        'latest': values[-1],
+    }
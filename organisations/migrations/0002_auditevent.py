@@ -0,0 +1,30 @@
+# Generated by Django 5.1.6 on 2026-10-18 11:39
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organisations', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditEvent',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('occurred_at', models.DateTimeField(default=django.utils.timezone.now, help_text='When the action happened')),
+                ('action', models.CharField(help_text="What was done, e.g. 'created' or 'tier_changed'", max_length=100)),
+                ('actor', models.CharField(blank=True, default='system', help_text="Who did it: a user email or 'system'", max_length=255)),
+                ('details', models.TextField(blank=True)),
+                ('data', models.JSONField(blank=True, default=dict, help_text='Any further structured context for the action')),
+                ('organisation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='audit_events', to='organisations.organisation')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['organisation', '-occurred_at', '-id'], name='audit_org_time_idx'), models.Index(fields=['occurred_at'], name='audit_time_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,81 @@
+# Copies Organisation.audit_logs arrays into AuditEvent rows.
+
+from datetime import timezone as dt_timezone
+
+from django.db import migrations
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+BATCH_SIZE = 1000
+KNOWN_KEYS = {'timestamp', 'action', 'actor', 'details'}
+
+
+def _event(AuditEvent, organisation, entry):
+    if not isinstance(entry, dict):
+        return AuditEvent(organisation_id=organisation.pk, action='legacy',
+                          occurred_at=organisation.created_at, details=str(entry))
+    occurred_at = None
+    if isinstance(entry.get('timestamp'), str):
+        occurred_at = parse_datetime(entry['timestamp'])
+    if occurred_at is None:
+        occurred_at = organisation.created_at
+    elif timezone.is_naive(occurred_at):
+        occurred_at = timezone.make_aware(occurred_at, dt_timezone.utc)
+    return AuditEvent(
+        organisation_id=organisation.pk,
+        occurred_at=occurred_at,
+        action=str(entry.get('action') or 'unknown')[:100],
+        actor=str(entry.get('actor') or 'system')[:255],
+        details=str(entry.get('details') or ''),
+        data={key: value for key, value in entry.items() if key not in KNOWN_KEYS},
+    )
+
+
+def copy_audit_logs(apps, schema_editor):
+    # Stream organisations and insert their events in batches, so neither the
+    # arrays nor the events are all held in memory at once
+    Organisation = apps.get_model('organisations', 'Organisation')
+    AuditEvent = apps.get_model('organisations', 'AuditEvent')
+    pending = []
+    organisations = Organisation.objects.only(
+        'pk', 'created_at', 'audit_logs').order_by('pk')
+    for organisation in organisations.iterator(chunk_size=200):
+        for entry in organisation.audit_logs or []:
+            pending.append(_event(AuditEvent, organisation, entry))
+            if len(pending) >= BATCH_SIZE:
+                AuditEvent.objects.bulk_create(pending)
+                pending = []
+    if pending:
+        AuditEvent.objects.bulk_create(pending)
+
+
+def restore_audit_logs(apps, schema_editor):
+    Organisation = apps.get_model('organisations', 'Organisation')
+    AuditEvent = apps.get_model('organisations', 'AuditEvent')
+    for organisation in Organisation.objects.only('pk').iterator(chunk_size=200):
+        events = AuditEvent.objects.filter(
+            organisation_id=organisation.pk).order_by('occurred_at', 'id')
+        organisation.audit_logs = [
+            {
+                **event.data,
+                'timestamp': event.occurred_at.isoformat(),
+                'action': event.action,
+                'actor': event.actor,
+                'details': event.details,
+            }
+            for event in events.iterator()
+        ]
+        organisation.save(update_fields=['audit_logs'])
+
+
+class Migration(migrations.Migration):
+    # Each batch commits on its own rather than in one long transaction
+    atomic = False
+
+    dependencies = [
+        ('organisations', '0002_auditevent'),
+    ]
+
+    operations = [
+        migrations.RunPython(copy_audit_logs, restore_audit_logs),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.6 on 2026-10-18 11:41
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organisations', '0003_copy_audit_logs'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='organisation',
+            name='audit_logs',
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.6 on 2026-10-18 11:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organisations', '0004_remove_organisation_audit_logs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UsageCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(choices=[('USR', 'Users'), ('ITM', 'Items'), ('STO', 'Storage (MB)')], max_length=3)),
+                ('shard', models.PositiveSmallIntegerField()),
+                ('value', models.BigIntegerField(default=0, help_text='Usage not yet folded into the subscription')),
+                ('subscription', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='usage_counters', to='organisations.subscription')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('subscription', 'metric', 'shard'), name='usage_counter_shard_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.6 on 2026-10-18 11:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organisations', '0005_usagecounter'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='subscription',
+            index=models.Index(fields=['status', 'current_period_end', 'id'], name='sub_status_period_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subscription',
+            index=models.Index(fields=['status', 'trial_end', 'id'], name='sub_status_trial_idx'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Fills OrganisationDomain from the existing allowed_domains lists.
+
+from django.db import migrations
+
+BATCH_SIZE = 1000
+
+
+def _normalise(domain):
+    return domain.strip().lstrip('@').lower()
+
+
+def backfill_domains(apps, schema_editor):
+    Organisation = apps.get_model('organisations', 'Organisation')
+    OrganisationDomain = apps.get_model('organisations', 'OrganisationDomain')
+    pending = []
+    organisations = (
+        Organisation.objects
+        .exclude(allowed_domains=[])
+        .order_by('created_at')
+        .values_list('pk', 'allowed_domains')
+    )
+    for organisation_id, domains in organisations.iterator(chunk_size=BATCH_SIZE):
+        for domain in {_normalise(d) for d in domains or [] if isinstance(d, str)}:
+            pending.append(OrganisationDomain(organisation_id=organisation_id, domain=domain))
+        if len(pending) >= BATCH_SIZE:
+            # A domain listed by two organisations stays with the older one
+            OrganisationDomain.objects.bulk_create(pending, ignore_conflicts=True)
+            pending = []
+    if pending:
+        OrganisationDomain.objects.bulk_create(pending, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organisations', '0007_organisationdomain_organisationmember'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_domains, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-18 12:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organisations', '0008_backfill_organisation_domains'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='organisationmember',
+            name='role',
+            field=models.CharField(default='user', help_text="Role name in the organisation's role_hierarchy", max_length=50),
+        ),
+    ]
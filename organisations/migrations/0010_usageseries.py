@@ -0,0 +1,29 @@
+# Generated by Django 5.1.6 on 2026-10-18 12:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organisations', '0009_organisationmember_role'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UsageSeries',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(choices=[('USR', 'Users'), ('ITM', 'Items'), ('STO', 'Storage (MB)')], max_length=3)),
+                ('resolution', models.CharField(choices=[('HRS', 'Hourly'), ('DAY', 'Daily')], max_length=3)),
+                ('period_start', models.DateField(help_text='First day covered: the day, or the first of the month')),
+                ('values', models.BinaryField(help_text='Packed little-endian int64 samples')),
+                ('organisation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='usage_series', to='organisations.organisation')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['resolution', 'period_start'], name='usage_series_rollup_idx')],
+                'constraints': [models.UniqueConstraint(fields=('organisation', 'metric', 'resolution', 'period_start'), name='usage_series_period_unique')],
+            },
+        ),
+    ]
@@ -2,7 +2,12 @@
 from django.db import models
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
+from django.core.validators import DomainNameValidator
+from django.db import transaction
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
+from backlogger_api.dirty_fields import DirtyFieldsMixin
+from .tiers import FEATURE_FLAGS, get_tier_policy
 import uuid
 
 User = get_user_model()
@@ -46,7 +51,11 @@ class SubscriptionTier(models.TextChoices):
     ENTERPRISE = 'ENT', _('Enterprise')
 
 
-class Organisation(models.Model):
+# Fields whose values the tier policy sets
+TIER_POLICY_FIELDS = {'subscription_tier', 'storage_limit', *FEATURE_FLAGS}
+
+
+class Organisation(DirtyFieldsMixin, models.Model):
     """
     Core organisation model representing a client entity with all associated
     configuration, hierarchy settings, and subscription details.
@@ -147,10 +156,6 @@ class Organisation(models.Model):
         default=dict,
         help_text=_("Data retention settings")
     )
-    audit_logs = models.JSONField(
-        default=list,
-        help_text=_("Record of administrative actions")
-    )
 
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
@@ -168,13 +173,34 @@ class Organisation(models.Model):
     def __str__(self):
         return f"{self.name} ({self.get_subscription_tier_display()})"
 
+    @property
+    def tier_policy(self):
+        """The ``TierPolicy`` for this organisation's subscription tier"""
+        return get_tier_policy(self.subscription_tier)
+
     def clean(self):
         """Validate organisation data and enforces business rules"""
-        if self.subscription_tier != SubscriptionTier.ENTERPRISE and self.allowed_domains:
+        try:
+            policy = self.tier_policy
+        except KeyError:
+            # Not a tier at all, which clean_fields reports on subscription_tier
+            return
+
+        if not policy.allows_domain_restriction and self.allowed_domains:
             raise ValidationError({
                 'allowed_domains': _("Allowed domains are only available for Enterprise tier")
             })
 
+        from .domains import normalise_domain
+        validate_domain = DomainNameValidator(accept_idna=False)
+        for domain in self.allowed_domains or []:
+            try:
+                validate_domain(normalise_domain(domain))
+            except (ValidationError, AttributeError):
+                raise ValidationError({
+                    'allowed_domains': _("'%(domain)s' is not a valid domain") % {'domain': domain}
+                })
+
         if not self.enable_scrum_hierarchy and self.default_framework == ProjectFramework.SCRUM:
             raise ValidationError({
                 'default_framework': _("Cannot set Scrum as default when Scrum hierarchy is disabled")
@@ -185,32 +211,64 @@ class Organisation(models.Model):
                 'default_framework': _("Cannot set Waterfall as default when Waterfall is disabled")
             })
 
+        if self.default_framework not in policy.methodologies:
+            raise ValidationError({
+                'default_framework': _("This methodology is not available on the current tier")
+            })
+
+    def apply_tier_policy(self):
+        """Set hierarchy enablement and storage from the tier policy"""
+        try:
+            policy = self.tier_policy
+        except KeyError:
+            # Unknown tier: leave the fields for full_clean to reject
+            return set()
+        for flag, enabled in policy.forced_features.items():
+            setattr(self, flag, enabled)
+        self.storage_limit = policy.storage_limit
+        return {'storage_limit', *policy.forced_features}
+
     def save(self, *args, **kwargs):
-        # Set hierarchy enablement based on subscription tier
-        if self.subscription_tier == SubscriptionTier.ENTERPRISE:
-            self.enable_objective_layer = True
-            self.enable_platform_layer = True
-            self.enable_scrum_hierarchy = True
-            self.enable_waterfall = True
-            self.storage_limit = 1024000  # 1TB in MB
-        elif self.subscription_tier == SubscriptionTier.BUSINESS:
-            self.enable_objective_layer = True
-            self.enable_platform_layer = True
-            self.enable_scrum_hierarchy = True
-            self.storage_limit = 102400   # 100GB in MB
-        elif self.subscription_tier == SubscriptionTier.PRO:
-            self.enable_scrum_hierarchy = True
-            self.enable_platform_layer = False
-            self.storage_limit = 51200    # 50GB in MB
-        else:  # STARTER
-            self.enable_objective_layer = False
-            self.enable_platform_layer = False
-            self.enable_scrum_hierarchy = False
-            self.enable_waterfall = False
-            self.storage_limit = 10240    # 10GB in MB
-
-        self.full_clean()
-        super().save(*args, **kwargs)
+        adding = self._state.adding
+        dirty = self.get_dirty_fields()
+        if dirty is None:
+            # New (or untracked) instance: apply and validate everything
+            self.apply_tier_policy()
+            self.full_clean()
+            changed = None
+        else:
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                changed = set(update_fields)
+            else:
+                changed = dirty
+                if not changed:
+                    # Nothing to write
+                    return
+
+            # Re-apply the policy whenever the tier or a field it governs
+            # changed, so a save cannot lift a tier's limits or flags
+            if changed & TIER_POLICY_FIELDS:
+                changed |= self.apply_tier_policy()
+
+            # Validate only what changed, so e.g. the owner uniqueness query is
+            # skipped unless the owner changed
+            self.full_clean(exclude=[
+                field.name for field in self._meta.fields if field.name not in changed])
+            kwargs['update_fields'] = changed | {'updated_at'}
+
+        if changed is None:
+            domains_changed = bool(self.allowed_domains) or not adding
+        else:
+            domains_changed = 'allowed_domains' in changed
+        if not domains_changed:
+            return super().save(*args, **kwargs)
+
+        # Keep the domain lookup table in step with allowed_domains
+        from .domains import sync_organisation_domains
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            sync_organisation_domains(self, created=adding)
 
     @property
     def is_enterprise(self):
@@ -305,6 +363,11 @@ class Subscription(models.Model):
             models.Index(fields=['status']),
             models.Index(fields=['current_period_end']),
             models.Index(fields=['trial_end']),
+            # Keyset scans of the lifecycle sweeper
+            models.Index(fields=['status', 'current_period_end', 'id'],
+                         name='sub_status_period_idx'),
+            models.Index(fields=['status', 'trial_end', 'id'],
+                         name='sub_status_trial_idx'),
         ]
 
     def __str__(self):
@@ -341,13 +404,7 @@ class Subscription(models.Model):
     @property
     def max_users(self):
         """Maximum allowed users based on organisation tier"""
-        tier_limits = {
-            'STR': 10,     # Starter: 10 users
-            'PRO': 50,     # Pro: 50 users
-            'BUS': 250,    # Business: 250 users
-            'ENT': 999999  # Enterprise: Unlimited
-        }
-        return tier_limits[self.organisation.subscription_tier]
+        return self.organisation.tier_policy.max_users
 
     @property
     def max_storage(self):
@@ -357,13 +414,7 @@ class Subscription(models.Model):
     @property
     def max_items(self):
         """Maximum allowed items based on organisation tier"""
-        tier_limits = {
-            'STR': 1000,   # Starter: 1,000 items
-            'PRO': 10000,  # Pro: 10,000 items
-            'BUS': 50000,  # Business: 50,000 items
-            'ENT': 999999  # Enterprise: Unlimited
-        }
-        return tier_limits[self.organisation.subscription_tier]
+        return self.organisation.tier_policy.max_items
 
     @property
     def is_trial(self):
@@ -379,3 +430,181 @@ class Subscription(models.Model):
     def is_cancelled(self):
         """Check if subscription has been cancelled"""
         return self.status == SubscriptionStatus.CANCELLED
+
+
+class UsageMetric(models.TextChoices):
+    USERS = 'USR', _('Users')
+    ITEMS = 'ITM', _('Items')
+    STORAGE = 'STO', _('Storage (MB)')
+
+
+class UsageCounter(models.Model):
+    """
+    One shard of a subscription's usage counter. Increments land on a
+    random shard so concurrent writers rarely contend for the same row;
+    the subscription's ``current_*`` field plus the sum of its shards is the
+    current usage (see organisations/usage.py).
+    """
+    subscription = models.ForeignKey(
+        'Subscription',
+        on_delete=models.CASCADE,
+        related_name='usage_counters'
+    )
+    metric = models.CharField(
+        max_length=3,
+        choices=UsageMetric.choices
+    )
+    shard = models.PositiveSmallIntegerField()
+    value = models.BigIntegerField(
+        default=0,
+        help_text=_("Usage not yet folded into the subscription")
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['subscription', 'metric', 'shard'],
+                name='usage_counter_shard_unique'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.get_metric_display()} shard {self.shard}: {self.value}"
+
+
+class AuditEvent(models.Model):
+    """
+    Append-only record of an administrative action on an organisation.
+    Rows are keyed by organisation and time: reads page through one
+    organisation's history newest first, and retention purges delete by age.
+    """
+    id = models.BigAutoField(primary_key=True)
+    organisation = models.ForeignKey(
+        'Organisation',
+        on_delete=models.CASCADE,
+        related_name='audit_events'
+    )
+    occurred_at = models.DateTimeField(
+        default=timezone.now,
+        help_text=_("When the action happened")
+    )
+    action = models.CharField(
+        max_length=100,
+        help_text=_("What was done, e.g. 'created' or 'tier_changed'")
+    )
+    actor = models.CharField(
+        max_length=255,
+        blank=True,
+        default='system',
+        help_text=_("Who did it: a user email or 'system'")
+    )
+    details = models.TextField(blank=True)
+    data = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text=_("Any further structured context for the action")
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['organisation', '-occurred_at', '-id'],
+                         name='audit_org_time_idx'),
+            models.Index(fields=['occurred_at'], name='audit_time_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.action} by {self.actor} at {self.occurred_at:%Y-%m-%d %H:%M}"
+
+
+class OrganisationDomain(models.Model):
+    """
+    An email domain claimed by an organisation, one row per entry of
+    ``Organisation.allowed_domains``. The unique index lets registration
+    find the organisation for a new user's domain without scanning every
+    organisation's JSON (see organisations/domains.py).
+    """
+    domain = models.CharField(
+        max_length=253,
+        unique=True,
+        help_text=_("Lower-case email domain, e.g. example.com")
+    )
+    organisation = models.ForeignKey(
+        'Organisation',
+        on_delete=models.CASCADE,
+        related_name='domains'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.domain
+
+
+class OrganisationMember(models.Model):
+    """A user who belongs to an organisation without owning it."""
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        related_name='organisation_membership'
+    )
+    organisation = models.ForeignKey(
+        'Organisation',
+        on_delete=models.CASCADE,
+        related_name='members'
+    )
+    role = models.CharField(
+        max_length=50,
+        default='user',
+        help_text=_("Role name in the organisation's role_hierarchy")
+    )
+    joined_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.user} in {self.organisation.name}"
+
+
+class UsageResolution(models.TextChoices):
+    HOURLY = 'HRS', _('Hourly')
+    DAILY = 'DAY', _('Daily')
+
+
+class UsageSeries(models.Model):
+    """
+    Packed usage history for one organisation and metric. Hourly rows cover
+    one day with 24 slots; daily rows cover one calendar month with 31
+    slots, each holding that day's peak. Slots are little-endian int64
+    values, with -1 where no sample was taken (see organisations/metering.py).
+    """
+    organisation = models.ForeignKey(
+        'Organisation',
+        on_delete=models.CASCADE,
+        related_name='usage_series'
+    )
+    metric = models.CharField(
+        max_length=3,
+        choices=UsageMetric.choices
+    )
+    resolution = models.CharField(
+        max_length=3,
+        choices=UsageResolution.choices
+    )
+    period_start = models.DateField(
+        help_text=_("First day covered: the day, or the first of the month")
+    )
+    values = models.BinaryField(
+        help_text=_("Packed little-endian int64 samples")
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['organisation', 'metric', 'resolution', 'period_start'],
+                name='usage_series_period_unique'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['resolution', 'period_start'],
+                         name='usage_series_rollup_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_metric_display()} {self.get_resolution_display()} {self.period_start}"
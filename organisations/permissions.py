@@ -0,0 +1,45 @@
+# organisations/permissions.py
+from rest_framework.permissions import SAFE_METHODS, BasePermission
+from .models import Organisation
+from .rbac import organisation_role, rbac
+from .tenancy import get_tenant_context
+
+
+def required_permissions(request, view):
+    """
+    The permissions ``view`` needs for this request. Views may set
+    ``required_permissions`` to a dict of HTTP method to a tuple of
+    permission names; unlisted methods need ``read`` if safe and ``write``
+    otherwise.
+    """
+    required = getattr(view, 'required_permissions', None) or {}
+    if request.method in required:
+        return required[request.method]
+    return ('read',) if request.method in SAFE_METHODS else ('write',)
+
+
+class HasOrganisationPermission(BasePermission):
+    """
+    Allows a request if the caller's role in their organisation grants the
+    view's required permissions, per the organisation's ``role_hierarchy``.
+    Objects must belong to the caller's organisation.
+    """
+
+    def _tenant(self, request):
+        tenant = getattr(request, 'tenant', None)
+        if tenant is None:
+            tenant = get_tenant_context(request.user)
+        return tenant
+
+    def has_permission(self, request, view):
+        organisation = self._tenant(request).organisation
+        role = organisation_role(request.user, organisation)
+        return rbac.has_permissions(
+            organisation, role, tuple(required_permissions(request, view)))
+
+    def has_object_permission(self, request, view, obj):
+        if isinstance(obj, Organisation):
+            organisation_id = obj.pk
+        else:
+            organisation_id = getattr(obj, 'organisation_id', None)
+        return organisation_id == self._tenant(request).organisation_id
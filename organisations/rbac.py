@@ -0,0 +1,143 @@
+# organisations/rbac.py
+"""
+Role-based access control over ``Organisation.role_hierarchy``.
+
+A hierarchy maps role names to lists of permissions. An entry that is the
+name of another role inherits everything that role grants::
+
+    {'admin': ['user', 'write', 'invite'], 'user': ['read']}
+
+Compiling a hierarchy gives each permission one bit and resolves every
+role, inheritance included, to an integer mask, so a check is two dict
+lookups and a bitwise AND. Compiled hierarchies are cached per process by
+organisation id and ``updated_at``, so saving an organisation recompiles
+its hierarchy on next use. The organisation owner holds every permission.
+"""
+import threading
+
+from django.conf import settings
+from rest_framework_simplejwt.models import TokenUser
+from authentications.tokens import Role
+
+# The owner's role; not a name, so no hierarchy entry can claim it
+OWNER = object()
+
+
+class CompiledHierarchy:
+    """Permission bits and per-role masks for one role hierarchy."""
+
+    __slots__ = ('bits', 'masks', 'required')
+
+    def __init__(self, hierarchy):
+        hierarchy = {
+            role: [entry for entry in entries if isinstance(entry, str)]
+            for role, entries in (hierarchy or {}).items()
+            if isinstance(entries, (list, tuple))
+        }
+        self.bits = {}
+        for entries in hierarchy.values():
+            for entry in entries:
+                if entry not in hierarchy and entry not in self.bits:
+                    self.bits[entry] = 1 << len(self.bits)
+
+        direct = {
+            role: [self.bits[entry] for entry in entries if entry not in hierarchy]
+            for role, entries in hierarchy.items()
+        }
+        self.masks = {}
+        for role in hierarchy:
+            # Walk everything the role inherits; cycles simply stop the walk
+            mask, seen, pending = 0, {role}, [role]
+            while pending:
+                current = pending.pop()
+                for bit in direct[current]:
+                    mask |= bit
+                for entry in hierarchy[current]:
+                    if entry in hierarchy and entry not in seen:
+                        seen.add(entry)
+                        pending.append(entry)
+            self.masks[role] = mask
+        self.required = {}
+
+    def mask_for(self, permissions):
+        """The mask needed for ``permissions``, memoised per tuple."""
+        mask = self.required.get(permissions)
+        if mask is None:
+            # A permission no role grants gets a bit no role has
+            unknown = 1 << len(self.bits)
+            mask = 0
+            for permission in permissions:
+                mask |= self.bits.get(permission, unknown)
+            self.required[permissions] = mask
+        return mask
+
+    def allows(self, role, permissions):
+        required = self.mask_for(permissions)
+        return self.masks.get(role, 0) & required == required
+
+
+class RBACEvaluator:
+    """Process-wide cache of compiled hierarchies keyed by organisation."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.compiled = {}
+
+    @property
+    def max_size(self):
+        return getattr(settings, 'RBAC_CACHE_SIZE', 1024)
+
+    def compile(self, organisation):
+        entry = self.compiled.get(organisation.pk)
+        if entry is not None and entry[0] == organisation.updated_at:
+            return entry[1]
+        hierarchy = CompiledHierarchy(organisation.role_hierarchy)
+        with self.lock:
+            self.compiled.pop(organisation.pk, None)
+            self.compiled[organisation.pk] = (organisation.updated_at, hierarchy)
+            while len(self.compiled) > self.max_size:
+                # Drop the least recently compiled
+                del self.compiled[next(iter(self.compiled))]
+        return hierarchy
+
+    def has_permissions(self, organisation, role, permissions):
+        """
+        True if ``role`` (a role name, ``OWNER`` or None) grants every one of
+        ``permissions`` (a tuple of names) in ``organisation``.
+        """
+        if role is OWNER:
+            return True
+        if role is None:
+            return False
+        return self.compile(organisation).allows(role, permissions)
+
+    def clear(self):
+        with self.lock:
+            self.compiled.clear()
+
+
+rbac = RBACEvaluator()
+
+
+def organisation_role(user, organisation):
+    """
+    ``user``'s role in ``organisation``: ``OWNER``, a role name from its
+    hierarchy, or None if they do not belong to it. JWT users are resolved
+    from their claims without a query.
+    """
+    if organisation is None or not user.is_authenticated:
+        return None
+
+    if isinstance(user, TokenUser):
+        if str(getattr(user, 'organisation_id', None)) != str(organisation.pk):
+            return None
+        if user.role == Role.OWNER:
+            return OWNER
+        return getattr(user, 'member_role', None)
+
+    if organisation.owner_id == user.pk:
+        return OWNER
+    membership = getattr(user, 'organisation_membership', None)
+    if membership is not None and membership.organisation_id == organisation.pk:
+        return membership.role
+    return None
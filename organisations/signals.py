@@ -0,0 +1,35 @@
+# organisations/signals.py
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .domains import domain_registry
+from .models import Organisation, OrganisationMember, Subscription
+from .tenancy import tenant_cache
+
+
+def _invalidate_tenant(organisation_id, owner_id):
+    tenant_cache.invalidate(organisation_id, owner_id)
+    # A request in another thread may cache the old row before we commit
+    transaction.on_commit(lambda: tenant_cache.invalidate(organisation_id, owner_id))
+
+
+@receiver([post_save, post_delete], sender=Organisation)
+def invalidate_organisation_tenant(sender, instance, **kwargs):
+    _invalidate_tenant(instance.pk, instance.owner_id)
+
+
+@receiver([post_save, post_delete], sender=Subscription)
+def invalidate_subscription_tenant(sender, instance, **kwargs):
+    _invalidate_tenant(instance.organisation_id, None)
+
+
+@receiver([post_save, post_delete], sender=OrganisationMember)
+def invalidate_member_tenant(sender, instance, **kwargs):
+    _invalidate_tenant(instance.organisation_id, instance.user_id)
+
+
+@receiver(post_delete, sender=Organisation)
+def forget_organisation_domains(sender, instance, **kwargs):
+    # The domain rows go with the organisation by cascade
+    organisation_id = instance.pk
+    transaction.on_commit(lambda: domain_registry.update(organisation_id, ()))
@@ -0,0 +1,160 @@
+# organisations/tenancy.py
+"""
+Tenant context: the caller's organisation and its subscription.
+
+``TenantContextMiddleware`` puts a lazy ``request.tenant`` on every request.
+It is resolved on first access, after DRF authentication, with one
+``select_related`` query, and the result is reused by every permission
+check and serializer in the request.
+
+Resolved contexts are also kept in a process-wide LRU cache
+(``TENANT_CACHE_SIZE`` entries, each valid for ``TENANT_CACHE_TTL``
+seconds), so most requests resolve the tenant without a query. Saving or
+deleting an ``Organisation`` or ``Subscription`` drops its entries in this
+process at once and again when the transaction commits. Other processes
+see the change when their entry expires.
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+import copy
+import threading
+import time
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.functional import SimpleLazyObject
+from rest_framework_simplejwt.models import TokenUser
+from .models import Organisation, Subscription
+
+
+@dataclass(frozen=True)
+class TenantContext:
+    organisation: Organisation | None = None
+    subscription: Subscription | None = None
+
+    def __bool__(self):
+        return self.organisation is not None
+
+    @property
+    def organisation_id(self):
+        return self.organisation.pk if self.organisation else None
+
+    def copy(self):
+        """A copy whose instances the caller may change without touching the cache."""
+        if self.organisation is None:
+            return self
+        organisation = copy.copy(self.organisation)
+        subscription = copy.copy(self.subscription) if self.subscription else None
+        Organisation.subscription.related.set_cached_value(organisation, subscription)
+        if subscription:
+            Subscription.organisation.field.set_cached_value(subscription, organisation)
+        return TenantContext(organisation, subscription)
+
+
+NO_TENANT = TenantContext()
+
+
+class TenantCache:
+    """Thread-safe LRU of ``TenantContext`` with a time-to-live per entry."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+
+    @property
+    def max_size(self):
+        return getattr(settings, 'TENANT_CACHE_SIZE', 1024)
+
+    @property
+    def ttl(self):
+        return getattr(settings, 'TENANT_CACHE_TTL', 30)
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            context, expires = entry
+            if expires <= time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return context
+
+    def set(self, key, context):
+        with self.lock:
+            self.entries[key] = (context, time.monotonic() + self.ttl)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, organisation_id=None, owner_id=None):
+        """Drop entries for an organisation (by id) and for its owner."""
+        with self.lock:
+            stale = [
+                key for key, (context, _expires) in self.entries.items()
+                if key in (('organisation', str(organisation_id)), ('user', owner_id))
+                or (organisation_id is not None
+                    and context.organisation_id == organisation_id)
+            ]
+            for key in stale:
+                del self.entries[key]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+tenant_cache = TenantCache()
+
+
+def _load(**lookup):
+    organisation = (
+        Organisation.objects
+        .select_related('subscription')
+        .filter(**lookup)
+        .first()
+    )
+    if organisation is None:
+        return NO_TENANT
+    return TenantContext(organisation, getattr(organisation, 'subscription', None))
+
+
+def get_tenant_context(user):
+    """
+    The ``TenantContext`` for ``user``, from the process cache where
+    possible. Users authenticated by JWT are resolved from their
+    ``organisation_id`` claim; others by the organisation they own or
+    belong to.
+    """
+    if user is None or not user.is_authenticated:
+        return NO_TENANT
+
+    if isinstance(user, TokenUser):
+        organisation_id = getattr(user, 'organisation_id', None)
+        if not organisation_id:
+            return NO_TENANT
+        key = ('organisation', str(organisation_id))
+        lookup = {'pk': organisation_id}
+    else:
+        key = ('user', user.pk)
+        lookup = {'pk__in': Organisation.objects.filter(
+            Q(owner_id=user.pk) | Q(members__user_id=user.pk)).values('pk')}
+
+    context = tenant_cache.get(key)
+    if context is None:
+        context = _load(**lookup)
+        tenant_cache.set(key, context)
+    return context.copy()
+
+
+class TenantContextMiddleware:
+    """Adds a lazily resolved ``request.tenant`` to every request."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        # Read request.user when first used, so DRF has authenticated it
+        request.tenant = SimpleLazyObject(lambda: get_tenant_context(request.user))
+        return self.get_response(request)
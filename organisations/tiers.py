@@ -0,0 +1,211 @@
+# organisations/tiers.py
+"""
+Subscription tier policies.
+
+Each ``SubscriptionTier`` has one immutable ``TierPolicy`` holding its
+feature flags, quotas and allowed methodologies. Models, validation and API
+responses all read from this registry instead of keeping their own copies
+of the rules.
+
+The registry is built once per process from the defaults below, merged
+with any overrides in the ``TIER_POLICY_OVERRIDES`` setting and in the JSON
+file named by ``TIER_POLICY_FILE``. The file is checked for changes at most
+every ``TIER_POLICY_CHECK_SECONDS``, so policy changes roll out without a
+restart; ``invalidate_tier_policies()`` forces a rebuild in this process.
+"""
+from dataclasses import asdict, dataclass, fields, replace
+from types import MappingProxyType
+import json
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+logger = logging.getLogger(__name__)
+
+# Hierarchy flags a tier can force on or off; None leaves it to the organisation
+FEATURE_FLAGS = ('enable_objective_layer', 'enable_platform_layer',
+                 'enable_scrum_hierarchy', 'enable_waterfall')
+
+UNLIMITED = 999999
+
+
+@dataclass(frozen=True)
+class TierPolicy:
+    tier: str
+    enable_objective_layer: bool | None
+    enable_platform_layer: bool | None
+    enable_scrum_hierarchy: bool | None
+    enable_waterfall: bool | None
+    storage_limit: int  # MB
+    max_users: int
+    max_items: int
+    methodologies: frozenset
+    allows_domain_restriction: bool = False
+
+    @property
+    def forced_features(self):
+        """The feature flags this tier sets regardless of the organisation."""
+        return {
+            flag: getattr(self, flag) for flag in FEATURE_FLAGS
+            if getattr(self, flag) is not None
+        }
+
+    def as_dict(self):
+        data = asdict(self)
+        data['methodologies'] = sorted(self.methodologies)
+        return data
+
+
+def default_policies():
+    from .models import ProjectFramework, SubscriptionTier
+
+    every_methodology = frozenset(ProjectFramework.values)
+    return {
+        SubscriptionTier.STARTER: TierPolicy(
+            tier=SubscriptionTier.STARTER,
+            enable_objective_layer=False,
+            enable_platform_layer=False,
+            enable_scrum_hierarchy=False,
+            enable_waterfall=False,
+            storage_limit=10240,  # 10GB
+            max_users=10,
+            max_items=1000,
+            methodologies=frozenset({ProjectFramework.KANBAN}),
+        ),
+        SubscriptionTier.PRO: TierPolicy(
+            tier=SubscriptionTier.PRO,
+            enable_objective_layer=None,
+            enable_platform_layer=False,
+            enable_scrum_hierarchy=True,
+            enable_waterfall=False,
+            storage_limit=51200,  # 50GB
+            max_users=50,
+            max_items=10000,
+            methodologies=frozenset({ProjectFramework.KANBAN, ProjectFramework.SCRUM}),
+        ),
+        SubscriptionTier.BUSINESS: TierPolicy(
+            tier=SubscriptionTier.BUSINESS,
+            enable_objective_layer=True,
+            enable_platform_layer=True,
+            enable_scrum_hierarchy=True,
+            enable_waterfall=None,
+            storage_limit=102400,  # 100GB
+            max_users=250,
+            max_items=50000,
+            methodologies=every_methodology,
+        ),
+        SubscriptionTier.ENTERPRISE: TierPolicy(
+            tier=SubscriptionTier.ENTERPRISE,
+            enable_objective_layer=True,
+            enable_platform_layer=True,
+            enable_scrum_hierarchy=True,
+            enable_waterfall=True,
+            storage_limit=1024000,  # 1TB
+            max_users=UNLIMITED,
+            max_items=UNLIMITED,
+            methodologies=every_methodology,
+            allows_domain_restriction=True,
+        ),
+    }
+
+
+POLICY_FIELDS = {field.name for field in fields(TierPolicy)} - {'tier'}
+
+
+def _apply_overrides(policies, overrides, source):
+    for tier, values in (overrides or {}).items():
+        if tier not in policies:
+            raise ImproperlyConfigured(f"Unknown subscription tier {tier!r} in {source}")
+        unknown = set(values) - POLICY_FIELDS
+        if unknown:
+            raise ImproperlyConfigured(
+                f"Unknown tier policy fields {sorted(unknown)} in {source}")
+        values = dict(values)
+        if 'methodologies' in values:
+            values['methodologies'] = frozenset(values['methodologies'])
+        policies[tier] = replace(policies[tier], **values)
+
+
+class TierPolicyRegistry:
+    """Process-wide, read-only mapping of tier code to ``TierPolicy``."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.invalidate()
+
+    def invalidate(self):
+        self.policies = None
+        self.file_mtime = None
+        self.last_check = 0.0
+
+    @property
+    def check_interval(self):
+        return getattr(settings, 'TIER_POLICY_CHECK_SECONDS', 30)
+
+    def _file_mtime(self):
+        path = getattr(settings, 'TIER_POLICY_FILE', None)
+        try:
+            return os.stat(path).st_mtime if path else None
+        except OSError:
+            return None
+
+    def _build(self):
+        policies = default_policies()
+        _apply_overrides(policies, getattr(settings, 'TIER_POLICY_OVERRIDES', None),
+                         'TIER_POLICY_OVERRIDES')
+        path = getattr(settings, 'TIER_POLICY_FILE', None)
+        mtime = self._file_mtime()
+        if mtime is not None:
+            with open(path, encoding='utf-8') as handle:
+                _apply_overrides(policies, json.load(handle), path)
+        self.policies = MappingProxyType(policies)
+        self.file_mtime = mtime
+        self.last_check = time.monotonic()
+
+    def _check_file(self):
+        self.last_check = time.monotonic()
+        if self._file_mtime() != self.file_mtime:
+            try:
+                self._build()
+                logger.info("Reloaded tier policies")
+            except (OSError, ValueError, ImproperlyConfigured) as e:
+                # Keep serving the last good policies rather than failing requests
+                logger.error(f"Could not reload tier policies: {str(e)}")
+
+    def all(self):
+        if self.policies is None:
+            with self.lock:
+                if self.policies is None:
+                    self._build()
+        elif time.monotonic() - self.last_check >= self.check_interval:
+            with self.lock:
+                self._check_file()
+        return self.policies
+
+    def get(self, tier):
+        return self.all()[tier]
+
+
+tier_policies = TierPolicyRegistry()
+
+
+def get_tier_policy(tier):
+    """The ``TierPolicy`` for a ``SubscriptionTier`` code."""
+    return tier_policies.get(tier)
+
+
+def invalidate_tier_policies():
+    """Rebuild the registry on next use, e.g. after changing overrides."""
+    tier_policies.invalidate()
+
+
+@receiver(setting_changed)
+def _reset_tier_policies(setting, **kwargs):
+    if setting in ('TIER_POLICY_OVERRIDES', 'TIER_POLICY_FILE'):
+        invalidate_tier_policies()
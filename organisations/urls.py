@@ -1,8 +1,9 @@
 # organisations/urls.py
 from django.urls import path
+from . import views
 
 app_name = 'organisations'
 
 urlpatterns = [
-    # Will add URL patterns here later
+    path('tiers/', views.TierPolicyView.as_view(), name='tiers'),
 ]
@@ -0,0 +1,273 @@
+# organisations/usage.py
+"""
+Usage metering for subscriptions.
+
+Incrementing ``Subscription.current_*`` with a read-modify-write ``save()``
+would serialise every write in an organisation on the subscription row.
+Instead, increments are buffered in process, coalesced per subscription and
+metric, and flushed as ``value = value + delta`` updates on one of
+``USAGE_COUNTER_SHARDS`` ``UsageCounter`` rows chosen at random. Flushes
+happen when ``USAGE_FLUSH_SECONDS`` have passed (checked at the end of each
+request), when ``USAGE_FLUSH_MAX_PENDING`` increments are buffered, on ``flush()``, and
+once more when the process exits. A full buffer is flushed once the incrementing transaction
+commits, never inside it: the buffer holds other requests' deltas, which a
+rollback of that transaction would otherwise discard.
+
+Current usage is the subscription's ``current_*`` field plus the sum of its
+shards (plus this process's unflushed deltas). ``fold_counters()`` moves
+shard totals into the subscription fields, and ``reconcile_usage()``
+additionally resets metrics to the true totals reported by registered
+sources, correcting any deltas lost with a process.
+"""
+import atexit
+from collections import defaultdict
+import logging
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.core.signals import request_finished
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.dispatch import receiver
+from .models import Subscription, UsageCounter, UsageMetric
+
+logger = logging.getLogger(__name__)
+
+METRIC_FIELDS = {
+    UsageMetric.USERS: 'current_user_count',
+    UsageMetric.ITEMS: 'current_item_count',
+    UsageMetric.STORAGE: 'current_storage_used',
+}
+
+METRIC_LIMITS = {
+    UsageMetric.USERS: 'max_users',
+    UsageMetric.ITEMS: 'max_items',
+    UsageMetric.STORAGE: 'max_storage',
+}
+
+# metric -> callable(subscription_ids) returning {subscription_id: total}
+_sources = {}
+
+
+def register_usage_source(metric):
+    """
+    Register a function that computes the true usage of ``metric`` for a
+    list of subscription ids, used by ``reconcile_usage()``::
+
+        @register_usage_source(UsageMetric.ITEMS)
+        def item_totals(subscription_ids):
+            ...
+    """
+    def decorator(func):
+        _sources[metric] = func
+        return func
+    return decorator
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+class UsageMeter:
+    """Buffers usage increments and flushes them to sharded counters."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending = defaultdict(int)
+        self.pending_count = 0
+        self.last_flush = time.monotonic()
+
+    def increment(self, subscription_id, metric, delta=1):
+        """Record ``delta`` usage of ``metric`` for a subscription."""
+        with self.lock:
+            self.pending[(subscription_id, metric)] += delta
+            self.pending_count += 1
+            full = self._full()
+        if full:
+            # Runs at once outside a transaction
+            transaction.on_commit(self._flush_if_full)
+
+    def _full(self):
+        return self.pending_count >= _setting('USAGE_FLUSH_MAX_PENDING', 1000)
+
+    def pending_delta(self, subscription_id, metric):
+        with self.lock:
+            return self.pending.get((subscription_id, metric), 0)
+
+    def flush(self):
+        """Write buffered deltas, one UPDATE per subscription and metric."""
+        with self.lock:
+            pending, self.pending = self.pending, defaultdict(int)
+            self.pending_count = 0
+            self.last_flush = time.monotonic()
+        deltas = {key: delta for key, delta in pending.items() if delta}
+        if not deltas:
+            return 0
+
+        shards = _setting('USAGE_COUNTER_SHARDS', 8)
+        try:
+            with transaction.atomic():
+                for (subscription_id, metric), delta in deltas.items():
+                    _add_to_shard(subscription_id, metric,
+                                  random.randrange(shards), delta, shards)
+        except Exception:
+            # Put the deltas back so a later flush can retry them
+            with self.lock:
+                for key, delta in deltas.items():
+                    self.pending[key] += delta
+            raise
+        return len(deltas)
+
+    def _flush_logged(self):
+        # Failed deltas stay buffered for the next flush
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error(f"Usage flush failed: {str(e)}")
+
+    def _flush_if_full(self):
+        # Other commits may have flushed the buffer since this was scheduled
+        if self._full():
+            self._flush_logged()
+
+    def flush_if_due(self):
+        if self.pending_count and time.monotonic() - self.last_flush >= \
+                _setting('USAGE_FLUSH_SECONDS', 5):
+            self._flush_logged()
+
+
+def _add_to_shard(subscription_id, metric, shard, delta, shards):
+    counter = UsageCounter.objects.filter(
+        subscription_id=subscription_id, metric=metric, shard=shard)
+    if counter.update(value=F('value') + delta):
+        return
+    # First write for this subscription and metric: create every shard once
+    UsageCounter.objects.bulk_create(
+        [UsageCounter(subscription_id=subscription_id, metric=metric, shard=n)
+         for n in range(shards)],
+        ignore_conflicts=True,
+    )
+    counter.update(value=F('value') + delta)
+
+
+usage_meter = UsageMeter()
+
+# Deltas still buffered when a worker exits would otherwise be lost until
+# the next reconcile
+atexit.register(usage_meter._flush_logged)
+
+
+@receiver(request_finished)
+def _flush_usage(sender, **kwargs):
+    usage_meter.flush_if_due()
+
+
+def record_usage(subscription, metric, delta=1):
+    """Buffer a usage change (negative to release) for ``subscription``."""
+    usage_meter.increment(getattr(subscription, 'pk', subscription), metric, delta)
+
+
+def current_usage(subscription):
+    """
+    Current usage of every metric for ``subscription``: the folded
+    ``current_*`` fields plus unfolded shards and unflushed local deltas,
+    read with one aggregate query over the subscription's shard rows.
+    """
+    shard_totals = dict(
+        UsageCounter.objects
+        .filter(subscription=subscription)
+        .values('metric')
+        .annotate(total=Sum('value'))
+        .values_list('metric', 'total')
+    )
+    return {
+        metric: getattr(subscription, field) + (shard_totals.get(metric) or 0)
+        + usage_meter.pending_delta(subscription.pk, metric)
+        for metric, field in METRIC_FIELDS.items()
+    }
+
+
+def within_limit(subscription, metric, delta=1):
+    """True if adding ``delta`` usage keeps ``subscription`` within its tier limit."""
+    limit = getattr(subscription, METRIC_LIMITS[metric])
+    return current_usage(subscription)[metric] + delta <= limit
+
+
+def _fold(counters):
+    # ``counters`` rows must be locked by the caller's transaction
+    totals = defaultdict(int)
+    ids = []
+    for pk, subscription_id, metric, value in counters.values_list(
+            'pk', 'subscription_id', 'metric', 'value'):
+        totals[(subscription_id, metric)] += value
+        ids.append(pk)
+    for (subscription_id, metric), total in totals.items():
+        field = METRIC_FIELDS[metric]
+        Subscription.objects.filter(pk=subscription_id).update(
+            **{field: F(field) + total})
+    UsageCounter.objects.filter(pk__in=ids).update(value=0)
+    return len(totals)
+
+
+def fold_counters(subscription_ids=None):
+    """
+    Move shard totals into the subscriptions' ``current_*`` fields so reads
+    stay cheap. Returns the number of subscription metrics folded.
+    """
+    counters = UsageCounter.objects.exclude(value=0)
+    if subscription_ids is not None:
+        counters = counters.filter(subscription_id__in=subscription_ids)
+    with transaction.atomic():
+        return _fold(counters.select_for_update())
+
+
+def reconcile_usage(subscription_ids=None, batch_size=500):
+    """
+    Flush local deltas, fold all shards and then overwrite each metric that
+    has a registered source with its true total. Returns the number of
+    subscription metrics that were corrected.
+
+    Deltas still buffered by other processes at that moment are counted
+    again when they flush; the next reconcile corrects them.
+    """
+    usage_meter.flush()
+    subscriptions = Subscription.objects.order_by('pk')
+    if subscription_ids is not None:
+        subscriptions = subscriptions.filter(pk__in=subscription_ids)
+    ids = list(subscriptions.values_list('pk', flat=True))
+    corrected = 0
+
+    for start in range(0, len(ids), batch_size):
+        batch = ids[start:start + batch_size]
+        with transaction.atomic():
+            # Lock the shards and subscriptions so increments wait briefly
+            # rather than land between the fold and the overwrite
+            _fold(UsageCounter.objects.filter(
+                subscription_id__in=batch).select_for_update())
+            locked = Subscription.objects.select_for_update().filter(pk__in=batch)
+            stored = {row['pk']: row for row in locked.values('pk', *METRIC_FIELDS.values())}
+            for metric, source in _sources.items():
+                field = METRIC_FIELDS[metric]
+                totals = source(batch)
+                for subscription_id in batch:
+                    actual = totals.get(subscription_id, 0)
+                    if stored[subscription_id][field] != actual:
+                        Subscription.objects.filter(pk=subscription_id).update(
+                            **{field: actual})
+                        corrected += 1
+    return corrected
+
+
+@register_usage_source(UsageMetric.USERS)
+def user_totals(subscription_ids):
+    """The owner plus the members of each subscription's organisation."""
+    members = Count('organisation__members', filter=~Q(
+        organisation__members__user=F('organisation__owner')))
+    return {
+        subscription_id: total + 1
+        for subscription_id, total in
+        Subscription.objects.filter(pk__in=subscription_ids)
+        .annotate(total=members).values_list('pk', 'total')
+    }
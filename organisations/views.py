@@ -1,3 +1,16 @@
-from django.shortcuts import render
+# organisations/views.py
+from rest_framework import status, views
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from .tiers import tier_policies
 
-# Create your views here.
+
+class TierPolicyView(views.APIView):
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        """Features and limits of every subscription tier."""
+        return Response(
+            {tier: policy.as_dict() for tier, policy in tier_policies.all().items()},
+            status=status.HTTP_200_OK
+        )
@@ -0,0 +1,130 @@
+# tests/benchmarks/test_auth_endpoints.py
+"""
+Load benchmarks for the public auth endpoints.
+
+Each endpoint is driven in-process by ``BENCHMARK_CONCURRENCY`` threads
+(default 8) for ``BENCHMARK_REQUESTS`` requests (default 200) against a
+database seeded with ``BENCHMARK_SEED_USERS`` users (default 1000). Every
+request comes from its own client IP, so the rate limiter is exercised
+without throttling the run. The first ``WARMUP`` requests are untimed.
+Results are compared with the baselines in ``tests/benchmarks/baselines/``
+(see ``compare_with_baseline``).
+
+SQLite serialises writers, so run ``register`` with
+``BENCHMARK_CONCURRENCY=1`` when benchmarking against it.
+"""
+import os
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.urls import reverse
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+from authentications.email_filter import registered_emails
+from authentications.utils import make_verification_token
+from tests.benchmarks.utils import compare_with_baseline, report, run_load
+
+User = get_user_model()
+
+CONCURRENCY = int(os.getenv('BENCHMARK_CONCURRENCY', '8'))
+REQUESTS = int(os.getenv('BENCHMARK_REQUESTS', '200'))
+SEED_USERS = int(os.getenv('BENCHMARK_SEED_USERS', '1000'))
+WARMUP = 20
+BASELINE = 'auth_endpoints'
+
+
+def client_ip(n):
+    return f'10.{n >> 16 & 255}.{n >> 8 & 255}.{n & 255}'
+
+
+def post_json(client, url, data, n):
+    return client.post(url, data, content_type='application/json',
+                       REMOTE_ADDR=client_ip(n))
+
+
+@pytest.fixture
+def seeded_users(settings):
+    """Seed verified users plus enough unverified ones to verify."""
+    settings.EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+    password = make_password('StrongPass123!')
+    User.objects.bulk_create(
+        [User(email=f'seed{n}@example.com', password=password,
+              email_verified=True) for n in range(SEED_USERS)]
+        + [User(email=f'pending{n}@example.com', password=password,
+                is_active=False) for n in range(WARMUP + REQUESTS)],
+        batch_size=1000,
+    )
+    registered_emails.reset()
+    return list(User.objects.filter(is_active=False).order_by('pk'))
+
+
+def record(endpoint, summary, expected_statuses):
+    key = f'{endpoint}@c{summary["concurrency"]}'
+    report(f"{endpoint} ({summary['requests']} requests, "
+           f"concurrency {summary['concurrency']})", [
+        ("throughput (req/s)", summary['throughput_rps']),
+        ("p50 / p95 / p99 (ms)",
+         f"{summary['p50_ms']} / {summary['p95_ms']} / {summary['p99_ms']}"),
+        ("queries per request (mean / max)",
+         f"{summary['queries_mean']} / {summary['queries_max']}"),
+        ("status codes", summary['statuses']),
+    ])
+    assert set(summary['statuses']) <= expected_statuses, summary['statuses']
+    regressions = compare_with_baseline(BASELINE, key, summary)
+    assert not regressions, "\n".join(regressions)
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db(transaction=True)
+class TestAuthEndpointLoad:
+    """Latency, throughput and query counts per auth endpoint."""
+
+    def test_register(self, seeded_users):
+        url = reverse('authentications:register')
+
+        summary = run_load(lambda client, n: post_json(client, url, {
+            'email': f'new{n}@example.com',
+            'password': 'StrongPass123!',
+            'password_confirm': 'StrongPass123!',
+            'first_name': 'Load',
+            'last_name': 'Test',
+        }, n), REQUESTS, CONCURRENCY, warmup=WARMUP)
+
+        record('register', summary, {'201'})
+
+    def test_verify_email(self, seeded_users):
+        urls = [
+            reverse('authentications:verify-email', kwargs={
+                'uidb64': urlsafe_base64_encode(force_bytes(user.pk)),
+                'token': make_verification_token(user),
+            })
+            for user in seeded_users
+        ]
+
+        summary = run_load(
+            lambda client, n: client.get(urls[n], REMOTE_ADDR=client_ip(n)),
+            REQUESTS, CONCURRENCY, warmup=WARMUP)
+
+        record('verify-email', summary, {'200'})
+
+    def test_check_email(self, seeded_users):
+        url = reverse('authentications:check-email')
+
+        # Half the checks hit registered addresses, half free ones
+        summary = run_load(lambda client, n: post_json(client, url, {
+            'email': f'seed{n}@example.com' if n % 2 else f'free{n}@example.com',
+        }, n), REQUESTS, CONCURRENCY, warmup=WARMUP)
+
+        record('check-email', summary, {'200', '400'})
+
+    def test_check_password(self, seeded_users):
+        url = reverse('authentications:check-password')
+        passwords = ['StrongPass123!', 'weak', 'NoDigits!!', 'aaaaBBBB1111!!']
+
+        summary = run_load(lambda client, n: post_json(client, url, {
+            'password': passwords[n % len(passwords)],
+        }, n), REQUESTS, CONCURRENCY, warmup=WARMUP)
+
+        record('check-password', summary, {'200', '400'})
+        assert summary['queries_max'] == 0
@@ -0,0 +1,49 @@
+# tests/benchmarks/test_email_rendering.py
+import pytest
+from django.core.mail import EmailMultiAlternatives
+from django.template.loader import render_to_string
+from django.utils.html import strip_tags
+from authentications.utils import VERIFICATION_TEMPLATE, build_verification_email
+from tests.benchmarks.utils import report, throughput
+
+ITERATIONS = 500
+
+
+def legacy_build_verification_email(email, first_name, verification_url):
+    """The original per-message path: full render plus strip_tags."""
+    context = {
+        'first_name': first_name,
+        'verification_url': verification_url,
+        'email_address': email,
+        'plain_email_address': 'This message was sent to ' + email.replace('@', ' @ '),
+    }
+    html_message = render_to_string(VERIFICATION_TEMPLATE, context)
+    message = EmailMultiAlternatives(
+        subject="Please verify your email address",
+        body=strip_tags(html_message),
+        to=[email],
+    )
+    message.attach_alternative(html_message, "text/html")
+    return message
+
+
+@pytest.mark.benchmark
+@pytest.mark.email
+class TestEmailRenderingBenchmark:
+    """Throughput of the compiled verification email against the legacy path."""
+
+    def test_compiled_rendering_throughput(self):
+        args = ('david@example.com', 'David',
+                'http://test.com/verify-email/MQ/abc-123')
+
+        legacy = throughput(
+            lambda: legacy_build_verification_email(*args), ITERATIONS)
+        compiled = throughput(
+            lambda: build_verification_email(*args), ITERATIONS)
+
+        report("Verification email build (messages/sec)", [
+            ("render_to_string + strip_tags", f"{legacy:,.0f}"),
+            ("compiled template", f"{compiled:,.0f}"),
+            ("speed-up", f"{compiled / legacy:.1f}x"),
+        ])
+        assert compiled > legacy
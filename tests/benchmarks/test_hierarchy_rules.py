@@ -0,0 +1,47 @@
+# tests/benchmarks/test_hierarchy_rules.py
+import pytest
+from items.hierarchy import FLAG_BITS, METHODOLOGY_FLAGS, RULES, HierarchyMatrix
+from items.models import NodeType
+from organisations.models import ProjectFramework, SubscriptionTier
+from tests.benchmarks.utils import report, throughput
+
+ITERATIONS = 200000
+
+# A Business organisation with every flag on
+FLAGS = sum(FLAG_BITS.values())
+PLACEMENT = (ProjectFramework.WATERFALL, SubscriptionTier.BUSINESS,
+             NodeType.MAINTENANCE_PHASE, NodeType.ENHANCEMENT)
+
+
+def naive_allows(methodology, tier, parent, child, flags):
+    """Scan the rule table for every check, as validation would without compiling."""
+    for rule in RULES:
+        if (methodology in rule.methodologies and tier in rule.tiers
+                and parent in rule.parents and child in rule.children):
+            needed = rule.flags + ((METHODOLOGY_FLAGS[methodology],)
+                                   if methodology in METHODOLOGY_FLAGS else ())
+            if all(flags & FLAG_BITS[flag] for flag in needed):
+                return True
+    return False
+
+
+@pytest.mark.benchmark
+class TestHierarchyRulesBenchmark:
+    """Placement checks per second, compiled matrix against scanning the rules."""
+
+    def test_matrix_checks_throughput(self):
+        matrix = HierarchyMatrix(RULES)
+
+        naive = throughput(lambda: naive_allows(*PLACEMENT, FLAGS), ITERATIONS // 10)
+        compiled = throughput(lambda: matrix.allows(*PLACEMENT, FLAGS), ITERATIONS)
+        compiles = throughput(lambda: HierarchyMatrix(RULES), 100)
+
+        report("Item placement checks (checks/sec)", [
+            ("scan rule table", f"{naive:,.0f}"),
+            ("compiled matrix", f"{compiled:,.0f}"),
+            ("speed-up", f"{compiled / naive:.1f}x"),
+            ("compiles/sec", f"{compiles:,.0f}"),
+            ("matrix size", f"{len(matrix.cells):,} cells"),
+        ])
+        assert naive_allows(*PLACEMENT, FLAGS) is matrix.allows(*PLACEMENT, FLAGS) is True
+        assert compiled > naive
@@ -0,0 +1,111 @@
+# tests/benchmarks/test_item_closure.py
+"""
+Ancestry reads and writes on a large project.
+
+Builds one project ``BENCHMARK_ITEM_DEPTH`` levels deep (default 8) with
+``BENCHMARK_ITEM_BRANCHING`` children per item (default 5, 97,656 items),
+rebuilds its closure table, then times ancestor and descendant reads
+through the closure table, the path and a parent walk, and the
+incremental maintenance of inserts, moves and soft deletes.
+"""
+import os
+import time
+
+import pytest
+from items.closure import rebuild_closure
+from items.models import Item, ItemClosure, NodeType
+from organisations.models import ProjectFramework
+from tests.benchmarks.utils import report, throughput
+from tests.factories import OrganisationFactoryTier
+
+DEPTH = int(os.getenv('BENCHMARK_ITEM_DEPTH', '8'))
+BRANCHING = int(os.getenv('BENCHMARK_ITEM_BRANCHING', '5'))
+
+# Scrum types by depth; anything deeper is a task
+LEVEL_TYPES = (NodeType.OBJECTIVE, NodeType.PLATFORM, NodeType.PROJECT, NodeType.FEATURE,
+               NodeType.EPIC, NodeType.USER_STORY)
+
+
+def level_type(depth):
+    return LEVEL_TYPES[depth] if depth < len(LEVEL_TYPES) else NodeType.TASK
+
+
+@pytest.fixture
+def project():
+    organisation = OrganisationFactoryTier.business()
+    level = [Item.objects.create(organisation=organisation, node_type=level_type(0),
+                                 framework=ProjectFramework.SCRUM, title='Objective')]
+    for depth in range(1, DEPTH):
+        level = Item.objects.bulk_create(
+            [Item(organisation=organisation, parent=parent, node_type=level_type(depth),
+                  framework=ProjectFramework.SCRUM, title=f'Item {depth}.{n}',
+                  path=parent.subtree_path, depth=depth)
+             for parent in level for n in range(BRANCHING)],
+            batch_size=1000,
+        )
+    return organisation
+
+
+def walk_ancestors(item):
+    """The parent-pointer alternative: one query per level."""
+    ancestors = []
+    while item.parent_id:
+        item = Item.objects.only('parent_id').get(pk=item.parent_id)
+        ancestors.append(item)
+    return ancestors
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+class TestItemClosureBenchmark:
+    """Closure rebuild, ancestry reads and incremental maintenance."""
+
+    def test_closure_at_scale(self, project):
+        items = Item.objects.filter(organisation=project).count()
+
+        start = time.perf_counter()
+        written = rebuild_closure(organisation=project)
+        rebuild = time.perf_counter() - start
+
+        leaf = Item.objects.filter(organisation=project, depth=DEPTH - 1).last()
+        branch = Item.objects.filter(organisation=project, depth=2).first()
+        leaves = list(Item.objects.filter(organisation=project, depth=DEPTH - 1)[:50])
+
+        closure_up = throughput(lambda: list(Item.objects.ancestors_of(leaf)), 200)
+        path_up = throughput(lambda: list(Item.objects.ancestors(leaf)), 200)
+        walk_up = throughput(lambda: walk_ancestors(leaf), 50)
+        closure_down = throughput(lambda: Item.objects.descendants_of(branch).count(), 50)
+        path_down = throughput(lambda: Item.objects.descendants(branch).count(), 50)
+        set_up = throughput(lambda: list(Item.objects.ancestors_of(leaves)), 50)
+
+        story = Item.objects.filter(organisation=project, node_type=NodeType.USER_STORY).first()
+        start = time.perf_counter()
+        for n in range(200):
+            Item.objects.create(organisation=project, parent=story,
+                                node_type=NodeType.TASK, title=f'New {n}')
+        insert = (time.perf_counter() - start) / 200
+
+        mover = Item.objects.filter(organisation=project, depth=3).first()
+        target = Item.objects.filter(organisation=project, depth=2).last()
+        start = time.perf_counter()
+        moved = mover.move_to(target)
+        move = time.perf_counter() - start
+
+        start = time.perf_counter()
+        deleted = Item.objects.get(pk=mover.pk).soft_delete()
+        soft_delete = time.perf_counter() - start
+
+        report(f"Item closure ({items:,} items, depth {DEPTH})", [
+            ("rebuild", f"{rebuild:.2f}s for {written:,} rows"),
+            ("ancestors/sec (closure)", f"{closure_up:,.0f}"),
+            ("ancestors/sec (path)", f"{path_up:,.0f}"),
+            ("ancestors/sec (parent walk)", f"{walk_up:,.0f}"),
+            ("ancestors of 50 leaves/sec", f"{set_up:,.0f}"),
+            ("descendant counts/sec (closure)", f"{closure_down:,.0f}"),
+            ("descendant counts/sec (path)", f"{path_down:,.0f}"),
+            ("insert with closure", f"{insert * 1000:.2f}ms"),
+            (f"move of {moved:,} items", f"{move * 1000:.1f}ms"),
+            (f"soft delete of {deleted:,} items", f"{soft_delete * 1000:.1f}ms"),
+        ])
+        assert written == sum(BRANCHING ** depth * (depth + 1) for depth in range(DEPTH))
+        assert ItemClosure.objects.filter(descendant=leaf).count() == DEPTH
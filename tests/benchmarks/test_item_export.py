@@ -0,0 +1,91 @@
+# tests/benchmarks/test_item_export.py
+"""
+Streaming item export at scale.
+
+Seeds ``BENCHMARK_EXPORT_ROWS`` items (default 1,000,000) in one
+organisation and downloads them through the NDJSON and CSV export
+endpoints, decompressing as the body streams in. Reports rows per second
+and the compressed size, then streams the NDJSON export again under
+``tracemalloc`` and fails if the peak passes
+``BENCHMARK_EXPORT_MEMORY_MIB`` (default 32). For contrast, the peak of
+building a tenth of the rows into one JSON response body, as a plain
+list endpoint would, is reported alongside.
+"""
+import json
+import os
+import time
+import tracemalloc
+import zlib
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+from items.exports import COLUMNS
+from items.models import Item, NodeType
+from tests.benchmarks.utils import report
+from tests.factories import OrganisationFactoryTier
+
+ROWS = int(os.getenv('BENCHMARK_EXPORT_ROWS', '1000000'))
+MEMORY_CEILING = float(os.getenv('BENCHMARK_EXPORT_MEMORY_MIB', '32')) * 2 ** 20
+
+
+@pytest.fixture
+def organisation():
+    organisation = OrganisationFactoryTier.business()
+    description = 'Exported as part of the benchmark backlog. ' * 4
+    for start in range(0, ROWS, 10000):
+        Item.objects.bulk_create(
+            Item(organisation=organisation, node_type=NodeType.PROJECT,
+                 title=f'Project {n}', description=description, external_id=f'P{n}')
+            for n in range(start, min(start + 10000, ROWS)))
+    return organisation
+
+
+def download(client, name):
+    """Stream an export, returning (rows, compressed bytes)."""
+    response = client.get(reverse(name), HTTP_ACCEPT_ENCODING='gzip')
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    lines = size = 0
+    for piece in response.streaming_content:
+        size += len(piece)
+        lines += decompressor.decompress(piece).count(b'\n')
+    response.close()
+    return lines, size
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+class TestItemExportBenchmark:
+    """Export throughput and the memory ceiling of a streamed download."""
+
+    def test_export_at_scale(self, organisation):
+        client = APIClient()
+        client.force_authenticate(user=organisation.owner)
+
+        rows = []
+        for name, label, header in (('items:export-ndjson', 'NDJSON', 0),
+                                    ('items:export-csv', 'CSV', 1)):
+            start = time.perf_counter()
+            lines, size = download(client, name)
+            elapsed = time.perf_counter() - start
+            assert lines == ROWS + header
+            rows.append((f"{label} rows/sec", f"{ROWS / elapsed:,.0f}"))
+            rows.append((f"{label} gzipped size", f"{size / 2 ** 20:.1f} MiB"))
+
+        tracemalloc.start()
+        try:
+            download(client, 'items:export-ndjson')
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.reset_peak()
+            items = Item.objects.filter(organisation=organisation)[:ROWS // 10]
+            body = json.dumps(list(items.values(*COLUMNS)), default=str)
+            naive_peak = tracemalloc.get_traced_memory()[1]
+            del body
+        finally:
+            tracemalloc.stop()
+        rows.append(("peak memory, streamed", f"{peak / 2 ** 20:.1f} MiB"))
+        rows.append((f"peak memory, {ROWS // 10:,} rows in one body",
+                     f"{naive_peak / 2 ** 20:.1f} MiB"))
+
+        report(f"Item export ({ROWS:,} rows)", rows)
+        assert peak < MEMORY_CEILING
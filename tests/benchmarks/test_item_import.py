@@ -0,0 +1,113 @@
+# tests/benchmarks/test_item_import.py
+"""
+Bulk item import throughput and memory.
+
+Writes an NDJSON file of ``BENCHMARK_IMPORT_ROWS`` items (default 50,000)
+shaped as Kanban projects of features, epics and tasks, and imports it at
+several batch sizes, reporting rows per second, with row-by-row
+``Item.objects.create`` timed on a sample for comparison. The file and one
+a fifth of its size are then imported again under ``tracemalloc`` to show
+peak memory follows the batch size, not the file size.
+"""
+import json
+import os
+import time
+import tracemalloc
+
+import pytest
+from items.imports import import_items, read_rows
+from items.models import ImportFormat, ImportJob, Item, ItemClosure, NodeType
+from tests.benchmarks.utils import report
+from tests.factories import OrganisationFactoryTier
+
+ROWS = int(os.getenv('BENCHMARK_IMPORT_ROWS', '50000'))
+BATCH_SIZES = (100, 1000, 5000)
+SAMPLE = 500
+
+
+def backlog_rows():
+    """Projects of 5 features of 5 epics of 10 tasks, parents first."""
+    n = 0
+    while True:
+        project = f'J{n}'
+        yield {'ref': project, 'node_type': 'PRJ', 'title': f'Project {n}'}
+        for f in range(5):
+            feature = f'{project}.F{f}'
+            yield {'ref': feature, 'parent_ref': project, 'node_type': 'FEA',
+                   'title': f'Feature {f}'}
+            for e in range(5):
+                epic = f'{feature}.E{e}'
+                yield {'ref': epic, 'parent_ref': feature, 'node_type': 'EPC',
+                       'title': f'Epic {e}'}
+                for t in range(10):
+                    yield {'ref': f'{epic}.T{t}', 'parent_ref': epic, 'node_type': 'TSK',
+                           'title': f'Task {t}', 'description': 'Imported ' * 10}
+        n += 1
+
+
+def write_file(path, total):
+    with open(path, 'w') as handle:
+        for _n, row in zip(range(total), backlog_rows()):
+            handle.write(json.dumps(row) + '\n')
+    return path
+
+
+def run_import(path, batch_size):
+    job = ImportJob.objects.create(organisation=OrganisationFactoryTier.business(),
+                                   format=ImportFormat.NDJSON)
+    with open(path, 'rb') as handle:
+        return import_items(job, read_rows(handle, ImportFormat.NDJSON), batch_size)
+
+
+def peak_memory(path, batch_size):
+    """Peak memory traced while importing ``path``."""
+    tracemalloc.start()
+    try:
+        job = run_import(path, batch_size)
+        return job, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+class TestItemImportBenchmark:
+    """Batched import against row-by-row creation."""
+
+    def test_import_at_scale(self, tmp_path):
+        path = write_file(tmp_path / 'backlog.ndjson', ROWS)
+        small = write_file(tmp_path / 'small.ndjson', ROWS // 5)
+
+        organisation = OrganisationFactoryTier.business()
+        project = Item.objects.create(organisation=organisation, node_type=NodeType.PROJECT,
+                                      title='Project')
+        feature = Item.objects.create(organisation=organisation, parent=project,
+                                      node_type=NodeType.FEATURE, title='Feature')
+        epic = Item.objects.create(organisation=organisation, parent=feature,
+                                   node_type=NodeType.EPIC, title='Epic')
+        start = time.perf_counter()
+        for n in range(SAMPLE):
+            Item.objects.create(organisation=organisation, parent=epic,
+                                node_type=NodeType.TASK, title=f'Task {n}')
+        row_by_row = SAMPLE / (time.perf_counter() - start)
+
+        rows = [("rows/sec (Item.objects.create)", f"{row_by_row:,.0f}")]
+        for batch_size in BATCH_SIZES:
+            start = time.perf_counter()
+            job = run_import(path, batch_size)
+            elapsed = time.perf_counter() - start
+            assert job.items_created == ROWS
+            rows.append((f"rows/sec (batch {batch_size})", f"{ROWS / elapsed:,.0f}"))
+
+        job, peak = peak_memory(path, 1000)
+        small_job, small_peak = peak_memory(small, 1000)
+        rows.append((f"peak memory, {ROWS:,} rows", f"{peak / 2 ** 20:.1f} MiB"))
+        rows.append((f"peak memory, {ROWS // 5:,} rows", f"{small_peak / 2 ** 20:.1f} MiB"))
+
+        report(f"Item import ({ROWS:,} rows)", rows)
+        assert small_job.items_created == ROWS // 5
+        assert peak < small_peak * 1.5
+        organisation = job.organisation
+        assert ItemClosure.objects.filter(descendant__organisation=organisation).count() \
+            == sum(depth + 1 for depth in Item.objects.filter(
+                organisation=organisation).values_list('depth', flat=True))
@@ -0,0 +1,74 @@
+# tests/benchmarks/test_metering.py
+"""
+Bulk ingestion into the packed usage history.
+
+Ingests ``BENCHMARK_METERING_DAYS`` days (default 7) of hourly samples for
+every metric of ``BENCHMARK_METERING_ORGS`` organisations (default 200),
+then times range summaries over the result.
+"""
+from datetime import datetime, timedelta, timezone as dt_timezone
+import os
+import time
+
+import pytest
+from django.contrib.auth import get_user_model
+from organisations import metering
+from organisations.models import Organisation, UsageMetric, UsageSeries
+from tests.benchmarks.utils import report, throughput
+
+User = get_user_model()
+
+ORGS = int(os.getenv('BENCHMARK_METERING_ORGS', '200'))
+DAYS = int(os.getenv('BENCHMARK_METERING_DAYS', '7'))
+START = datetime(2026, 1, 1, tzinfo=dt_timezone.utc)
+
+
+@pytest.fixture
+def organisations():
+    owners = User.objects.bulk_create(
+        [User(email=f'meter{n}@example.com') for n in range(ORGS)], batch_size=1000)
+    Organisation.objects.bulk_create(
+        [Organisation(name=f'Metered {n}', owner=owner, owner_email=owner.email,
+                      role_hierarchy={'user': ['read']})
+         for n, owner in enumerate(owners)],
+        batch_size=1000,
+    )
+    return list(Organisation.objects.values_list('pk', flat=True))
+
+
+def samples(organisation_ids):
+    for hour in range(DAYS * 24):
+        moment = START + timedelta(hours=hour)
+        for organisation_id in organisation_ids:
+            for metric in UsageMetric.values:
+                yield organisation_id, metric, moment, hour % 97
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+class TestMeteringBenchmark:
+    """Samples ingested per second and the cost of range reads."""
+
+    def test_bulk_ingestion_throughput(self, organisations):
+        total = len(organisations) * len(UsageMetric.values) * DAYS * 24
+
+        start = time.perf_counter()
+        stored = metering.record_samples(samples(organisations))
+        elapsed = time.perf_counter() - start
+
+        rows = UsageSeries.objects.count()
+        organisation = Organisation.objects.get(pk=organisations[0])
+        summaries = throughput(
+            lambda: metering.usage_summary(organisation, UsageMetric.ITEMS,
+                                           START, START + timedelta(days=DAYS)),
+            50)
+
+        report(f"Usage history ingestion ({ORGS} organisations, {DAYS} days)", [
+            ("samples/sec", f"{stored / elapsed:,.0f}"),
+            ("rows written", f"{rows:,} for {stored:,} samples"),
+            ("bytes per sample", f"{rows * 24 * 8 / stored:.1f}"),
+            (f"{DAYS}-day summaries/sec", f"{summaries:,.0f}"),
+            ("aggregation", "numpy" if metering.np is not None else "pure Python"),
+        ])
+        assert stored == total
+        assert rows == len(organisations) * len(UsageMetric.values) * DAYS
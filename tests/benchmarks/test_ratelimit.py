@@ -0,0 +1,76 @@
+# tests/benchmarks/test_ratelimit.py
+import multiprocessing
+import time
+
+import pytest
+from django.test import RequestFactory
+from django_ratelimit.core import is_ratelimited
+from backlogger_api.ratelimit import SharedRateLimiter
+from tests.benchmarks.utils import report, throughput
+
+ITERATIONS = 20000
+WORKERS = 8
+HITS_PER_WORKER = 2000
+LIMIT = 5000
+
+
+def contend(path, results):
+    # Each worker spreads hits over many keys plus one hot shared key
+    limiter = SharedRateLimiter(path, slots=65536)
+    allowed = 0
+    start = time.perf_counter()
+    for n in range(HITS_PER_WORKER):
+        limiter.hit(f'ip:{n % 500}', 10**9, 60)
+        allowed += limiter.hit('hot', LIMIT, 3600)[0]
+    results.put((allowed, time.perf_counter() - start))
+
+
+@pytest.mark.benchmark
+class TestRateLimiterBenchmark:
+    """Per-check overhead and cross-process accuracy of the shared limiter."""
+
+    def test_check_overhead(self, tmp_path, settings):
+        settings.CACHES = {'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        limiter = SharedRateLimiter(str(tmp_path / 'counters'), slots=65536)
+        request = RequestFactory().post('/', REMOTE_ADDR='10.0.0.1')
+        counter = iter(range(10**9))
+
+        shared = throughput(
+            lambda: limiter.hit(f'ip:{next(counter) % 1000}', 10**9, 60),
+            ITERATIONS)
+        locmem = throughput(
+            lambda: is_ratelimited(request, group='bench', key='ip',
+                                   rate='1000000/m', increment=True),
+            ITERATIONS)
+
+        report("Rate limit check overhead (microseconds per check)", [
+            ("shared-memory sliding window", f"{1e6 / shared:.2f}"),
+            ("django_ratelimit + LocMem", f"{1e6 / locmem:.2f}"),
+        ])
+        assert 1e6 / shared < 100
+
+    def test_accuracy_under_concurrent_workers(self, tmp_path):
+        path = str(tmp_path / 'counters')
+        context = multiprocessing.get_context('spawn')
+        results = context.Queue()
+        workers = [context.Process(target=contend, args=(path, results))
+                   for _ in range(WORKERS)]
+
+        for worker in workers:
+            worker.start()
+        outcomes = [results.get(timeout=120) for _ in workers]
+        for worker in workers:
+            worker.join()
+        allowed = sum(count for count, _elapsed in outcomes)
+        elapsed = max(elapsed for _count, elapsed in outcomes)
+
+        attempts = WORKERS * HITS_PER_WORKER
+        report("Shared limit under concurrent workers", [
+            ("workers", WORKERS),
+            ("attempts on hot key", attempts),
+            ("limit", LIMIT),
+            ("allowed", allowed),
+            ("checks/sec (all workers)", f"{attempts * 2 / elapsed:,.0f}"),
+        ])
+        assert allowed == LIMIT
@@ -0,0 +1,54 @@
+# tests/benchmarks/test_rbac.py
+import pytest
+from organisations.rbac import CompiledHierarchy
+from tests.benchmarks.utils import report, throughput
+
+ITERATIONS = 200000
+
+HIERARCHY = {
+    'owner_delegate': ['admin', 'billing', 'delete'],
+    'admin': ['manager', 'invite', 'configure'],
+    'manager': ['user', 'write', 'assign'],
+    'user': ['viewer', 'comment'],
+    'viewer': ['read'],
+}
+
+
+def naive_allows(hierarchy, role, permissions):
+    """Walk the JSON for every check, as views would without compiling."""
+    granted, pending, seen = set(), [role], set()
+    while pending:
+        current = pending.pop()
+        if current in seen or current not in hierarchy:
+            continue
+        seen.add(current)
+        for entry in hierarchy[current]:
+            if entry in hierarchy:
+                pending.append(entry)
+            else:
+                granted.add(entry)
+    return all(permission in granted for permission in permissions)
+
+
+@pytest.mark.benchmark
+class TestRBACBenchmark:
+    """Permission checks per second, compiled bitmasks against walking the JSON."""
+
+    def test_compiled_checks_throughput(self):
+        compiled = CompiledHierarchy(HIERARCHY)
+        required = ('read', 'write', 'assign')
+
+        naive = throughput(
+            lambda: naive_allows(HIERARCHY, 'admin', required), ITERATIONS // 10)
+        bitmask = throughput(
+            lambda: compiled.allows('admin', required), ITERATIONS)
+        compiles = throughput(lambda: CompiledHierarchy(HIERARCHY), ITERATIONS // 100)
+
+        report("Role hierarchy permission checks (checks/sec)", [
+            ("walk role_hierarchy JSON", f"{naive:,.0f}"),
+            ("compiled bitmask", f"{bitmask:,.0f}"),
+            ("speed-up", f"{bitmask / naive:.1f}x"),
+            ("compiles/sec", f"{compiles:,.0f}"),
+        ])
+        assert naive_allows(HIERARCHY, 'admin', required) is compiled.allows('admin', required)
+        assert bitmask > naive
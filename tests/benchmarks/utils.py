@@ -0,0 +1,157 @@
+# tests/benchmarks/utils.py
+"""Shared timing helpers for the benchmark suite."""
+from collections import Counter
+from pathlib import Path
+import itertools
+import json
+import math
+import os
+import threading
+import time
+
+from django.db import connection
+from django.test import Client
+
+BASELINE_DIR = Path(__file__).resolve().parent / 'baselines'
+
+
+def throughput(func, iterations, warmup=10):
+    """Call ``func`` ``iterations`` times and return calls per second."""
+    for _ in range(warmup):
+        func()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    elapsed = time.perf_counter() - start
+    return iterations / elapsed
+
+
+def report(title, rows):
+    """Print a small aligned table of ``(label, value)`` rows."""
+    print(f"\n{title}")
+    width = max(len(label) for label, _value in rows)
+    for label, value in rows:
+        print(f"  {label:<{width}}  {value}")
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(int(math.ceil(fraction * len(sorted_values))) - 1,
+                len(sorted_values) - 1)
+    return sorted_values[max(index, 0)]
+
+
+def run_load(send, total, concurrency, warmup=20):
+    """
+    Call ``send(client, n)`` for ``total`` values of ``n`` from
+    ``concurrency`` threads, each with its own test client and database
+    connection. The first ``warmup`` values are sent untimed beforehand, so
+    timed requests use ``n`` from ``warmup`` to ``warmup + total - 1``. Returns a summary of latency, throughput, SQL query counts
+    and response status codes; the first exception raised by ``send`` is
+    re-raised once all threads have stopped.
+    """
+    warmup_client = Client()
+    for n in range(warmup):
+        send(warmup_client, n)
+
+    counter = itertools.count(warmup)
+    lock = threading.Lock()
+    latencies = []
+    queries = []
+    statuses = Counter()
+    errors = []
+
+    def worker():
+        client = Client()
+        query_count = [0]
+
+        def count_queries(execute, sql, params, many, context):
+            query_count[0] += 1
+            return execute(sql, params, many, context)
+
+        try:
+            with connection.execute_wrapper(count_queries):
+                while (n := next(counter)) < warmup + total:
+                    query_count[0] = 0
+                    start = time.perf_counter()
+                    response = send(client, n)
+                    elapsed = time.perf_counter() - start
+                    with lock:
+                        latencies.append(elapsed)
+                        queries.append(query_count[0])
+                        statuses[response.status_code] += 1
+        except Exception as e:
+            errors.append(e)
+        finally:
+            connection.close()
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    if errors:
+        raise errors[0]
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'concurrency': concurrency,
+        'throughput_rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+        'queries_mean': round(sum(queries) / len(queries), 2) if queries else 0,
+        'queries_max': max(queries, default=0),
+        'statuses': {str(code): count for code, count in sorted(statuses.items())},
+    }
+
+
+def baseline_path(name):
+    directory = os.getenv('BENCHMARK_BASELINE_DIR') or BASELINE_DIR
+    return Path(directory) / f'{name}.json'
+
+
+def compare_with_baseline(name, key, summary):
+    """
+    Compare ``summary`` with the stored baseline for ``key`` and return a
+    list of regressions. Latency and throughput may worsen by
+    ``BENCHMARK_TOLERANCE`` (a factor, default 1.5), and latency by a
+    further ``BENCHMARK_NOISE_MS`` (default 2), before it counts; query
+    counts may not grow at all.
+
+    The baseline is written when it is missing or when
+    ``BENCHMARK_UPDATE_BASELINE`` is set, so runs compare against the last
+    accepted result on the same machine.
+    """
+    path = baseline_path(name)
+    baselines = json.loads(path.read_text()) if path.exists() else {}
+    baseline = baselines.get(key)
+    regressions = []
+
+    if baseline and not os.getenv('BENCHMARK_UPDATE_BASELINE'):
+        tolerance = float(os.getenv('BENCHMARK_TOLERANCE', '1.5'))
+        noise = float(os.getenv('BENCHMARK_NOISE_MS', '2'))
+        for metric in ('p50_ms', 'p95_ms', 'p99_ms'):
+            if summary[metric] > baseline[metric] * tolerance + noise:
+                regressions.append(
+                    f"{key} {metric}: {summary[metric]} > "
+                    f"{baseline[metric]} x {tolerance} + {noise}")
+        if summary['throughput_rps'] * tolerance < baseline['throughput_rps']:
+            regressions.append(
+                f"{key} throughput_rps: {summary['throughput_rps']} < "
+                f"{baseline['throughput_rps']} / {tolerance}")
+        for metric in ('queries_mean', 'queries_max'):
+            if summary[metric] > baseline[metric]:
+                regressions.append(
+                    f"{key} {metric}: {summary[metric]} > {baseline[metric]}")
+        return regressions
+
+    baselines[key] = summary
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(baselines, indent=2, sort_keys=True) + '\n')
+    return regressions
@@ -6,6 +6,8 @@ import sys
 
 pytest_plugins = [
     "tests.fixtures.authentications",
+    "tests.fixtures.items",
+    "tests.fixtures.organisations",
     "tests.fixtures.test_data"
 ]
 
@@ -1,14 +1,18 @@
 # tests/factories/__init__.py
 from .authentication import UserFactory
 from .organisation import (
+    AuditEventFactory,
     OrganisationFactory,
     SubscriptionFactory,
     OrganisationFactoryTier
 )
+from .item import ItemFactory
 
 __all__ = [
+    'AuditEventFactory',
     'UserFactory',
     'OrganisationFactory',
     'SubscriptionFactory',
-    'OrganisationFactoryTier'
+    'OrganisationFactoryTier',
+    'ItemFactory'
 ]
@@ -0,0 +1,23 @@
+# tests/factories/item.py
+"""Test factories for Item models."""
+import factory
+from factory.django import DjangoModelFactory
+from items.models import Item, NodeType
+from tests.factories.organisation import OrganisationFactory
+
+
+class ItemFactory(DjangoModelFactory):
+    """
+    Factory for generating test items. Roots default to projects and
+    children to tasks, and share their parent's organisation.
+    """
+
+    class Meta:
+        model = Item
+
+    parent = None
+    organisation = factory.LazyAttribute(
+        lambda o: o.parent.organisation if o.parent else OrganisationFactory())
+    node_type = factory.LazyAttribute(
+        lambda o: NodeType.TASK if o.parent else NodeType.PROJECT)
+    title = factory.Sequence(lambda n: f'Test Item {n}')
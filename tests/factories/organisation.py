@@ -4,6 +4,7 @@ import factory
 from factory.django import DjangoModelFactory
 from django.utils import timezone
 from organisations.models import (
+    AuditEvent,
     Organisation,
     Subscription,
     OrganisationStatus,
@@ -20,6 +21,7 @@ class OrganisationFactory(DjangoModelFactory):
 
     class Meta:
         model = Organisation
+        skip_postgeneration_save = True
 
     # Core Fields
     name = factory.Sequence(lambda n: f'Test Organisation {n}')
@@ -40,12 +42,10 @@ class OrganisationFactory(DjangoModelFactory):
         'audit_logs_days': 30,
         'user_data_years': 7
     })
-    audit_logs = factory.List([{
-        'timestamp': timezone.now().isoformat(),
-        'action': 'created',
-        'actor': 'system',
-        'details': 'Organisation created'
-    }])
+    audit_event = factory.RelatedFactory(
+        'tests.factories.organisation.AuditEventFactory',
+        factory_related_name='organisation',
+    )
 
     # Project Configuration
     default_framework = 'KAN'
@@ -61,6 +61,20 @@ class OrganisationFactory(DjangoModelFactory):
     # Compliance
     gdpr_compliance = False
 
+
+class AuditEventFactory(DjangoModelFactory):
+    """Factory for organisation audit events."""
+
+    class Meta:
+        model = AuditEvent
+
+    organisation = factory.SubFactory(OrganisationFactory, audit_event=None)
+    occurred_at = factory.LazyFunction(timezone.now)
+    action = 'created'
+    actor = 'system'
+    details = 'Organisation created'
+
+
 # Tier-specific factory traits
 
 
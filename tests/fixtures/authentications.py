@@ -2,6 +2,8 @@
 """Authentications related test fixtures."""
 import pytest
 from django.core import mail
+from authentications.revocation import revoked_tokens
+from backlogger_api.ratelimit import get_limiter
 from rest_framework.test import APIClient
 from django.contrib.auth import get_user_model
 
@@ -27,6 +29,25 @@ def clear_mail_outbox():
     mail.outbox = []
 
 
+@pytest.fixture(scope='session')
+def rate_limit_path(tmp_path_factory):
+    """A private shared-memory file so test runs don't share counters."""
+    return str(tmp_path_factory.mktemp('ratelimit') / 'counters')
+
+
+@pytest.fixture(autouse=True)
+def clear_rate_limits(settings, rate_limit_path):
+    """Reset rate limit counters so tests don't throttle each other."""
+    settings.RATELIMIT_SHM_PATH = rate_limit_path
+    get_limiter().reset()
+
+
+@pytest.fixture(autouse=True)
+def clear_revoked_tokens():
+    """Drop revocations held in memory by earlier tests."""
+    revoked_tokens.reset()
+
+
 @pytest.fixture
 def registered_user(django_user_model, valid_user_data):
     """Create and return a registered user."""
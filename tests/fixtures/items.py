@@ -0,0 +1,20 @@
+# tests/fixtures/items.py
+"""Items related test fixtures."""
+import pytest
+from items.models import NodeType
+from organisations.models import ProjectFramework
+from tests.factories import ItemFactory, OrganisationFactoryTier
+
+
+@pytest.fixture
+def tree():
+    """Scrum Platform > Project > (Feature > Epic > Story, Feature), by name."""
+    platform = ItemFactory(organisation=OrganisationFactoryTier.business(),
+                           node_type=NodeType.PLATFORM, framework=ProjectFramework.SCRUM)
+    project = ItemFactory(parent=platform, node_type=NodeType.PROJECT)
+    feature = ItemFactory(parent=project, node_type=NodeType.FEATURE)
+    epic = ItemFactory(parent=feature, node_type=NodeType.EPIC)
+    story = ItemFactory(parent=epic, node_type=NodeType.USER_STORY)
+    other = ItemFactory(parent=project, node_type=NodeType.FEATURE)
+    return {'platform': platform, 'project': project, 'feature': feature,
+            'epic': epic, 'story': story, 'other': other}
@@ -0,0 +1,24 @@
+# tests/fixtures/organisations.py
+"""Organisations related test fixtures."""
+import pytest
+from organisations.domains import domain_registry
+from organisations.rbac import rbac
+from organisations.tenancy import tenant_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_tenant_cache():
+    """Drop tenant contexts cached in memory by earlier tests."""
+    tenant_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_domain_registry():
+    """Reload the domain map from the test database."""
+    domain_registry.invalidate()
+
+
+@pytest.fixture(autouse=True)
+def clear_rbac_cache():
+    """Drop role hierarchies compiled by earlier tests."""
+    rbac.clear()
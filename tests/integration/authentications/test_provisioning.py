@@ -0,0 +1,152 @@
+# tests/integration/authentications/test_provisioning.py
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from authentications.models import EmailOutbox
+from authentications.provisioning import provision_users
+from organisations.models import OrganisationMember, UsageMetric
+from organisations.usage import current_usage, usage_meter
+from tests.factories import OrganisationFactoryTier, SubscriptionFactory, UserFactory
+
+User = get_user_model()
+
+
+@pytest.mark.integration
+@pytest.mark.auth
+@pytest.mark.django_db
+class TestBulkProvisioning:
+    """Integration tests for bulk user provisioning."""
+
+    def test_creates_users_and_queues_emails(self):
+        """Test that valid rows are inserted and queued for verification."""
+        rows = [
+            {'email': f'user{n}@example.com', 'first_name': f'User{n}',
+             'password': 'StrongPass123!'}
+            for n in range(5)
+        ]
+
+        result = provision_users(rows, batch_size=2, workers=1)
+
+        assert result == {'created': 5, 'errors': []}
+        assert User.objects.filter(is_active=False).count() == 5
+        assert EmailOutbox.objects.count() == 5
+        user = User.objects.get(email='user3@example.com')
+        assert user.check_password('StrongPass123!')
+
+    def test_hashes_in_process_pool(self):
+        """Test that passwords hashed by worker processes verify."""
+        rows = [{'email': f'pool{n}@example.com', 'password': 'StrongPass123!'}
+                for n in range(4)]
+
+        result = provision_users(rows, workers=2, send_verification=False)
+
+        assert result['created'] == 4
+        assert all(user.check_password('StrongPass123!')
+                   for user in User.objects.all())
+
+    def test_reports_row_errors_without_aborting(self):
+        """Test that bad rows are reported and good rows still created."""
+        UserFactory(email='taken@example.com')
+        rows = [
+            {'email': 'ok@example.com'},
+            {'email': 'not-an-email'},
+            {'email': 'Taken@example.com'},
+            {'email': 'weak@example.com', 'password': 'weak'},
+            {'email': 'OK@example.com'},
+        ]
+
+        result = provision_users(rows, workers=1)
+
+        assert result['created'] == 1
+        assert [error['row'] for error in result['errors']] == [1, 2, 3, 4]
+        assert 'password' in result['errors'][2]['errors']
+        assert not User.objects.get(email='ok@example.com').has_usable_password()
+
+    def test_enforces_organisation_domains(self):
+        """Test that only allowed domains are provisioned for an organisation."""
+        organisation = OrganisationFactoryTier.enterprise()
+        rows = [{'email': 'a@example.com'}, {'email': 'b@other.com'}]
+
+        result = provision_users(rows, organisation=organisation, workers=1)
+
+        assert result['created'] == 1
+        assert result['errors'][0]['email'] == 'b@other.com'
+
+    def test_organisation_users_become_members(self, django_capture_on_commit_callbacks):
+        """Test that users provisioned for an organisation join it and take seats."""
+        organisation = OrganisationFactoryTier.enterprise()
+        subscription = SubscriptionFactory(organisation=organisation)
+        rows = [{'email': f'member{n}@example.com'} for n in range(3)]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            result = provision_users(rows, organisation=organisation, workers=1)
+        # Write the seats in this test's transaction, not a later test's
+        usage_meter.flush()
+
+        assert result['created'] == 3
+        assert set(OrganisationMember.objects.values_list('user__email', flat=True)) == {
+            row['email'] for row in rows}
+        assert all(member.organisation == organisation
+                   for member in OrganisationMember.objects.all())
+        assert current_usage(subscription)[UsageMetric.USERS] == 3
+
+    def test_organisation_user_limit(self, settings):
+        """Test that rows beyond the organisation's user limit are rejected."""
+        settings.TIER_POLICY_OVERRIDES = {'ENT': {'max_users': 2}}
+        organisation = OrganisationFactoryTier.enterprise()
+        SubscriptionFactory(organisation=organisation, current_user_count=1)
+        rows = [{'email': f'seat{n}@example.com'} for n in range(3)]
+
+        result = provision_users(rows, organisation=organisation, workers=1)
+
+        assert result['created'] == 1
+        assert [error['row'] for error in result['errors']] == [1, 2]
+        assert OrganisationMember.objects.get().user.email == 'seat0@example.com'
+        assert User.objects.filter(email__startswith='seat').count() == 1
+
+    def test_management_command(self, tmp_path):
+        """Test provisioning from a CSV file."""
+        csv_file = tmp_path / 'users.csv'
+        csv_file.write_text(
+            'email,first_name,last_name,password\n'
+            'csv1@example.com,Ada,Lovelace,StrongPass123!\n'
+            'csv2@example.com,Alan,Turing,\n'
+        )
+
+        call_command('provision_users', str(csv_file), '--workers', '1')
+
+        assert User.objects.filter(email__startswith='csv').count() == 2
+
+    def test_endpoint_requires_admin(self, authenticated_api_client):
+        """Test that non-staff users cannot provision."""
+        response = authenticated_api_client.post(
+            reverse('authentications:provision'),
+            {'users': [{'email': 'x@example.com'}]}, format='json')
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_endpoint(self, api_client):
+        """Test the provisioning endpoint for staff users."""
+        api_client.force_authenticate(UserFactory(is_staff=True))
+
+        # Requests hash on the shared service, never a pool of their own
+        with mock.patch('authentications.provisioning.ProcessPoolExecutor',
+                        side_effect=AssertionError("process pool started")):
+            response = api_client.post(
+                reverse('authentications:provision'),
+                {'users': [{'email': 'api@example.com', 'password': 'StrongPass123!'},
+                           {'email': 'bad'}]},
+                format='json')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data['created'] == 1
+        assert response.data['errors'][0]['row'] == 1
+        assert User.objects.get(email='api@example.com').check_password('StrongPass123!')
+        entry = EmailOutbox.objects.get()
+        assert entry.to_email == 'api@example.com'
+        assert entry.context['verification_url'].startswith(
+            'http://testserver/verify-email/')
@@ -1,10 +1,17 @@
 # tests/integration/authentications/test_registration.py
+from unittest import mock
+
 import pytest
 from django.core import mail
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
+from authentications.hashing import HashingServiceBusy, get_hashing_service
+from authentications.models import EmailOutbox, OutboxStatus
+from authentications.outbox import drain_outbox
+from organisations.models import OrganisationMember
+from tests.factories import OrganisationFactoryTier, SubscriptionFactory
 from tests.fixtures.test_data import VALID_REGISTRATION_DATA, TEST_USER_EMAIL
 
 User = get_user_model()
@@ -24,7 +31,15 @@ class TestRegistrationFlow:
 
         assert response.status_code == status.HTTP_201_CREATED
         assert User.objects.count() == 1
+
+        # The email is queued, not sent, during the request
+        assert len(mail.outbox) == 0
+        assert EmailOutbox.objects.filter(
+            status=OutboxStatus.PENDING).count() == 1
+
+        drain_outbox()
         assert len(mail.outbox) == 1
+        assert EmailOutbox.objects.get().status == OutboxStatus.SENT
 
         user = User.objects.first()
         assert user.email == VALID_REGISTRATION_DATA['email']
@@ -37,6 +52,31 @@ class TestRegistrationFlow:
         assert 'Please verify your email address' in email.subject
         assert 'verify-email' in email.alternatives[0][0]
 
+    def test_registration_hashes_on_shared_pool(self, api_client):
+        """Test that the password is hashed by the shared hashing service."""
+        completed = get_hashing_service().metrics()['completed']
+
+        response = api_client.post(
+            reverse('authentications:register'), VALID_REGISTRATION_DATA, format='json')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert get_hashing_service().metrics()['completed'] == completed + 1
+        user = User.objects.get()
+        assert user.check_password(VALID_REGISTRATION_DATA['password'])
+        assert not user.is_active
+
+    def test_registration_sheds_load_when_hashing_saturated(self, api_client):
+        """Test that a saturated hashing pool answers 503 and creates nothing."""
+        with mock.patch.object(get_hashing_service(), 'submit',
+                               side_effect=HashingServiceBusy("busy")):
+            response = api_client.post(
+                reverse('authentications:register'), VALID_REGISTRATION_DATA,
+                format='json')
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert not User.objects.exists()
+        assert not EmailOutbox.objects.exists()
+
     def test_registration_with_existing_email(self, api_client):
         """Test registration attempt with an already registered email."""
         # Create initial user
@@ -53,6 +93,7 @@ class TestRegistrationFlow:
         assert 'email' in response.data
         assert User.objects.count() == 1
         assert len(mail.outbox) == 0
+        assert EmailOutbox.objects.count() == 0
 
     def test_registration_with_invalid_password(self, api_client):
         """Test registration with invalid password combinations."""
@@ -91,6 +132,7 @@ class TestRegistrationFlow:
         response = api_client.post(url, modified_data, format='json')
 
         assert response.status_code == status.HTTP_201_CREATED
+        drain_outbox()
         assert len(mail.outbox) == 1
 
         email = mail.outbox[0]
@@ -100,3 +142,13 @@ class TestRegistrationFlow:
         formatted_email = modified_data['email'].replace('@', ' @ ')
         assert formatted_email in html_content
         assert 'verify-email' in html_content
+
+    def test_registration_does_not_join_organisation(self, api_client):
+        """Test that an unverified user takes no seat in the organisation owning their domain."""
+        OrganisationFactoryTier.enterprise()
+        data = {**VALID_REGISTRATION_DATA, 'email': 'new.hire@EXAMPLE.com'}
+
+        response = api_client.post(reverse('authentications:register'), data, format='json')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert not OrganisationMember.objects.exists()
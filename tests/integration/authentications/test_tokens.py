@@ -0,0 +1,149 @@
+# tests/integration/authentications/test_tokens.py
+from unittest import mock
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+from authentications.hashing import HashingServiceBusy, get_hashing_service
+from authentications.revocation import revoked_tokens
+from tests.factories import OrganisationFactoryTier, UserFactory
+
+
+def obtain_tokens(api_client, email, password='testpass123!'):
+    response = api_client.post(
+        reverse('authentications:token'),
+        {'email': email, 'password': password}, format='json')
+    assert response.status_code == status.HTTP_200_OK
+    return response.data
+
+
+@pytest.mark.integration
+@pytest.mark.auth
+@pytest.mark.django_db
+class TestTokenAuthentication:
+    """Integration tests for JWT issue, refresh and revocation."""
+
+    def test_access_token_carries_organisation_claims(self, api_client):
+        """Test that issued tokens embed organisation, tier and role."""
+        organisation = OrganisationFactoryTier.business()
+
+        tokens = obtain_tokens(api_client, organisation.owner.email)
+
+        claims = AccessToken(tokens['access']).payload
+        assert claims['organisation_id'] == str(organisation.pk)
+        assert claims['subscription_tier'] == 'BUS'
+        assert claims['role'] == 'owner'
+        assert claims['is_staff'] is False
+
+    def test_user_without_organisation(self, api_client):
+        """Test the claims of a user who owns no organisation."""
+        user = UserFactory()
+
+        claims = AccessToken(obtain_tokens(api_client, user.email)['access']).payload
+
+        assert claims['organisation_id'] is None
+        assert claims['role'] == 'member'
+
+    def test_invalid_credentials(self, api_client):
+        """Test that wrong passwords get no tokens."""
+        user = UserFactory()
+
+        response = api_client.post(
+            reverse('authentications:token'),
+            {'email': user.email, 'password': 'wrong'}, format='json')
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_login_checks_password_on_shared_pool(self, api_client):
+        """Test that the credential check runs on the hashing service."""
+        user = UserFactory()
+        completed = get_hashing_service().metrics()['completed']
+
+        obtain_tokens(api_client, user.email)
+
+        assert get_hashing_service().metrics()['completed'] == completed + 1
+
+    def test_login_sheds_load_when_hashing_saturated(self, api_client):
+        """Test that a saturated hashing pool answers 503."""
+        user = UserFactory()
+
+        with mock.patch.object(get_hashing_service(), 'submit',
+                               side_effect=HashingServiceBusy("busy")):
+            response = api_client.post(
+                reverse('authentications:token'),
+                {'email': user.email, 'password': 'testpass123!'}, format='json')
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+    def test_authentication_needs_no_queries(
+            self, api_client, django_assert_num_queries):
+        """Test that a bearer token is authenticated without touching the DB."""
+        user = UserFactory(is_staff=True)
+        tokens = obtain_tokens(api_client, user.email)
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        revoked_tokens.sync(force=True)
+
+        with django_assert_num_queries(0):
+            response = api_client.get(reverse('authentications:hashing-metrics'))
+
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_refresh_picks_up_tier_changes(self, api_client):
+        """Test that refreshed access tokens carry current claims."""
+        organisation = OrganisationFactoryTier.starter()
+        tokens = obtain_tokens(api_client, organisation.owner.email)
+        organisation.subscription_tier = 'ENT'
+        organisation.save()
+
+        response = api_client.post(
+            reverse('authentications:token-refresh'),
+            {'refresh': tokens['refresh']}, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert AccessToken(response.data['access'])['subscription_tier'] == 'ENT'
+
+    def test_refresh_rejected_for_inactive_user(self, api_client):
+        """Test that deactivated users cannot refresh."""
+        user = UserFactory()
+        tokens = obtain_tokens(api_client, user.email)
+        user.is_active = False
+        user.save()
+
+        response = api_client.post(
+            reverse('authentications:token-refresh'),
+            {'refresh': tokens['refresh']}, format='json')
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_logout_revokes_both_tokens(self, api_client):
+        """Test that logging out revokes the refresh and access tokens."""
+        user = UserFactory(is_staff=True)
+        tokens = obtain_tokens(api_client, user.email)
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+
+        response = api_client.post(
+            reverse('authentications:logout'),
+            {'refresh': tokens['refresh']}, format='json')
+        assert response.status_code == status.HTTP_200_OK
+
+        response = api_client.get(reverse('authentications:hashing-metrics'))
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+        api_client.credentials()
+        response = api_client.post(
+            reverse('authentications:token-refresh'),
+            {'refresh': tokens['refresh']}, format='json')
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_logout_rejects_other_users_token(self, api_client):
+        """Test that a user cannot revoke someone else's refresh token."""
+        other = obtain_tokens(api_client, UserFactory().email)
+        tokens = obtain_tokens(api_client, UserFactory().email)
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+
+        response = api_client.post(
+            reverse('authentications:logout'),
+            {'refresh': other['refresh']}, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
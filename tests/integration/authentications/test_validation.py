@@ -56,6 +56,20 @@ class TestEmailValidation:
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert response.data['error'] == 'This email address is already registered'
 
+    def test_existing_email_different_case(self, api_client):
+        """Test that the availability check ignores case."""
+        User.objects.create_user(
+            email='existing@example.com',
+            password='TestPass123'
+        )
+
+        url = reverse('authentications:check-email')
+        response = api_client.post(
+            url, {'email': 'Existing@Example.com'}, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data['error'] == 'This email address is already registered'
+
 
 @pytest.mark.integration
 @pytest.mark.auth
@@ -106,3 +120,35 @@ class TestPasswordValidation:
         }, format='json')
 
         assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_password_reports_all_failures(self, api_client):
+        """Test that every failing rule is returned with its code."""
+        url = reverse('authentications:check-password')
+        response = api_client.post(url, {
+            'password': 'testpass'
+        }, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data['error'] == response.data['errors'][0]['message']
+        assert [error['code'] for error in response.data['errors']] == [
+            'password_no_special',
+            'password_no_uppercase',
+            'password_no_numbers',
+        ]
+
+
+@pytest.mark.integration
+@pytest.mark.auth
+class TestRateLimiting:
+    """Integration tests for the shared rate limit on auth endpoints."""
+
+    def test_blocks_after_limit(self, api_client):
+        """Test the sixth check within a minute is rejected."""
+        url = reverse('authentications:check-password')
+        statuses = [
+            api_client.post(url, {'password': 'Test@123Pass'},
+                            format='json').status_code
+            for _ in range(6)
+        ]
+
+        assert statuses == [status.HTTP_200_OK] * 5 + [status.HTTP_403_FORBIDDEN]
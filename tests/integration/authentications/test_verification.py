@@ -1,15 +1,29 @@
 # tests/integration/authentications/test_verification.py
 import pytest
 from django.contrib.auth.tokens import default_token_generator
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils.http import urlsafe_base64_encode
 from django.utils.encoding import force_bytes
 from rest_framework import status
 from django.contrib.auth import get_user_model
+from authentications.utils import make_verification_token
+from organisations.domains import domain_registry
+from organisations.models import OrganisationMember
+from tests.factories import OrganisationFactoryTier, SubscriptionFactory, UserFactory
 
 User = get_user_model()
 
 
+def signed_verification_path(user):
+    return reverse('authentications:verify-email', kwargs={
+        'uidb64': urlsafe_base64_encode(force_bytes(user.pk)),
+        'token': make_verification_token(user),
+    })
+
+
 @pytest.mark.integration
 @pytest.mark.auth
 @pytest.mark.email
@@ -114,3 +128,125 @@ class TestEmailVerificationFlow:
         unverified_user.refresh_from_db()
         assert not user2.is_active
         assert not unverified_user.is_active
+
+
+@pytest.mark.integration
+@pytest.mark.auth
+@pytest.mark.email
+@pytest.mark.django_db
+class TestConditionalVerification:
+    """Integration tests for single-statement and bulk verification."""
+
+    def test_signed_link_costs_one_update(self, api_client, unverified_user):
+        """Test that a verification link is applied with a single UPDATE."""
+        url = signed_verification_path(unverified_user)
+        domain_registry.get('warm.up')
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        # The UPDATE, then the email read to look for an organisation to join
+        statements = [query['sql'] for query in queries
+                      if not query['sql'].startswith(('SAVEPOINT', 'RELEASE'))]
+        assert len(statements) == 2
+        assert statements[0].startswith('UPDATE')
+        assert 'password' not in statements[0].split('WHERE')[0]
+        assert 'password' not in statements[1].split('FROM')[0]
+        unverified_user.refresh_from_db()
+        assert unverified_user.is_active
+        assert unverified_user.email_verified
+
+    def test_verification_joins_organisation_by_domain(self, api_client):
+        """Test that a verified user joins the Enterprise organisation owning their domain."""
+        organisation = OrganisationFactoryTier.enterprise()
+        user = UserFactory(email='new.hire@example.com', is_active=False, email_verified=False)
+
+        response = api_client.get(signed_verification_path(user))
+
+        assert response.status_code == status.HTTP_200_OK
+        member = OrganisationMember.objects.get()
+        assert member.user == user
+        assert member.organisation == organisation
+
+    def test_verification_skips_full_organisation(self, api_client, settings):
+        """Test that no one joins an organisation at its user limit."""
+        settings.TIER_POLICY_OVERRIDES = {'ENT': {'max_users': 1}}
+        SubscriptionFactory(organisation=OrganisationFactoryTier.enterprise(),
+                            current_user_count=1)
+        user = UserFactory(email='new.hire@example.com', is_active=False, email_verified=False)
+
+        response = api_client.get(signed_verification_path(user))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert not OrganisationMember.objects.exists()
+
+    def test_provisioned_member_verifies(self, api_client):
+        """Test that a user already placed in an organisation verifies without rejoining."""
+        organisation = OrganisationFactoryTier.enterprise()
+        user = UserFactory(email='placed@example.com', is_active=False, email_verified=False)
+        OrganisationMember.objects.create(user=user, organisation=organisation)
+
+        response = api_client.get(signed_verification_path(user))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert OrganisationMember.objects.get().user == user
+
+    def test_signed_link_replay(self, api_client, unverified_user):
+        """Test that a second click reports the email as already verified."""
+        url = signed_verification_path(unverified_user)
+        api_client.get(url)
+
+        response = api_client.get(url)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data['error'] == 'Email has already been verified'
+
+    def test_signed_link_invalidated_by_password_change(
+            self, api_client, unverified_user):
+        """Test that changing the password invalidates outstanding links."""
+        url = signed_verification_path(unverified_user)
+        unverified_user.set_password('AnotherPass123!')
+        unverified_user.save()
+
+        response = api_client.get(url)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data['error'] == 'Invalid or expired verification token'
+
+    def test_signed_token_for_wrong_user(self, api_client, unverified_user):
+        """Test that a signed token only verifies the user it was made for."""
+        other = UserFactory(is_active=False, email_verified=False)
+        uid = urlsafe_base64_encode(force_bytes(other.pk))
+
+        response = api_client.get(reverse(
+            'authentications:verify-email',
+            kwargs={'uidb64': uid, 'token': make_verification_token(unverified_user)}))
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        other.refresh_from_db()
+        assert not other.email_verified
+
+    def test_bulk_verification(self):
+        """Test that bulk verification only updates unverified users."""
+        pending = [UserFactory(is_active=False, email_verified=False) for _ in range(3)]
+        UserFactory()
+
+        verified = User.objects.filter(
+            pk__in=[user.pk for user in pending[:2]]).verify_emails()
+
+        assert verified == 2
+        assert User.objects.filter(email_verified=False).count() == 1
+        assert User.objects.all().verify_emails() == 1
+
+    def test_verify_emails_command(self, tmp_path):
+        """Test verifying imported users from a CSV file."""
+        UserFactory(email='import1@example.com', is_active=False, email_verified=False)
+        UserFactory(email='import2@example.com', is_active=False, email_verified=False)
+        csv_file = tmp_path / 'verified.csv'
+        csv_file.write_text('email\nIMPORT1@example.com\nmissing@example.com\n')
+
+        call_command('verify_emails', str(csv_file))
+
+        assert User.objects.get(email='import1@example.com').email_verified
+        assert not User.objects.get(email='import2@example.com').email_verified
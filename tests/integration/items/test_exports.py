@@ -0,0 +1,130 @@
+# tests/integration/items/test_exports.py
+import csv
+import gzip
+import io
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test import AsyncRequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import force_authenticate
+from items.exports import HEADERS, export_items
+from items.models import Item
+from items.views import ItemExportView
+from organisations.tenancy import get_tenant_context
+from tests.factories import ItemFactory
+
+
+def content(response):
+    body = b''.join(response.streaming_content)
+    if response.get('Content-Encoding') == 'gzip':
+        body = gzip.decompress(body)
+    return body.decode()
+
+
+async def read_async(response):
+    return b''.join([piece async for piece in response.streaming_content]).decode()
+
+
+@pytest.fixture
+def owner_client(api_client, tree):
+    api_client.force_authenticate(user=tree['story'].organisation.owner)
+    return api_client
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestItemExport:
+    """Integration tests for streamed NDJSON and CSV exports."""
+
+    def test_ndjson(self, owner_client, tree):
+        """Test that live items stream as gzipped NDJSON, parents first."""
+        tree['other'].soft_delete()
+        ItemFactory()
+
+        response = owner_client.get(reverse('items:export-ndjson'),
+                                    HTTP_ACCEPT_ENCODING='gzip, deflate')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response['Content-Type'] == 'application/x-ndjson'
+        assert response['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response['Vary']
+        rows = [json.loads(line) for line in content(response).splitlines()]
+        assert [row['id'] for row in rows] == [
+            tree[name].pk for name in ('platform', 'project', 'feature', 'epic', 'story')]
+        assert rows[1]['parent'] == tree['platform'].pk
+        assert rows[0]['parent'] is None
+        assert set(rows[0]) == set(HEADERS)
+
+    def test_csv(self, owner_client, tree):
+        """Test that CSV exports quote awkward values and skip gzip when not accepted."""
+        Item.objects.filter(pk=tree['story'].pk).update(
+            title='Pay, then "refund"', description='Line one\nLine two')
+
+        response = owner_client.get(reverse('items:export-csv'))
+
+        assert 'Content-Encoding' not in response
+        assert response['Content-Type'] == 'text/csv'
+        rows = list(csv.DictReader(io.StringIO(content(response))))
+        assert len(rows) == 6
+        story = next(row for row in rows if row['id'] == str(tree['story'].pk))
+        assert story['title'] == 'Pay, then "refund"'
+        assert story['description'] == 'Line one\nLine two'
+        assert story['parent'] == str(tree['epic'].pk)
+
+    def test_csv_neutralises_formulas(self, owner_client, tree):
+        """Test that cells a spreadsheet would evaluate are exported as text."""
+        Item.objects.filter(pk=tree['story'].pk).update(
+            title='=HYPERLINK("http://example.com")', description='@SUM(A1)',
+            external_id='-2+3')
+        Item.objects.filter(pk=tree['epic'].pk).update(title='Plain - title')
+
+        response = owner_client.get(reverse('items:export-csv'))
+        rows = {row['id']: row for row in csv.DictReader(io.StringIO(content(response)))}
+
+        story = rows[str(tree['story'].pk)]
+        assert story['title'] == '\'=HYPERLINK("http://example.com")'
+        assert story['description'] == "'@SUM(A1)"
+        assert story['ref'] == "'-2+3"
+        assert rows[str(tree['epic'].pk)]['title'] == 'Plain - title'
+
+        ndjson = owner_client.get(reverse('items:export-ndjson'))
+        titles = [json.loads(line)['title'] for line in content(ndjson).splitlines()]
+        assert '=HYPERLINK("http://example.com")' in titles
+
+    def test_streams_in_chunks(self, tree, settings):
+        """Test that rows are fetched chunk by chunk in one query."""
+        settings.ITEM_EXPORT_CHUNK_SIZE = 2
+        organisation = tree['story'].organisation
+
+        with CaptureQueriesContext(connection) as context:
+            body = b''.join(export_items(organisation, 'ndjson'))
+
+        selects = [query for query in context if query['sql'].startswith('SELECT')]
+        assert len(selects) == 1
+        assert len(gzip.decompress(body).splitlines()) == 6
+
+    def test_streams_asynchronously_under_asgi(self, tree):
+        """Test that ASGI requests get an async stream instead of one read in full."""
+        owner = tree['story'].organisation.owner
+        request = AsyncRequestFactory().get(reverse('items:export-ndjson'))
+        force_authenticate(request, user=owner)
+        request.tenant = get_tenant_context(owner)
+
+        response = ItemExportView.as_view(export_format='ndjson')(request)
+
+        assert response.is_async
+        rows = [json.loads(line) for line in async_to_sync(read_async)(response).splitlines()]
+        assert [row['id'] for row in rows][0] == tree['platform'].pk
+        assert len(rows) == 6
+
+    def test_requires_authentication(self, api_client):
+        """Test that anonymous callers cannot export."""
+        response = api_client.get(reverse('items:export-csv'), HTTP_ACCEPT='text/csv')
+
+        assert response.status_code in (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN)
+        assert response['Content-Type'] == 'application/json'
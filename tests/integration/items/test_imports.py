@@ -0,0 +1,258 @@
+# tests/integration/items/test_imports.py
+from datetime import timedelta
+import io
+import json
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from items.imports import claim_import_job, import_items, read_rows
+from items.models import ImportFormat, ImportJob, ImportStatus, Item, ItemClosure, NodeType
+from items.usage import item_totals
+from organisations.models import ProjectFramework, UsageMetric
+from organisations.usage import current_usage, usage_meter
+from tests.factories import ItemFactory, OrganisationFactoryTier, SubscriptionFactory
+
+HIERARCHY_CSV = (
+    "ref,parent_ref,node_type,title,framework\n"
+    "P1,,Platform,Payments,scrum\n"
+    "J1,P1,PRJ,Checkout,\n"
+    "F1,J1,feature,Wallets,\n"
+    "E1,F1,Epic,Apple Pay,\n"
+    "S1,E1,User Story,Pay with one tap,\n"
+    "S2,E1,UST,\"Refunds,\nsplit over lines\",\n"
+)
+
+
+def run_import(organisation, content, format=ImportFormat.CSV, batch_size=None):
+    job = ImportJob.objects.create(organisation=organisation, format=format)
+    return import_items(job, read_rows(io.BytesIO(content.encode()), format), batch_size)
+
+
+def ndjson(*rows):
+    return ''.join((row if isinstance(row, str) else json.dumps(row)) + '\n' for row in rows)
+
+
+def closure_is_complete(organisation):
+    """Every live item has one closure row per ancestor, plus its own."""
+    items = Item.objects.active().filter(organisation=organisation)
+    expected = sum(depth + 1 for depth in items.values_list('depth', flat=True))
+    return ItemClosure.objects.filter(descendant__organisation=organisation).count() == expected
+
+
+@pytest.fixture(autouse=True)
+def clean_meter():
+    yield
+    usage_meter.pending.clear()
+    usage_meter.pending_count = 0
+
+
+@pytest.fixture
+def business():
+    return SubscriptionFactory(organisation=OrganisationFactoryTier.business()).organisation
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestItemImport:
+    """Integration tests for streamed, batched item imports."""
+
+    def test_imports_hierarchy_across_batches(self, business, django_capture_on_commit_callbacks):
+        """Test that parents in earlier batches are found and paths and closure rows built."""
+        with django_capture_on_commit_callbacks(execute=True):
+            job = run_import(business, HIERARCHY_CSV, batch_size=2)
+
+        assert job.status == ImportStatus.COMPLETED
+        assert (job.rows_processed, job.items_created, job.rows_failed) == (6, 6, 0)
+        story = Item.objects.get(external_id='S1')
+        assert [item.external_id for item in Item.objects.ancestors(story)] == [
+            'P1', 'J1', 'F1', 'E1']
+        assert story.framework == ProjectFramework.SCRUM
+        assert Item.objects.get(external_id='S2').title == "Refunds,\nsplit over lines"
+        assert closure_is_complete(business)
+        assert current_usage(business.subscription)[UsageMetric.ITEMS] == 6
+
+    def test_row_errors(self, business):
+        """Test that bad rows, and rows below them, fail without stopping the import."""
+        project = ItemFactory(organisation=business, framework=ProjectFramework.KANBAN)
+        content = ndjson(
+            {'ref': 'F1', 'parent': project.pk, 'node_type': 'FEA', 'title': 'Feature'},
+            '{"ref": "broken"',
+            {'ref': 'X1', 'parent_ref': 'F1', 'node_type': 'nonsense', 'title': 'Bad type'},
+            {'ref': 'T1', 'parent_ref': 'F1', 'node_type': 'TSK', 'title': 'Misplaced'},
+            {'ref': 'T2', 'parent_ref': 'T1', 'node_type': 'TSK', 'title': 'Orphan'},
+            {'ref': 'E1', 'parent_ref': 'F1', 'node_type': 'EPC', 'title': 'Epic',
+             'framework': 'SCR'},
+            {'ref': 'F1', 'parent': project.pk, 'node_type': 'FEA', 'title': 'Again'},
+            {'ref': 'E2', 'parent_ref': 'F1', 'node_type': 'EPC', 'title': 'Epic'},
+            [1, 2],
+        )
+
+        job = run_import(business, content, format=ImportFormat.NDJSON, batch_size=4)
+
+        failed = {error['row']: error['errors'] for error in job.errors}
+        assert set(failed) == {1, 2, 3, 4, 5, 6, 8}
+        assert 'row' in failed[1] and 'node_type' in failed[2]
+        assert 'node_type' in failed[3] and 'parent_ref' in failed[4]
+        assert 'framework' in failed[5] and 'ref' in failed[6]
+        assert (job.items_created, job.rows_failed) == (2, 7)
+        assert set(Item.objects.filter(organisation=business).values_list(
+            'external_id', flat=True)) == {'', 'F1', 'E2'}
+        assert ImportJob.objects.get(pk=job.pk).errors == job.errors
+
+    def test_reimport_skips_existing(self, business):
+        """Test that importing the same file twice creates nothing new."""
+        run_import(business, HIERARCHY_CSV)
+
+        job = run_import(business, HIERARCHY_CSV)
+
+        assert (job.items_created, job.rows_failed) == (0, 6)
+        assert Item.objects.filter(organisation=business).count() == 6
+
+    def test_resumes_after_committed_rows(self, business):
+        """Test that re-running an interrupted job does not duplicate rows without refs."""
+        rows = [{'node_type': 'PLT', 'title': f'Platform {n}'} for n in range(5)]
+        rows.append({'node_type': 'PLT', 'title': ''})
+
+        def dies_after(count):
+            yield from rows[:count]
+            raise SystemExit("worker killed")
+
+        job = ImportJob.objects.create(organisation=business, format=ImportFormat.NDJSON)
+        with pytest.raises(SystemExit):
+            import_items(job, dies_after(3), batch_size=2)
+        job = ImportJob.objects.get(pk=job.pk)
+        assert (job.status, job.rows_processed) == (ImportStatus.RUNNING, 2)
+
+        job = import_items(job, iter(rows), batch_size=2)
+
+        assert job.status == ImportStatus.COMPLETED
+        assert (job.rows_processed, job.items_created, job.rows_failed) == (6, 5, 1)
+        assert job.errors[0]['row'] == 5
+        assert sorted(Item.objects.filter(organisation=business).values_list(
+            'title', flat=True)) == [f'Platform {n}' for n in range(5)]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_stops_at_item_limit(self):
+        """Test that an import stops once the tier's item limit is reached."""
+        subscription = SubscriptionFactory(
+            organisation=OrganisationFactoryTier.starter(), current_item_count=997)
+        content = "ref,parent_ref,node_type,title\nJ1,,PRJ,Project\n" + "".join(
+            f"T{n},J1,TSK,Task {n}\n" for n in range(5))
+
+        job = run_import(subscription.organisation, content, batch_size=3)
+
+        assert job.status == ImportStatus.COMPLETED
+        assert job.message
+        assert (job.items_created, job.rows_failed) == (3, 3)
+        assert current_usage(subscription)[UsageMetric.ITEMS] == 1000
+
+    def test_queries_per_batch(self, business):
+        """Test that a batch costs the same number of queries whatever its size."""
+        project = ItemFactory(organisation=business, external_id='J1',
+                              framework=ProjectFramework.KANBAN)
+        ItemFactory(parent=project, node_type=NodeType.FEATURE, external_id='F1')
+
+        def queries(rows):
+            content = "ref,parent_ref,node_type,title\n" + "".join(
+                f"E{rows}.{n},F1,EPC,Epic\nT{rows}.{n},E{rows}.{n},TSK,Task\n"
+                for n in range(rows // 2))
+            with CaptureQueriesContext(connection) as context:
+                run_import(business, content, batch_size=rows)
+            return len(context)
+
+        assert queries(10) == queries(60)
+        assert closure_is_complete(business)
+
+    def test_usage_source(self, tree):
+        """Test that item totals for usage reconciliation count live items only."""
+        organisation = tree['story'].organisation
+        subscription = SubscriptionFactory(organisation=organisation)
+        tree['epic'].soft_delete()
+
+        assert item_totals([subscription.pk]) == {subscription.pk: 4}
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestItemImportEndpoints:
+    """Integration tests for queued imports through the API and commands."""
+
+    @pytest.fixture(autouse=True)
+    def media(self, settings, tmp_path):
+        settings.MEDIA_ROOT = str(tmp_path)
+
+    def test_queue_and_process(self, api_client, business, tmp_path):
+        """Test that an uploaded file is queued, run by the worker and then removed."""
+        api_client.force_authenticate(user=business.owner)
+        response = api_client.post(reverse('items:imports'), {
+            'file': SimpleUploadedFile('backlog.csv', HIERARCHY_CSV.encode()),
+        }, format='multipart')
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.data['status'] == ImportStatus.PENDING
+        assert response.data['format'] == ImportFormat.CSV
+
+        call_command('process_item_imports', '--once', stdout=io.StringIO())
+
+        response = api_client.get(reverse('items:import-detail', args=[response.data['id']]))
+        assert response.data['status'] == ImportStatus.COMPLETED
+        assert response.data['items_created'] == 6
+        assert not ImportJob.objects.get().source
+        assert not list((tmp_path / 'item_imports').iterdir())
+
+    def test_reclaims_stalled_jobs(self, business, settings):
+        """Test that a running job whose worker stopped updating it is claimed again."""
+        settings.ITEM_IMPORT_LEASE_SECONDS = 60
+        stalled, live = (
+            ImportJob.objects.create(organisation=business, format=ImportFormat.CSV,
+                                     status=ImportStatus.RUNNING, rows_processed=1000)
+            for _ in range(2))
+        started = timezone.now() - timedelta(minutes=5)
+        ImportJob.objects.filter(pk=stalled.pk).update(started_at=started, updated_at=started)
+
+        job = claim_import_job()
+
+        assert job == stalled
+        assert (job.status, job.rows_processed, job.started_at) == (
+            ImportStatus.RUNNING, 1000, started)
+        assert claim_import_job() is None
+        assert ImportJob.objects.get(pk=live.pk).status == ImportStatus.RUNNING
+
+    def test_rejects_unknown_format(self, api_client, business):
+        """Test that a file of no known format is refused."""
+        api_client.force_authenticate(user=business.owner)
+        response = api_client.post(reverse('items:imports'), {
+            'file': SimpleUploadedFile('backlog.xlsx', b'data'),
+        }, format='multipart')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'format' in response.data
+
+    def test_jobs_are_private(self, api_client, business):
+        """Test that one organisation cannot see another's imports."""
+        job = ImportJob.objects.create(organisation=business, format=ImportFormat.CSV)
+        api_client.force_authenticate(user=SubscriptionFactory().organisation.owner)
+
+        response = api_client.get(reverse('items:import-detail', args=[job.pk]))
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_import_command(self, business, tmp_path):
+        """Test that the command imports a local file and reports row errors."""
+        path = tmp_path / 'backlog.ndjson'
+        path.write_text(ndjson({'ref': 'P1', 'node_type': 'PLT', 'title': 'Payments'},
+                               {'ref': 'X', 'node_type': 'TSK', 'title': 'Task'}))
+        stdout, stderr = io.StringIO(), io.StringIO()
+
+        call_command('import_items', str(path), '--organisation', str(business.pk),
+                     stdout=stdout, stderr=stderr)
+
+        assert "Created 1 item(s), 1 row(s) failed." in stdout.getvalue()
+        assert "Row 1 (X)" in stderr.getvalue()
+        assert ImportJob.objects.get().status == ImportStatus.COMPLETED
@@ -0,0 +1,66 @@
+# tests/integration/organisations/test_admin.py
+import pytest
+from django.contrib import admin
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from backlogger_api.pagination import EstimatedCountPaginator
+from organisations.models import Organisation, Subscription
+from tests.factories import SubscriptionFactory
+
+
+def changelist_queries(client, model, per_page, monkeypatch):
+    monkeypatch.setattr(admin.site._registry[model], 'list_per_page', per_page)
+    url = reverse(f'admin:organisations_{model._meta.model_name}_changelist')
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(queries), response
+
+
+@pytest.mark.integration
+@pytest.mark.django_db
+class TestOrganisationAdmin:
+    """Integration tests for the organisation and subscription admin."""
+
+    @pytest.mark.parametrize('model', [Organisation, Subscription])
+    def test_changelist_query_count_is_constant(self, admin_client, model, monkeypatch):
+        """Test that the changelist costs the same whatever the page size."""
+        SubscriptionFactory.create_batch(6)
+
+        small, _ = changelist_queries(admin_client, model, 2, monkeypatch)
+        large, response = changelist_queries(admin_client, model, 100, monkeypatch)
+
+        assert small == large
+        assert len(response.context['cl'].result_list) == 6
+
+    def test_subscription_usage_columns(self, admin_client):
+        """Test that usage percentages are computed from the tier limits."""
+        subscription = SubscriptionFactory(current_user_count=5, current_storage_used=2560)
+
+        response = admin_client.get(reverse('admin:organisations_subscription_changelist'))
+
+        row = response.context['cl'].result_list[0]
+        assert row.pk == subscription.pk
+        # Starter allows 10 users and 10GB of storage
+        assert (row.user_pct, row.item_pct, row.storage_pct) == (50, 0, 25)
+        assert b'50%' in response.content
+
+    def test_changelist_sorts_by_usage(self, admin_client):
+        """Test that the annotated usage columns can be ordered on."""
+        low = SubscriptionFactory(current_user_count=1)
+        high = SubscriptionFactory(current_user_count=9)
+
+        response = admin_client.get(
+            reverse('admin:organisations_subscription_changelist'), {'o': '-6'})
+
+        assert list(response.context['cl'].result_list) == [high, low]
+
+    def test_paginator_counts_exactly_without_estimate(self):
+        """Test the exact-count fallback for filtered or non-PostgreSQL querysets."""
+        SubscriptionFactory.create_batch(3)
+
+        paginator = EstimatedCountPaginator(Subscription.objects.order_by('pk'), 2)
+
+        assert paginator.estimated_count() is None
+        assert paginator.count == 3
@@ -0,0 +1,18 @@
+# tests/integration/organisations/test_tiers.py
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+
+@pytest.mark.integration
+class TestTierPolicyEndpoint:
+    """Integration tests for the tier policy endpoint."""
+
+    def test_lists_every_tier(self, api_client):
+        """Test that the endpoint reports each tier's limits and features."""
+        response = api_client.get(reverse('organisations:tiers'))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert set(response.data) == {'STR', 'PRO', 'BUS', 'ENT'}
+        assert response.data['STR']['methodologies'] == ['KAN']
+        assert response.data['ENT']['allows_domain_restriction'] is True
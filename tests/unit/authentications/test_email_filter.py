@@ -0,0 +1,123 @@
+# tests/unit/authentications/test_email_filter.py
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError
+from django.utils import timezone
+from authentications.email_filter import (
+    BloomFilter,
+    email_is_registered,
+    registered_emails,
+)
+
+User = get_user_model()
+
+
+@pytest.fixture
+def fresh_filter():
+    """Start each test from an unloaded filter."""
+    registered_emails.reset()
+    yield registered_emails
+    registered_emails.reset()
+
+
+@pytest.mark.unit
+@pytest.mark.auth
+class TestBloomFilter:
+    """Unit tests for the Bloom filter primitive."""
+
+    def test_no_false_negatives(self):
+        """Test every added value is reported as present."""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        values = [f'user{n}@example.com' for n in range(1000)]
+        for value in values:
+            bloom.add(value)
+
+        assert all(value in bloom for value in values)
+
+    def test_false_positive_rate(self):
+        """Test the false positive rate stays near the configured rate."""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for n in range(1000):
+            bloom.add(f'user{n}@example.com')
+
+        false_positives = sum(
+            f'other{n}@example.com' in bloom for n in range(10000))
+        assert false_positives < 300
+
+
+@pytest.mark.unit
+@pytest.mark.auth
+@pytest.mark.django_db
+class TestRegisteredEmailFilter:
+    """Unit tests for the registered email lookups."""
+
+    def test_unknown_email_skips_database(self, fresh_filter, django_assert_num_queries):
+        """Test that an unseen email is answered without a query once loaded."""
+        User.objects.create_user(email='taken@example.com', password='x')
+        fresh_filter.refresh()
+
+        with django_assert_num_queries(0):
+            assert email_is_registered('free@example.com') is False
+
+    def test_registered_email_is_case_insensitive(self, fresh_filter):
+        """Test that lookups ignore case."""
+        User.objects.create_user(email='Taken@Example.com', password='x')
+
+        assert email_is_registered('taken@example.com')
+        assert email_is_registered('TAKEN@EXAMPLE.COM')
+
+    def test_local_saves_update_loaded_filter(self, fresh_filter):
+        """Test that users saved after loading are picked up via signals."""
+        fresh_filter.refresh()
+        User.objects.create_user(email='new@example.com', password='x')
+
+        assert fresh_filter.might_exist('new@example.com')
+
+    def test_refresh_picks_up_rows_from_other_processes(self, fresh_filter):
+        """Test that rows inserted without signals appear after a refresh."""
+        fresh_filter.refresh()
+        User.objects.bulk_create([User(email='bulk@example.com')])
+
+        fresh_filter.refresh(force=True)
+        assert email_is_registered('bulk@example.com')
+
+    def test_refresh_picks_up_rows_committed_out_of_order(self, fresh_filter):
+        """Test that a row with a lower key, committed after a refresh, is found."""
+        User.objects.bulk_create([User(pk=1000, email='seen@example.com')])
+        fresh_filter.refresh()
+        # Joined (and took its key) before the refresh, but committed after it
+        User.objects.bulk_create([User(
+            pk=999, email='late@example.com',
+            date_joined=timezone.now() - timedelta(seconds=30))])
+
+        fresh_filter.refresh(force=True)
+        assert email_is_registered('late@example.com')
+
+    def test_overlapping_refreshes_count_users_once(self, fresh_filter):
+        """Test that users re-read by an overlapping refresh are not recounted."""
+        User.objects.bulk_create([User(email='once@example.com')])
+        fresh_filter.refresh()
+        count = fresh_filter.bloom.count
+
+        fresh_filter.refresh(force=True)
+        assert fresh_filter.bloom.count == count
+
+    def test_resaving_user_is_not_recounted(self, fresh_filter):
+        """Test that saves of an existing user do not grow the filter's count."""
+        user = User.objects.create_user(email='saved@example.com', password='x')
+        fresh_filter.refresh()
+        count = fresh_filter.bloom.count
+
+        user.last_login = timezone.now()
+        user.save(update_fields=['last_login'])
+        fresh_filter.add('Saved@Example.com')
+        assert fresh_filter.bloom.count == count
+
+    def test_case_variant_violates_unique_constraint(self):
+        """Test the database rejects emails differing only by case."""
+        User.objects.create_user(email='dupe@example.com', password='x')
+
+        with pytest.raises(IntegrityError):
+            User.objects.bulk_create([User(email='DUPE@example.com')])
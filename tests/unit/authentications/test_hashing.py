@@ -0,0 +1,107 @@
+# tests/unit/authentications/test_hashing.py
+import threading
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password
+from authentications.hashing import HashingService, HashingServiceBusy
+
+User = get_user_model()
+
+
+@pytest.fixture
+def service():
+    service = HashingService(max_workers=2, max_pending=2)
+    yield service
+    service.shutdown()
+
+
+@pytest.mark.unit
+@pytest.mark.auth
+class TestHashingService:
+    """Unit tests for the shared password hashing service."""
+
+    def test_hash_and_verify_password(self, service):
+        """Test that hashes made on the pool verify with Django's hashers."""
+        encoded = service.hash_password('StrongPass123!')
+
+        assert check_password('StrongPass123!', encoded)
+        assert service.verify_password('StrongPass123!', encoded) == (True, False)
+        assert service.verify_password('wrong', encoded) == (False, False)
+
+    def test_make_and_check_password(self, service):
+        """Test that async hashing round-trips with Django's hashers."""
+        encoded = async_to_sync(service.make_password)('StrongPass123!')
+
+        assert check_password('StrongPass123!', encoded)
+        assert async_to_sync(service.check_password)('StrongPass123!', encoded)
+        assert not async_to_sync(service.check_password)('wrong', encoded)
+
+    def test_rejects_when_saturated(self, service):
+        """Test that work beyond max_pending is rejected, not queued."""
+        release = threading.Event()
+        futures = [service.submit(release.wait) for _ in range(2)]
+
+        with pytest.raises(HashingServiceBusy):
+            service.submit(release.wait)
+
+        release.set()
+        for future in futures:
+            future.result(timeout=5)
+        assert service.submit(lambda: 'ok').result(timeout=5) == 'ok'
+
+    def test_metrics(self, service):
+        """Test that usage counters are reported."""
+        release = threading.Event()
+        futures = [service.submit(release.wait) for _ in range(2)]
+        with pytest.raises(HashingServiceBusy):
+            service.submit(release.wait)
+        assert service.metrics()['in_flight'] == 2
+
+        release.set()
+        for future in futures:
+            future.result(timeout=5)
+        metrics = service.metrics()
+        assert metrics['submitted'] == 2
+        assert metrics['completed'] == 2
+        assert metrics['rejected'] == 1
+        assert metrics['in_flight'] == 0
+
+    def test_make_passwords_waits_for_slots(self, service):
+        """Test that bulk hashing waits for a busy pool instead of failing."""
+        release = threading.Event()
+        blocker = service.submit(release.wait)
+        threading.Timer(0.1, release.set).start()
+
+        hashed = service.make_passwords(['one', 'two', 'three'])
+
+        assert [check_password(password, encoded) for password, encoded
+                in zip(['one', 'two', 'three'], hashed)] == [True] * 3
+        assert blocker.result(timeout=5)
+        assert service.metrics()['rejected'] == 0
+
+    @pytest.mark.django_db
+    def test_acreate_user(self):
+        """Test async user creation hashes off the calling thread."""
+        user = async_to_sync(User.objects.acreate_user)(
+            'async@example.com', 'StrongPass123!', first_name='Async')
+
+        user.refresh_from_db()
+        assert user.check_password('StrongPass123!')
+        assert not user.is_active
+
+    @pytest.mark.django_db
+    def test_check_user_password_upgrades_hash(self, service, settings):
+        """Test that an outdated hash is replaced after a successful check."""
+        settings.PASSWORD_HASHERS = [
+            'django.contrib.auth.hashers.MD5PasswordHasher',
+            'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+        ]
+        user = User.objects.create_user('old@example.com', 'StrongPass123!')
+        settings.PASSWORD_HASHERS = settings.PASSWORD_HASHERS[::-1]
+
+        assert async_to_sync(service.check_user_password)(user, 'StrongPass123!')
+        user.refresh_from_db()
+        assert user.password.startswith('pbkdf2_sha256$')
+        assert not async_to_sync(service.check_user_password)(user, 'wrong')
@@ -0,0 +1,125 @@
+# tests/unit/authentications/test_outbox.py
+from unittest import mock
+import threading
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+from django.utils import timezone
+from authentications.management.commands.process_email_outbox import Command as OutboxCommand
+from authentications.models import EmailOutbox, OutboxStatus
+from authentications.outbox import (
+    claim_batch,
+    deliver_batch,
+    drain_outbox,
+    enqueue_verification_email,
+)
+
+
+@pytest.mark.unit
+@pytest.mark.email
+@pytest.mark.django_db
+class TestEmailOutbox:
+    """Unit tests for the transactional email outbox."""
+
+    def test_enqueue_does_not_send(self, registered_user):
+        """Test that enqueueing only writes a pending row."""
+        entry = enqueue_verification_email(
+            registered_user, 'http://test.com/verify')
+
+        assert entry.status == OutboxStatus.PENDING
+        assert entry.to_email == registered_user.email
+        assert len(mail.outbox) == 0
+
+    def test_drain_sends_queued_emails(self, registered_user):
+        """Test that draining delivers every due row once."""
+        enqueue_verification_email(registered_user, 'http://test.com/verify')
+        enqueue_verification_email(registered_user, 'http://test.com/again')
+
+        sent, failed = drain_outbox(batch_size=1)
+
+        assert (sent, failed) == (2, 0)
+        assert len(mail.outbox) == 2
+        assert 'http://test.com/verify' in mail.outbox[0].alternatives[0][0]
+        assert not EmailOutbox.objects.exclude(
+            status=OutboxStatus.SENT).exists()
+
+        # Nothing left to do on a second pass
+        assert drain_outbox() == (0, 0)
+
+    def test_claimed_rows_are_leased(self, registered_user):
+        """Test that a claimed row is not handed out twice."""
+        enqueue_verification_email(registered_user, 'http://test.com/verify')
+
+        assert len(claim_batch()) == 1
+        assert claim_batch() == []
+
+    def test_failed_delivery_is_retried_with_backoff(self, registered_user):
+        """Test that a failed send is rescheduled rather than dropped."""
+        entry = enqueue_verification_email(
+            registered_user, 'http://test.com/verify')
+
+        with mock.patch('django.core.mail.EmailMessage.send',
+                        side_effect=ConnectionError('relay down')):
+            sent, failed = deliver_batch(claim_batch())
+
+        assert (sent, failed) == (0, 1)
+        entry.refresh_from_db()
+        assert entry.status == OutboxStatus.PENDING
+        assert entry.attempts == 1
+        assert entry.next_attempt_at > timezone.now()
+        assert 'relay down' in entry.last_error
+
+    def test_gives_up_after_max_attempts(self, registered_user, settings):
+        """Test that a row is marked failed once attempts are exhausted."""
+        settings.EMAIL_OUTBOX_MAX_ATTEMPTS = 1
+        entry = enqueue_verification_email(
+            registered_user, 'http://test.com/verify')
+
+        with mock.patch('django.core.mail.EmailMessage.send',
+                        side_effect=ConnectionError('relay down')):
+            deliver_batch(claim_batch())
+
+        entry.refresh_from_db()
+        assert entry.status == OutboxStatus.FAILED
+
+    def test_connect_failure_reschedules_batch(self, registered_user):
+        """Test that an unreachable mail server backs off every claimed row."""
+        entry = enqueue_verification_email(
+            registered_user, 'http://test.com/verify')
+
+        with mock.patch('django.core.mail.backends.locmem.EmailBackend.open',
+                        side_effect=ConnectionRefusedError('no relay')):
+            sent, failed = deliver_batch(claim_batch())
+
+        assert (sent, failed) == (0, 1)
+        entry.refresh_from_db()
+        assert entry.attempts == 1
+        assert entry.status == OutboxStatus.PENDING
+        assert 'no relay' in entry.last_error
+
+    def test_worker_survives_batch_errors(self, registered_user):
+        """Test that a worker thread logs a failed batch and keeps going."""
+        enqueue_verification_email(registered_user, 'http://test.com/verify')
+        command = OutboxCommand()
+        command.stop = threading.Event()
+        command.totals = {'sent': 0, 'failed': 0}
+        command.lock = threading.Lock()
+        module = 'authentications.management.commands.process_email_outbox'
+
+        with mock.patch(f'{module}.deliver_batch',
+                        side_effect=[RuntimeError('database went away'), (1, 0)]) as deliver, \
+                mock.patch(f'{module}.claim_batch', side_effect=[['a'], ['b'], []]), \
+                mock.patch(f'{module}.connections'):
+            command.work(batch_size=None, poll_interval=0, once=True)
+
+        assert deliver.call_count == 2
+        assert command.totals == {'sent': 1, 'failed': 0}
+
+    def test_management_command_drains_outbox(self, registered_user):
+        """Test the worker command in single-pass mode."""
+        enqueue_verification_email(registered_user, 'http://test.com/verify')
+
+        call_command('process_email_outbox', '--once')
+
+        assert len(mail.outbox) == 1
@@ -0,0 +1,82 @@
+# tests/unit/authentications/test_password_policy.py
+import pytest
+from django.contrib.auth import password_validation
+from django.core.exceptions import ValidationError
+from authentications.password_policy import PasswordPolicy, get_password_policy
+from authentications.validators import NoUserInfoValidator, RepeatedCharacterValidator
+from tests.fixtures.test_data import INVALID_PASSWORDS
+
+
+def error_codes(error_list):
+    return [item.code for error in error_list for item in error.error_list]
+
+
+def chain_codes(password, user=None, validators=None):
+    """Codes raised by Django's validator-by-validator chain."""
+    try:
+        password_validation.validate_password(password, user, validators)
+    except ValidationError as e:
+        return [error.code for error in e.error_list]
+    return []
+
+
+@pytest.mark.unit
+@pytest.mark.auth
+class TestPasswordPolicy:
+    """Unit tests for the single-pass password policy."""
+
+    @pytest.mark.parametrize("password", INVALID_PASSWORDS + [
+        'Test@123Pass',
+        'StrongPass123!',
+        'Tesssst@123',
+        'T@1',
+        'aaaa',
+        'ÄÖÜäöü€@1Aa',
+        'T' * 129 + 'a1!',
+        '',
+    ])
+    def test_matches_validator_chain(self, password):
+        """Test the policy reports the same codes as the configured chain."""
+        assert error_codes(get_password_policy().errors(password)) == \
+            chain_codes(password)
+
+    def test_reports_all_failures_together(self):
+        """Test that every failing rule is reported, in configured order."""
+        with pytest.raises(ValidationError) as exc:
+            get_password_policy().validate('aaaa')
+
+        assert [error.code for error in exc.value.error_list] == [
+            'password_too_short',
+            'password_no_special',
+            'password_no_uppercase',
+            'password_no_numbers',
+            'password_repeated_characters',
+        ]
+
+    @pytest.mark.parametrize("max_repeats, password, fails", [
+        (2, 'Tesst@123', True),
+        (3, 'Tesst@123', False),
+        (3, 'Tessst@123', True),
+    ])
+    def test_repeat_threshold(self, max_repeats, password, fails):
+        """Test run-length detection matches the regex validator."""
+        validators = [RepeatedCharacterValidator(max_repeats=max_repeats)]
+        policy = PasswordPolicy(validators)
+
+        assert bool(policy.errors(password)) is fails
+        assert bool(chain_codes(password, validators=validators)) is fails
+
+    @pytest.mark.parametrize("password, fails", [
+        ('Xyz@Davi1', True),     # part of first name
+        ('Q@brOwn99', True),     # part of last name, case-insensitive
+        ('Kite@Sky42', False),
+    ])
+    def test_user_info_trigrams(self, password, fails, django_user_model):
+        """Test the trigram check matches NoUserInfoValidator."""
+        user = django_user_model(
+            email='dj@outlook.com', first_name='David', last_name='Brown')
+        validators = [NoUserInfoValidator()]
+        policy = PasswordPolicy(validators)
+
+        assert bool(policy.errors(password, user)) is fails
+        assert bool(chain_codes(password, user, validators)) is fails
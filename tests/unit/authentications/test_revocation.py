@@ -0,0 +1,71 @@
+# tests/unit/authentications/test_revocation.py
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from authentications.models import RevokedToken
+from authentications.revocation import (
+    TokenRevocationList, purge_expired_revocations, revoked_tokens,
+)
+from authentications.tokens import ClaimsRefreshToken
+from tests.factories import UserFactory
+
+
+@pytest.mark.unit
+@pytest.mark.auth
+@pytest.mark.django_db
+class TestTokenRevocationList:
+    """Tests for the in-memory token revocation list."""
+
+    def test_revoked_token_is_rejected_locally(self):
+        """Test that a revocation applies immediately in this process."""
+        token = ClaimsRefreshToken.for_user(UserFactory())
+
+        revoked_tokens.revoke(token)
+
+        assert revoked_tokens.is_revoked(token.payload)
+        assert not revoked_tokens.is_revoked(
+            ClaimsRefreshToken.for_user(UserFactory()).payload)
+
+    def test_sync_picks_up_other_processes(self):
+        """Test that revocations written elsewhere arrive on the next sync."""
+        token = ClaimsRefreshToken.for_user(UserFactory())
+        other_process = TokenRevocationList()
+        other_process.sync(force=True)
+
+        revoked_tokens.revoke(token)
+        assert not other_process.is_revoked(token.payload)
+
+        other_process.sync(force=True)
+        assert other_process.is_revoked(token.payload)
+
+    def test_sync_is_incremental(self, django_assert_num_queries):
+        """Test that checks between syncs do not query."""
+        token = ClaimsRefreshToken.for_user(UserFactory())
+        revocations = TokenRevocationList()
+        revocations.sync(force=True)
+
+        with django_assert_num_queries(0):
+            for _ in range(10):
+                revocations.is_revoked(token.payload)
+
+    def test_revoke_user_covers_earlier_tokens(self):
+        """Test that a user-wide revocation rejects previously issued tokens."""
+        user = UserFactory()
+        token = ClaimsRefreshToken.for_user(user)
+        token['iat'] -= 10
+
+        revoked_tokens.revoke_user(user)
+
+        assert revoked_tokens.is_revoked(token.payload)
+        assert not revoked_tokens.is_revoked(
+            ClaimsRefreshToken.for_user(user).payload)
+
+    def test_expired_entries_are_dropped(self):
+        """Test that expired revocations are pruned and purged."""
+        RevokedToken.objects.create(
+            jti='expired', expires_at=timezone.now() - timedelta(minutes=1))
+        revoked_tokens.sync(force=True)
+
+        assert 'expired' not in revoked_tokens.jtis
+        assert purge_expired_revocations() == 1
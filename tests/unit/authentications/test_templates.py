@@ -4,6 +4,10 @@ import pytest
 from django.template.loader import render_to_string
 from django.template import Context, Engine, Template, TemplateDoesNotExist
 from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.html import strip_tags
+from authentications.rendering import clear_email_template_cache, get_email_template
+from authentications.utils import VERIFICATION_FIELDS, VERIFICATION_TEMPLATE
 
 
 @pytest.mark.unit
@@ -100,3 +104,45 @@ class TestEmailTemplates:
         assert 'style=' in rendered
         assert 'class=' in rendered
         assert 'font-family' in rendered.lower()
+
+
+@pytest.mark.unit
+@pytest.mark.email
+class TestCompiledEmailTemplates:
+    """Unit tests for the precompiled email rendering layer."""
+
+    @pytest.mark.parametrize("first_name", ['David', 'O\'Brien & <Co>', ''])
+    def test_matches_django_rendering(self, first_name):
+        """Test compiled output is identical to render_to_string + strip_tags."""
+        context = {
+            'first_name': first_name,
+            'verification_url': 'http://test.com/verify-email/MQ/abc-123?x=1&y=2',
+            'email_address': 'david@example.com',
+            'plain_email_address': 'This message was sent to david @ example.com',
+        }
+        expected_html = render_to_string(VERIFICATION_TEMPLATE, context)
+
+        html, text = get_email_template(
+            VERIFICATION_TEMPLATE, VERIFICATION_FIELDS).render(context)
+
+        assert html == expected_html
+        assert text == strip_tags(expected_html)
+
+    def test_template_is_compiled_once(self):
+        """Test that repeated lookups reuse the compiled template."""
+        clear_email_template_cache()
+        first = get_email_template(VERIFICATION_TEMPLATE, VERIFICATION_FIELDS)
+        second = get_email_template(VERIFICATION_TEMPLATE, VERIFICATION_FIELDS)
+
+        assert first is second
+
+    def test_filtered_field_is_rejected(self, settings, tmp_path):
+        """Test that a field passed through a filter cannot be precompiled."""
+        (tmp_path / 'filtered.html').write_text('<p>{{ first_name|upper }}</p>')
+        settings.TEMPLATES = [{
+            'BACKEND': 'django.template.backends.django.DjangoTemplates',
+            'DIRS': [tmp_path],
+        }]
+
+        with pytest.raises(ImproperlyConfigured):
+            get_email_template('filtered.html', ('first_name',))
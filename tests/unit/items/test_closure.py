@@ -0,0 +1,128 @@
+# tests/unit/items/test_closure.py
+import pytest
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from items.closure import rebuild_closure
+from items.models import Item, ItemClosure, decode_path
+from tests.factories import ItemFactory
+
+
+def closure():
+    return set(ItemClosure.objects.values_list('ancestor_id', 'descendant_id', 'depth'))
+
+
+def expected_closure():
+    """The closure rows implied by the paths of every live item."""
+    rows = set()
+    for pk, path in Item.objects.active().values_list('pk', 'path'):
+        ancestors = decode_path(path) + [pk]
+        rows.update((ancestor, pk, len(ancestors) - 1 - index)
+                    for index, ancestor in enumerate(ancestors))
+    return rows
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestItemClosure:
+    """Tests for incremental and bulk maintenance of the closure table."""
+
+    def test_rows_on_create(self, tree):
+        """Test that each new item is linked to itself and every ancestor."""
+        story = tree['story']
+
+        assert closure() == expected_closure()
+        assert set(story.ancestor_links.values_list('ancestor_id', 'depth')) == {
+            (story.pk, 0), (tree['epic'].pk, 1), (tree['feature'].pk, 2),
+            (tree['project'].pk, 3), (tree['platform'].pk, 4)}
+
+    def test_set_queries(self, tree, django_assert_num_queries):
+        """Test that ancestors and descendants of several items take one query each."""
+        with django_assert_num_queries(1):
+            below = set(Item.objects.descendants_of([tree['epic'], tree['other']]))
+        with django_assert_num_queries(1):
+            above = set(Item.objects.ancestors_of(
+                Item.objects.filter(pk__in=[tree['story'].pk, tree['other'].pk])))
+
+        assert below == {tree['story']}
+        assert above == {tree[name] for name in ('platform', 'project', 'feature', 'epic')}
+
+    def test_move_relinks_subtree(self, tree):
+        """Test that a moved subtree is linked to its new ancestors only."""
+        tree['epic'].move_to(tree['other'])
+
+        assert closure() == expected_closure()
+        assert set(Item.objects.descendants_of(tree['other'])) == {
+            tree['epic'], tree['story']}
+        assert set(Item.objects.descendants_of(tree['feature'])) == set()
+
+    def test_move_to_root(self, tree):
+        """Test that a detached subtree keeps only its internal rows."""
+        tree['project'].move_to(None)
+
+        assert closure() == expected_closure()
+        assert not Item.objects.ancestors_of(tree['project']).exists()
+
+    def test_soft_delete(self, tree):
+        """Test that a soft-deleted subtree leaves the closure table."""
+        deleted = tree['feature'].soft_delete()
+
+        assert deleted == 3
+        assert closure() == expected_closure()
+        assert set(Item.objects.descendants_of(tree['project'])) == {tree['other']}
+        assert Item.objects.filter(deleted_at__isnull=False).count() == 3
+
+        with pytest.raises(ValidationError):
+            tree['other'].move_to(Item.objects.get(pk=tree['epic'].pk))
+
+    def test_restore(self, tree):
+        """Test that restoring a subtree rebuilds its rows."""
+        tree['feature'].soft_delete()
+        tree['feature'].restore()
+
+        assert Item.objects.active().count() == 6
+        assert closure() == expected_closure()
+
+    def test_restore_below_deleted_parent(self, tree):
+        """Test that an item cannot be restored while its parent is deleted."""
+        tree['feature'].soft_delete()
+        epic = Item.objects.get(pk=tree['epic'].pk)
+
+        with pytest.raises(ValidationError):
+            epic.restore()
+
+    def test_rebuild_after_bulk_create(self, tree):
+        """Test that a rebuild links items created without save()."""
+        epic = tree['epic']
+        Item.objects.bulk_create([
+            Item(organisation=epic.organisation, parent=epic, title=f'Bulk {n}',
+                 node_type=epic.node_type, path=epic.subtree_path, depth=epic.depth + 1)
+            for n in range(3)
+        ])
+
+        written = rebuild_closure()
+
+        assert closure() == expected_closure()
+        assert written == len(closure())
+
+    def test_rebuild_one_organisation(self, tree):
+        """Test that an organisation rebuild leaves other organisations alone."""
+        other = ItemFactory(parent=ItemFactory())
+        other_rows = set(ItemClosure.objects.filter(
+            descendant__organisation=other.organisation)
+            .values_list('ancestor_id', 'descendant_id', 'depth'))
+        ItemClosure.objects.filter(
+            descendant__organisation=tree['story'].organisation).delete()
+
+        rebuild_closure(organisation=tree['story'].organisation)
+
+        assert closure() == expected_closure()
+        assert other_rows <= closure()
+
+    def test_rebuild_command(self, tree):
+        """Test that the management command restores a wiped table."""
+        ItemClosure.objects.all().delete()
+
+        call_command('rebuild_item_closure', '--organisation',
+                     str(tree['story'].organisation_id))
+
+        assert closure() == expected_closure()
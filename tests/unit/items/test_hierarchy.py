@@ -0,0 +1,136 @@
+# tests/unit/items/test_hierarchy.py
+import pytest
+from django.core.exceptions import ValidationError
+from items.models import MAX_PATH_LENGTH, PATH_STEP, Item, NodeType, decode_path, encode_segment
+from tests.factories import ItemFactory
+
+
+@pytest.mark.unit
+class TestPathEncoding:
+    """Tests for the fixed-width path segments."""
+
+    def test_round_trip(self):
+        """Test that encoded ids decode back in order."""
+        ids = [1, 35, 36, 123456789, 36 ** PATH_STEP - 1]
+        path = ''.join(encode_segment(pk) for pk in ids)
+
+        assert len(path) == PATH_STEP * len(ids)
+        assert decode_path(path) == ids
+
+    def test_empty_path(self):
+        """Test that a root's path has no ancestors."""
+        assert decode_path('') == []
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestItemHierarchy:
+    """Tests for materialized path reads and moves."""
+
+    def test_paths_on_create(self, tree):
+        """Test that new items record their ancestors and depth."""
+        story = tree['story']
+
+        assert tree['platform'].path == ''
+        assert tree['platform'].depth == 0
+        assert story.depth == 4
+        assert decode_path(story.path) == [
+            tree[name].pk for name in ('platform', 'project', 'feature', 'epic')]
+
+    def test_create_without_reads(self, tree, django_assert_num_queries):
+        """Test that a child is created without reading or rewriting its path."""
+        # The item and its closure rows, inside a savepoint
+        with django_assert_num_queries(4):
+            Item.objects.create(organisation=tree['story'].organisation,
+                                parent=tree['story'], node_type=NodeType.TASK, title='Task')
+
+    def test_descendants_in_one_query(self, tree, django_assert_num_queries):
+        """Test that a subtree is loaded by a single prefix query."""
+        with django_assert_num_queries(1):
+            descendants = set(Item.objects.descendants(tree['project']))
+        with django_assert_num_queries(1):
+            subtree = set(Item.objects.subtree(tree['feature']))
+
+        assert descendants == {tree[name] for name in ('feature', 'epic', 'story', 'other')}
+        assert subtree == {tree[name] for name in ('feature', 'epic', 'story')}
+
+    def test_ancestors_in_one_query(self, tree, django_assert_num_queries):
+        """Test that ancestors are loaded root first by a single query."""
+        with django_assert_num_queries(1):
+            ancestors = list(Item.objects.ancestors(tree['story']))
+
+        assert ancestors == [tree[name] for name in ('platform', 'project', 'feature', 'epic')]
+
+    def test_depth_query(self, tree, django_assert_num_queries):
+        """Test that one level of an organisation is a single query."""
+        with django_assert_num_queries(1):
+            features = set(Item.objects.filter(
+                organisation=tree['project'].organisation, depth=2))
+
+        assert features == {tree['feature'], tree['other']}
+
+    def test_move_subtree_in_one_update(self, tree, django_assert_num_queries):
+        """Test that moving a subtree rewrites every path in one UPDATE."""
+        project = tree['project']
+        objective = ItemFactory(organisation=project.organisation,
+                                node_type=NodeType.OBJECTIVE, framework=project.framework)
+        platform = ItemFactory(parent=objective, node_type=NodeType.PLATFORM)
+
+        # The depth check, then in a savepoint one UPDATE and the closure relink
+        with django_assert_num_queries(6):
+            moved = project.move_to(platform)
+
+        assert moved == 5
+        epic = Item.objects.get(pk=tree['epic'].pk)
+        story = Item.objects.get(pk=tree['story'].pk)
+        assert Item.objects.get(pk=project.pk).parent_id == platform.pk
+        assert epic.parent_id == tree['feature'].pk
+        assert (epic.depth, story.depth) == (4, 5)
+        assert decode_path(story.path) == [
+            objective.pk, platform.pk, project.pk, tree['feature'].pk, epic.pk]
+        assert set(Item.objects.descendants(tree['platform'])) == set()
+
+    def test_move_between_siblings(self, tree):
+        """Test that a subtree moved to a sibling keeps its depths."""
+        tree['epic'].move_to(tree['other'])
+
+        story = Item.objects.get(pk=tree['story'].pk)
+        assert story.depth == 4
+        assert decode_path(story.path)[2:] == [tree['other'].pk, tree['epic'].pk]
+        assert set(Item.objects.descendants(tree['other'])) == {
+            tree['epic'], tree['story']}
+
+    def test_move_to_root(self, tree):
+        """Test that a subtree can be detached into a new root."""
+        tree['project'].move_to(None)
+
+        project = Item.objects.get(pk=tree['project'].pk)
+        story = Item.objects.get(pk=tree['story'].pk)
+        assert (project.parent_id, project.path, project.depth) == (None, '', 0)
+        assert story.depth == 3
+        assert decode_path(story.path) == [
+            project.pk, tree['feature'].pk, tree['epic'].pk]
+
+    def test_move_below_itself(self, tree):
+        """Test that an item cannot be moved into its own subtree."""
+        with pytest.raises(ValidationError):
+            tree['feature'].move_to(tree['story'])
+        with pytest.raises(ValidationError):
+            tree['feature'].move_to(tree['feature'])
+
+    def test_move_to_another_organisation(self, tree):
+        """Test that items cannot be moved between organisations."""
+        with pytest.raises(ValidationError):
+            tree['feature'].move_to(ItemFactory())
+
+    def test_move_too_deep(self, tree):
+        """Test that a move is refused when paths would overflow."""
+        other = tree['other']
+        # Only the length of the new parent's path matters
+        deep = Item.objects.bulk_create([Item(
+            organisation=other.organisation, parent=other, node_type=NodeType.FEATURE,
+            framework=other.framework, path='0' * (MAX_PATH_LENGTH - 2 * PATH_STEP),
+            depth=other.depth)])[0]
+
+        with pytest.raises(ValidationError, match='too deep'):
+            tree['epic'].move_to(deep)
@@ -0,0 +1,173 @@
+# tests/unit/items/test_hierarchy_rules.py
+from types import SimpleNamespace
+
+import pytest
+from django.core.exceptions import ValidationError
+from items.hierarchy import (
+    DENIED, RULES, HierarchyMatrix, HierarchyRule, hierarchy_matrix, organisation_flags, placement_error,
+)
+from items.models import Item, NodeType
+from organisations.models import ProjectFramework, SubscriptionTier
+from organisations.tiers import get_tier_policy
+from tests.factories import ItemFactory, OrganisationFactoryTier
+
+STR, PRO, BUS, ENT = (SubscriptionTier.STARTER, SubscriptionTier.PRO,
+                      SubscriptionTier.BUSINESS, SubscriptionTier.ENTERPRISE)
+KAN, SCR, WAT = ProjectFramework.KANBAN, ProjectFramework.SCRUM, ProjectFramework.WATERFALL
+
+
+def organisation(tier, **flags):
+    """An unsaved organisation with its tier's forced flags, plus ``flags``."""
+    values = dict.fromkeys(('enable_objective_layer', 'enable_platform_layer',
+                            'enable_scrum_hierarchy', 'enable_waterfall'), False)
+    values.update(get_tier_policy(tier).forced_features)
+    values.update(flags)
+    return SimpleNamespace(subscription_tier=tier, **values)
+
+
+# (tier, methodology, extra flags, parent type, child type, allowed)
+PLACEMENTS = [
+    # Starter: Kanban projects hold work items directly
+    (STR, KAN, {}, None, NodeType.PROJECT, True),
+    (STR, KAN, {}, NodeType.PROJECT, NodeType.TASK, True),
+    (STR, KAN, {}, NodeType.PROJECT, NodeType.FEATURE, False),
+    (STR, KAN, {}, None, NodeType.PLATFORM, False),
+    (STR, KAN, {}, NodeType.PROJECT, NodeType.SPIKE, False),
+    # Pro: features and epics, advanced items under epics
+    (PRO, KAN, {}, NodeType.PROJECT, NodeType.TASK, False),
+    (PRO, KAN, {}, NodeType.PROJECT, NodeType.FEATURE, True),
+    (PRO, KAN, {}, NodeType.EPIC, NodeType.SPIKE, True),
+    (PRO, KAN, {}, NodeType.EPIC, NodeType.DEFECT, False),
+    (PRO, KAN, {}, None, NodeType.OBJECTIVE, False),
+    (PRO, KAN, {'enable_objective_layer': True}, None, NodeType.OBJECTIVE, True),
+    (PRO, KAN, {'enable_objective_layer': True}, NodeType.OBJECTIVE, NodeType.PROJECT, True),
+    (PRO, KAN, {'enable_objective_layer': True}, NodeType.OBJECTIVE, NodeType.PLATFORM, False),
+    (PRO, SCR, {}, NodeType.EPIC, NodeType.USER_STORY, True),
+    (PRO, SCR, {}, NodeType.USER_STORY, NodeType.TASK, True),
+    (PRO, SCR, {}, NodeType.EPIC, NodeType.TASK, False),
+    (PRO, SCR, {}, NodeType.PROJECT, NodeType.SPRINT_BUG, True),
+    (PRO, WAT, {}, NodeType.PROJECT, NodeType.DESIGN_PHASE, False),
+    (PRO, WAT, {'enable_waterfall': True}, NodeType.PROJECT, NodeType.DESIGN_PHASE, False),
+    # Business: platforms and business items
+    (BUS, KAN, {}, None, NodeType.PLATFORM, True),
+    (BUS, KAN, {}, NodeType.OBJECTIVE, NodeType.PLATFORM, True),
+    (BUS, KAN, {}, NodeType.PLATFORM, NodeType.PROJECT, True),
+    (BUS, KAN, {}, NodeType.EPIC, NodeType.SUPPORT_TICKET, True),
+    (BUS, SCR, {}, NodeType.EPIC, NodeType.SUPPORT_TICKET, False),
+    (BUS, SCR, {}, NodeType.PLATFORM, NodeType.PROJECT, True),
+    (BUS, WAT, {}, NodeType.PROJECT, NodeType.DESIGN_PHASE, False),
+    (BUS, WAT, {'enable_waterfall': True}, NodeType.PROJECT, NodeType.DESIGN_PHASE, True),
+    # Enterprise: Waterfall phases and their items
+    (ENT, WAT, {}, NodeType.PROJECT, NodeType.REQUIREMENTS_PHASE, True),
+    (ENT, WAT, {}, NodeType.REQUIREMENTS_PHASE, NodeType.CHANGE_REQUEST, True),
+    (ENT, WAT, {}, NodeType.TESTING_PHASE, NodeType.BUG, True),
+    (ENT, WAT, {}, NodeType.DESIGN_PHASE, NodeType.BUG, False),
+    (ENT, WAT, {}, NodeType.PROJECT, NodeType.FEATURE, False),
+    (ENT, KAN, {}, NodeType.PROJECT, NodeType.DESIGN_PHASE, False),
+]
+
+
+@pytest.mark.unit
+class TestHierarchyMatrix:
+    """Tests for the compiled methodology x tier placement rules."""
+
+    @pytest.mark.parametrize('tier, methodology, flags, parent, child, allowed', PLACEMENTS)
+    def test_placements(self, tier, methodology, flags, parent, child, allowed):
+        """Test each documented placement against the compiled matrix."""
+        org = organisation(tier, **flags)
+
+        assert hierarchy_matrix().allows(
+            methodology, tier, parent, child, organisation_flags(org)) is allowed
+        assert (placement_error(org, parent, child, methodology) is None) is allowed
+
+    def test_matrix_matches_rules(self):
+        """Test that every placement a rule grants is allowed, and little else."""
+        matrix = hierarchy_matrix()
+        for rule in RULES:
+            for methodology in rule.methodologies:
+                for tier in rule.tiers:
+                    for parent in rule.parents:
+                        for child in rule.children:
+                            assert matrix.required_flags(
+                                methodology, tier, parent, child) != DENIED
+
+        cells = sum(cell != DENIED for cell in matrix.cells)
+        assert 0 < cells < len(matrix.cells) / 10
+
+    def test_overlapping_rules(self):
+        """Test that the least demanding of overlapping rules applies."""
+        rules = RULES + (HierarchyRule(
+            frozenset({KAN}), (NodeType.PLATFORM,), (NodeType.PROJECT,)),)
+        matrix = HierarchyMatrix(rules)
+
+        assert matrix.required_flags(KAN, BUS, NodeType.PLATFORM, NodeType.PROJECT) == 0
+
+    def test_unknown_type(self):
+        """Test that unknown types are denied rather than raising."""
+        assert hierarchy_matrix().required_flags(KAN, STR, None, 'XXX') == DENIED
+
+    def test_methodology_not_on_tier(self):
+        """Test that tier policies still limit methodologies, even with flags on."""
+        org = organisation(STR, enable_scrum_hierarchy=True)
+
+        assert placement_error(org, None, NodeType.PROJECT, SCR) is not None
+
+    def test_error_names_missing_flag(self):
+        """Test that placements needing a disabled flag say which."""
+        error = placement_error(organisation(PRO), None, NodeType.OBJECTIVE, KAN)
+
+        assert 'enable_objective_layer' in str(error)
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestItemPlacement:
+    """Tests for rule enforcement on item create and move."""
+
+    def test_create_rejected(self):
+        """Test that an item cannot be created where the rules forbid it."""
+        project = ItemFactory()
+
+        with pytest.raises(ValidationError) as excinfo:
+            ItemFactory(parent=project, node_type=NodeType.FEATURE)
+
+        assert 'node_type' in excinfo.value.message_dict
+        assert not Item.objects.filter(node_type=NodeType.FEATURE).exists()
+
+    def test_framework_inherited(self):
+        """Test that children take their parent's methodology."""
+        organisation = OrganisationFactoryTier.enterprise()
+        project = ItemFactory(organisation=organisation, framework=WAT)
+
+        phase = ItemFactory(parent=project, node_type=NodeType.TESTING_PHASE)
+
+        assert ItemFactory(organisation=organisation).framework == organisation.default_framework
+        assert phase.framework == WAT
+
+    def test_framework_mismatch(self):
+        """Test that a child below project level cannot switch methodology."""
+        organisation = OrganisationFactoryTier.enterprise()
+        project = ItemFactory(organisation=organisation, framework=WAT)
+
+        with pytest.raises(ValidationError) as excinfo:
+            ItemFactory(parent=project, node_type=NodeType.FEATURE, framework=SCR)
+
+        assert 'framework' in excinfo.value.message_dict
+
+    def test_move_rejected(self, tree):
+        """Test that a move is checked against the rules before any write."""
+        with pytest.raises(ValidationError):
+            tree['story'].move_to(tree['feature'])
+
+        story = Item.objects.get(pk=tree['story'].pk)
+        assert story.parent_id == tree['epic'].pk
+        assert tree['story'].parent_id == tree['epic'].pk
+
+    def test_validation_without_queries(self, tree, django_assert_num_queries):
+        """Test that validating a placement needs no queries."""
+        item = Item(organisation=tree['story'].organisation, parent=tree['story'],
+                    node_type=NodeType.TASK, title='Task', framework=SCR)
+        item.set_parent(tree['story'])
+
+        with django_assert_num_queries(0):
+            item.clean()
@@ -0,0 +1,123 @@
+# tests/unit/organisations/test_audit.py
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.utils import timezone
+from organisations.audit import (
+    AuditBatch, decode_cursor, events_page, purge_expired_events, record_event,
+)
+from organisations.models import AuditEvent
+from tests.factories import AuditEventFactory, OrganisationFactory
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestAuditEvents:
+    """Tests for recording, paging and purging audit events."""
+
+    def test_factory_records_creation(self):
+        """Test that new organisations get a 'created' event."""
+        organisation = OrganisationFactory()
+
+        assert list(organisation.audit_events.values_list('action', flat=True)) == ['created']
+
+    def test_record_event_does_not_touch_organisation(self, django_assert_num_queries):
+        """Test that recording an event is a single insert."""
+        organisation = OrganisationFactory()
+
+        with django_assert_num_queries(1):
+            record_event(organisation, 'tier_changed', actor='admin@example.com',
+                         old='STR', new='PRO')
+
+        event = organisation.audit_events.get(action='tier_changed')
+        assert event.data == {'old': 'STR', 'new': 'PRO'}
+
+    def test_batch_writes_in_bulk(self, django_assert_num_queries):
+        """Test that buffered events are written with batched inserts."""
+        organisations = [OrganisationFactory(audit_event=None) for _ in range(5)]
+
+        with django_assert_num_queries(2):
+            with AuditBatch(batch_size=3) as audit:
+                for organisation in organisations:
+                    audit.add(organisation, 'suspended')
+
+        assert audit.written == 5
+        assert AuditEvent.objects.filter(action='suspended').count() == 5
+
+    def test_keyset_pagination(self):
+        """Test that pages walk the history newest first without overlap."""
+        organisation = OrganisationFactory(audit_event=None)
+        start = timezone.now()
+        for n in range(7):
+            # Pairs of events share a timestamp to exercise the id tie-break
+            AuditEventFactory(organisation=organisation, action=f'action{n}',
+                              occurred_at=start + timedelta(minutes=n // 2))
+
+        seen = []
+        cursor = None
+        while True:
+            page, cursor = events_page(organisation, cursor=cursor, limit=3)
+            seen.extend(event.action for event in page)
+            if cursor is None:
+                break
+
+        assert seen == [f'action{n}' for n in (6, 5, 4, 3, 2, 1, 0)]
+
+    def test_invalid_cursor(self):
+        """Test that malformed cursors are rejected."""
+        with pytest.raises(ValueError):
+            decode_cursor('not-a-cursor')
+
+    def test_purge_honours_retention_policy(self):
+        """Test that only events past each organisation's retention are purged."""
+        old = timezone.now() - timedelta(days=45)
+        short = OrganisationFactory(audit_event=None,
+                                    data_retention_policy={'audit_logs_days': 30})
+        keep_forever = OrganisationFactory(audit_event=None,
+                                           data_retention_policy={'user_data_years': 7})
+        for organisation in (short, keep_forever):
+            AuditEventFactory(organisation=organisation, occurred_at=old)
+            AuditEventFactory(organisation=organisation)
+
+        deleted = purge_expired_events(batch_size=1)
+
+        assert deleted == 1
+        assert short.audit_events.count() == 1
+        assert keep_forever.audit_events.count() == 2
+
+
+@pytest.mark.unit
+@pytest.mark.django_db(transaction=True)
+class TestAuditLogMigration:
+    """Tests for moving audit_logs arrays into the audit table."""
+
+    def migrate(self, target):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate([target])
+        return executor.loader.project_state([target]).apps
+
+    def test_arrays_are_copied(self):
+        """Test that existing array entries become audit events."""
+        apps = self.migrate(('organisations', '0002_auditevent'))
+        User = apps.get_model('authentications', 'CustomUser')
+        Organisation = apps.get_model('organisations', 'Organisation')
+        owner = User.objects.create(email='owner@example.com')
+        Organisation.objects.create(
+            name='Legacy', owner=owner, owner_email=owner.email,
+            audit_logs=[
+                {'timestamp': '2024-01-02T03:04:05+00:00', 'action': 'created',
+                 'actor': 'system', 'details': 'Organisation created'},
+                {'action': 'renamed', 'actor': 'admin@example.com', 'old': 'Old'},
+                'free text entry',
+            ])
+
+        apps = self.migrate(('organisations', '0004_remove_organisation_audit_logs'))
+
+        events = apps.get_model('organisations', 'AuditEvent').objects.order_by('id')
+        assert [event.action for event in events] == ['created', 'renamed', 'legacy']
+        assert events[0].occurred_at.year == 2024
+        assert events[1].data == {'old': 'Old'}
+        assert events[2].details == 'free text entry'
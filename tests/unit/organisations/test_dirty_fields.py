@@ -0,0 +1,107 @@
+# tests/unit/organisations/test_dirty_fields.py
+import pytest
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+from organisations.models import Organisation, SubscriptionTier
+from tests.factories import OrganisationFactory
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestOrganisationDirtyTracking:
+    """Tests for saving only the fields that changed."""
+
+    def test_renewal_date_update_is_one_update(self, django_assert_num_queries):
+        """Test that changing the renewal date costs a single narrow UPDATE."""
+        organisation = Organisation.objects.get(pk=OrganisationFactory().pk)
+        organisation.renewal_date = timezone.now()
+
+        with django_assert_num_queries(1) as queries:
+            organisation.save()
+
+        sql = queries.captured_queries[0]['sql']
+        assert sql.startswith('UPDATE')
+        assert 'renewal_date' in sql and 'updated_at' in sql
+        assert 'audit' not in sql and 'role_hierarchy' not in sql
+
+    def test_unchanged_save_writes_nothing(self, django_assert_num_queries):
+        """Test that saving an unchanged organisation skips the database."""
+        organisation = OrganisationFactory()
+
+        with django_assert_num_queries(0):
+            organisation.save()
+
+    def test_tracks_fields_changed_since_load(self):
+        """Test dirty detection, including in-place JSON changes."""
+        organisation = Organisation.objects.get(pk=OrganisationFactory().pk)
+        assert organisation.get_dirty_fields() == set()
+
+        organisation.name = 'Renamed'
+        organisation.role_hierarchy['viewer'] = ['read']
+
+        assert organisation.get_dirty_fields() == {'name', 'role_hierarchy'}
+        organisation.save()
+        assert organisation.get_dirty_fields() == set()
+
+    def test_tier_change_applies_policy(self):
+        """Test that tier side effects run and are saved when the tier changes."""
+        organisation = OrganisationFactory()
+        organisation.subscription_tier = SubscriptionTier.BUSINESS
+
+        organisation.save()
+
+        organisation = Organisation.objects.get(pk=organisation.pk)
+        assert organisation.storage_limit == 102400
+        assert organisation.enable_platform_layer
+
+    def test_policy_fields_cannot_bypass_tier(self):
+        """Test that a save cannot lift the limits and flags of the tier."""
+        organisation = Organisation.objects.get(
+            pk=OrganisationFactory(subscription_tier=SubscriptionTier.STARTER).pk)
+        organisation.storage_limit = 10 ** 9
+        organisation.enable_waterfall = True
+        organisation.enable_platform_layer = True
+
+        organisation.save()
+
+        organisation = Organisation.objects.get(pk=organisation.pk)
+        assert organisation.storage_limit == 10240
+        assert not organisation.enable_waterfall
+        assert not organisation.enable_platform_layer
+
+    def test_policy_applies_to_update_fields(self):
+        """Test that explicit update_fields are held to the tier too."""
+        organisation = OrganisationFactory(subscription_tier=SubscriptionTier.STARTER)
+        organisation.enable_waterfall = True
+
+        organisation.save(update_fields=['enable_waterfall'])
+
+        assert not Organisation.objects.get(pk=organisation.pk).enable_waterfall
+
+    def test_changed_fields_are_still_validated(self):
+        """Test that model rules still apply to changed fields."""
+        organisation = OrganisationFactory()
+        organisation.allowed_domains = ['example.com']
+
+        with pytest.raises(ValidationError):
+            organisation.save()
+
+    def test_owner_uniqueness_checked_when_owner_changes(self):
+        """Test that the owner one-to-one is validated only when it changes."""
+        first, second = OrganisationFactory(), OrganisationFactory()
+        second.owner = first.owner
+
+        with pytest.raises(ValidationError) as excinfo:
+            second.save()
+
+        assert 'owner' in excinfo.value.message_dict
+
+    def test_partial_update_fields_keep_other_changes_dirty(self):
+        """Test that fields left out of update_fields stay dirty."""
+        organisation = OrganisationFactory()
+        organisation.name = 'Renamed'
+        organisation.billing_contact = 'billing@example.com'
+
+        organisation.save(update_fields=['name'])
+
+        assert organisation.get_dirty_fields() == {'billing_contact'}
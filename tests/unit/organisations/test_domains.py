@@ -0,0 +1,92 @@
+# tests/unit/organisations/test_domains.py
+import pytest
+from django.core.exceptions import ValidationError
+from authentications.tokens import Role, token_claims
+from organisations.domains import domain_registry, join_organisation_by_domain
+from organisations.models import Organisation, OrganisationDomain, SubscriptionTier
+from tests.factories import OrganisationFactory, OrganisationFactoryTier, UserFactory
+
+
+def domains_of(organisation):
+    return set(organisation.domains.values_list('domain', flat=True))
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestOrganisationDomains:
+    """Tests for the domain table and its in-memory map."""
+
+    def test_domains_follow_allowed_domains(self, django_capture_on_commit_callbacks):
+        """Test that saving allowed_domains adds and removes domain rows."""
+        with django_capture_on_commit_callbacks(execute=True):
+            organisation = OrganisationFactory(
+                subscription_tier=SubscriptionTier.ENTERPRISE,
+                allowed_domains=['Acme.com', '@acme.io'])
+        assert domains_of(organisation) == {'acme.com', 'acme.io'}
+
+        with django_capture_on_commit_callbacks(execute=True):
+            organisation.allowed_domains = ['acme.io', 'acme.org']
+            organisation.save()
+
+        assert domains_of(organisation) == {'acme.io', 'acme.org'}
+        assert domain_registry.get('ACME.org') == organisation.pk
+        assert domain_registry.get('acme.com') is None
+
+    def test_unrelated_saves_skip_domain_sync(self, django_assert_num_queries):
+        """Test that saves not touching allowed_domains cost no domain queries."""
+        organisation = OrganisationFactoryTier.enterprise()
+        organisation.name = 'Renamed'
+
+        with django_assert_num_queries(1):
+            organisation.save()
+
+    def test_domain_claimed_by_another_organisation(self):
+        """Test that two organisations cannot claim the same domain."""
+        OrganisationFactoryTier.enterprise()
+
+        with pytest.raises(ValidationError) as excinfo:
+            OrganisationFactory(subscription_tier=SubscriptionTier.ENTERPRISE,
+                                allowed_domains=['EXAMPLE.com'])
+
+        assert 'example.com' in str(excinfo.value.message_dict['allowed_domains'])
+        assert Organisation.objects.count() == 1
+
+    def test_invalid_domain_rejected(self):
+        """Test that allowed_domains entries must be domain names."""
+        with pytest.raises(ValidationError) as excinfo:
+            OrganisationFactory(subscription_tier=SubscriptionTier.ENTERPRISE,
+                                allowed_domains=['not a domain'])
+
+        assert 'allowed_domains' in excinfo.value.message_dict
+
+    def test_deleting_organisation_frees_domains(self, django_capture_on_commit_callbacks):
+        """Test that the domain map forgets a deleted organisation."""
+        organisation = OrganisationFactoryTier.enterprise()
+        assert domain_registry.get('example.com') == organisation.pk
+
+        with django_capture_on_commit_callbacks(execute=True):
+            organisation.delete()
+
+        assert domain_registry.get('example.com') is None
+        assert not OrganisationDomain.objects.exists()
+
+    def test_unknown_domain_skips_database(self, django_assert_num_queries):
+        """Test that a domain nobody owns is rejected from memory."""
+        OrganisationFactoryTier.enterprise()
+        user = UserFactory(email='someone@elsewhere.com')
+        domain_registry.get('warm.up')
+
+        with django_assert_num_queries(0):
+            assert join_organisation_by_domain(user) is None
+
+    def test_member_gets_organisation_claims(self):
+        """Test that a user who joined by domain carries the organisation in tokens."""
+        organisation = OrganisationFactoryTier.enterprise()
+        user = UserFactory(email='staff@example.com')
+
+        assert join_organisation_by_domain(user) == organisation
+        user.refresh_from_db()
+
+        claims = token_claims(user)
+        assert claims['organisation_id'] == str(organisation.pk)
+        assert claims['role'] == Role.MEMBER
@@ -0,0 +1,132 @@
+# tests/unit/organisations/test_lifecycle.py
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+import pytest
+from django.core.management import call_command
+from organisations.lifecycle import add_months, next_period, sweep_subscriptions
+from organisations.models import (
+    AuditEvent, BillingInterval, PaymentStatus, Subscription, SubscriptionStatus,
+)
+from tests.factories import OrganisationFactory, SubscriptionFactory
+
+NOW = datetime(2026, 3, 15, 12, 0, tzinfo=dt_timezone.utc)
+
+
+def due_subscription(status=SubscriptionStatus.ACTIVE, payment_status=PaymentStatus.ACTIVE,
+                     **kwargs):
+    start = kwargs.pop('start_date', NOW - timedelta(days=40))
+    kwargs.setdefault('current_period_start', start)
+    kwargs.setdefault('current_period_end', start + timedelta(days=30))
+    return SubscriptionFactory(
+        organisation=OrganisationFactory(payment_status=payment_status),
+        status=status,
+        start_date=start,
+        **kwargs,
+    )
+
+
+@pytest.mark.unit
+class TestBillingPeriods:
+    """Tests for billing period arithmetic."""
+
+    def test_add_months_clamps_to_month_end(self):
+        """Test that the 31st rolls back to the last day of shorter months."""
+        jan_31 = datetime(2026, 1, 31, tzinfo=dt_timezone.utc)
+        assert add_months(jan_31, 1).date().isoformat() == '2026-02-28'
+        assert add_months(jan_31, 13).date().isoformat() == '2027-02-28'
+
+    def test_next_period_keeps_billing_day(self):
+        """Test that periods are counted from the anchor, not the last end."""
+        anchor = datetime(2025, 10, 31, tzinfo=dt_timezone.utc)
+        start, end = next_period(anchor, BillingInterval.MONTHLY, NOW)
+        assert start.date().isoformat() == '2026-02-28'
+        assert end.date().isoformat() == '2026-03-31'
+
+    def test_next_period_annual(self):
+        """Test annual periods after several missed renewals."""
+        anchor = datetime(2022, 6, 1, tzinfo=dt_timezone.utc)
+        start, end = next_period(anchor, BillingInterval.ANNUAL, NOW)
+        assert (start.year, end.year) == (2025, 2026)
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestSubscriptionSweeper:
+    """Tests for the subscription lifecycle sweeper."""
+
+    def test_trial_end_activates_paid_subscription(self):
+        """Test that an ended trial becomes active with a new period."""
+        trial_end = NOW - timedelta(days=2)
+        subscription = due_subscription(
+            status=SubscriptionStatus.TRIALING, trial_end=trial_end,
+            current_period_end=trial_end)
+
+        assert sweep_subscriptions(NOW) == {'activated': 1}
+
+        subscription.refresh_from_db()
+        assert subscription.status == SubscriptionStatus.ACTIVE
+        assert subscription.current_period_start == trial_end
+        assert subscription.current_period_end == add_months(trial_end, 1)
+        assert subscription.organisation.renewal_date == subscription.current_period_end
+
+    def test_unpaid_subscriptions_become_past_due(self):
+        """Test that trials and periods ending without payment go past due."""
+        trial = due_subscription(
+            status=SubscriptionStatus.TRIALING, trial_end=NOW - timedelta(days=1),
+            payment_status=PaymentStatus.OVERDUE)
+        active = due_subscription(payment_status=PaymentStatus.OVERDUE)
+
+        assert sweep_subscriptions(NOW) == {'past_due': 2}
+
+        statuses = Subscription.objects.filter(
+            pk__in=[trial.pk, active.pk]).values_list('status', flat=True)
+        assert set(statuses) == {SubscriptionStatus.PAST_DUE}
+
+    def test_period_end_renews(self):
+        """Test that an ended period renews and moves the renewal date."""
+        subscription = due_subscription()
+        old_end = subscription.current_period_end
+
+        assert sweep_subscriptions(NOW) == {'renewed': 1}
+
+        subscription.refresh_from_db()
+        assert subscription.current_period_start == old_end
+        assert subscription.current_period_end > NOW
+        assert subscription.organisation.renewal_date == subscription.current_period_end
+        assert AuditEvent.objects.filter(
+            organisation=subscription.organisation, action='subscription_renewed').exists()
+
+    def test_cancelled_subscription_ends_at_period_end(self):
+        """Test that a requested cancellation takes effect at the period end."""
+        subscription = due_subscription(cancelled_at=NOW - timedelta(days=20))
+
+        assert sweep_subscriptions(NOW) == {'cancelled': 1}
+
+        subscription.refresh_from_db()
+        assert subscription.status == SubscriptionStatus.CANCELLED
+        assert subscription.organisation.renewal_date is None
+
+    def test_subscriptions_not_due_are_untouched(self):
+        """Test that current periods and other statuses are left alone."""
+        SubscriptionFactory(current_period_start=NOW, current_period_end=NOW + timedelta(days=30))
+        due_subscription(status=SubscriptionStatus.SUSPENDED)
+
+        assert sweep_subscriptions(NOW) == {}
+
+    def test_sweep_is_idempotent_across_chunks(self, django_assert_max_num_queries):
+        """Test chunked sweeping, and that a second run finds nothing to do."""
+        for _ in range(5):
+            due_subscription()
+
+        assert sweep_subscriptions(NOW, chunk_size=2) == {'renewed': 5}
+        # One empty claim per sweep, each wrapped in a savepoint
+        with django_assert_max_num_queries(6):
+            assert sweep_subscriptions(NOW, chunk_size=2) == {}
+
+    def test_command_reports_outcomes(self, capsys):
+        """Test the management command entry point."""
+        due_subscription()
+
+        call_command('sweep_subscriptions', '--chunk-size', '10')
+
+        assert 'Swept subscriptions: 1 renewed.' in capsys.readouterr().out
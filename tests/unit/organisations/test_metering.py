@@ -0,0 +1,123 @@
+# tests/unit/organisations/test_metering.py
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+import pytest
+from django.core.management import call_command
+from organisations import metering
+from organisations.metering import (
+    MISSING, record_samples, rollup_usage, sample_usage, unpack, usage_points,
+    usage_summary,
+)
+from organisations.models import UsageMetric, UsageResolution, UsageSeries
+from organisations.usage import record_usage, usage_meter
+from tests.factories import OrganisationFactory, SubscriptionFactory
+
+DAY = datetime(2026, 5, 10, tzinfo=dt_timezone.utc)
+
+
+def hourly(organisation, metric, day, values):
+    return [(organisation.pk, metric, day + timedelta(hours=hour), value)
+            for hour, value in values.items()]
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def aggregation(request, monkeypatch):
+    """Run a test against the NumPy aggregation and the pure Python fallback."""
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(metering, 'np', None)
+    return request.param
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestUsageMetering:
+    """Tests for packed usage history."""
+
+    def test_samples_pack_into_one_row_per_day(self):
+        """Test that a day of hourly samples is a single 24-slot row."""
+        organisation = OrganisationFactory()
+
+        stored = record_samples(hourly(organisation, UsageMetric.ITEMS, DAY,
+                                       {hour: hour * 10 for hour in range(24)}))
+
+        row = UsageSeries.objects.get()
+        assert stored == 24
+        assert (row.resolution, row.period_start) == (UsageResolution.HOURLY, DAY.date())
+        assert list(unpack(row.values)) == [hour * 10 for hour in range(24)]
+
+    def test_later_samples_merge_into_existing_rows(self, django_assert_num_queries):
+        """Test batched merging: new hours fill slots, repeated hours replace them."""
+        organisation = OrganisationFactory()
+        record_samples(hourly(organisation, UsageMetric.USERS, DAY, {0: 1, 1: 2}))
+
+        samples = hourly(organisation, UsageMetric.USERS, DAY, {1: 5, 2: 7})
+        samples += hourly(organisation, UsageMetric.USERS, DAY + timedelta(days=1), {0: 9})
+        # Create, lock and update, inside one savepoint
+        with django_assert_num_queries(5):
+            record_samples(samples)
+
+        today, tomorrow = UsageSeries.objects.order_by('period_start')
+        assert list(unpack(today.values))[:4] == [1, 5, 7, MISSING]
+        assert unpack(tomorrow.values)[0] == 9
+
+    def test_range_summary(self, aggregation):
+        """Test aggregation over a range that cuts through a day."""
+        organisation = OrganisationFactory()
+        record_samples(hourly(organisation, UsageMetric.STORAGE, DAY,
+                              {0: 100, 6: 400, 12: 300, 18: 200}))
+
+        summary = usage_summary(organisation, UsageMetric.STORAGE,
+                                DAY + timedelta(hours=1), DAY + timedelta(hours=18))
+
+        assert summary == {'samples': 2, 'min': 300, 'max': 400, 'mean': 350.0, 'latest': 300}
+        assert usage_summary(organisation, UsageMetric.ITEMS, DAY, DAY)['samples'] == 0
+
+    def test_rollup_keeps_daily_peaks(self, aggregation):
+        """Test that old hourly rows become daily peaks in a monthly row."""
+        organisation = OrganisationFactory()
+        for offset, peak in enumerate([50, 80]):
+            record_samples(hourly(organisation, UsageMetric.ITEMS, DAY + timedelta(days=offset),
+                                  {3: peak - 10, 9: peak}))
+        recent = DAY + timedelta(days=100)
+        record_samples(hourly(organisation, UsageMetric.ITEMS, recent, {0: 90}))
+
+        assert rollup_usage(now=recent) == 2
+        assert rollup_usage(now=recent) == 0
+
+        daily = UsageSeries.objects.get(resolution=UsageResolution.DAILY)
+        assert daily.period_start == DAY.date().replace(day=1)
+        assert list(unpack(daily.values))[9:12] == [50, 80, MISSING]
+        assert UsageSeries.objects.filter(resolution=UsageResolution.HOURLY).count() == 1
+
+        times, values = usage_points(organisation, UsageMetric.ITEMS, DAY, recent + timedelta(days=1))
+        assert list(values) == [50, 80, 90]
+        assert int(times[0]) == int(DAY.timestamp())
+
+    def test_sample_usage_records_current_usage(self, aggregation):
+        """Test sampling folded usage, shards and unflushed deltas together."""
+        subscription = SubscriptionFactory(current_item_count=10)
+        record_usage(subscription, UsageMetric.ITEMS, 5)
+        usage_meter.flush()
+        record_usage(subscription, UsageMetric.ITEMS, 2)
+
+        try:
+            assert sample_usage(now=DAY, batch_size=1) == 3
+        finally:
+            usage_meter.pending.clear()
+            usage_meter.pending_count = 0
+
+        summary = usage_summary(subscription.organisation, UsageMetric.ITEMS,
+                                DAY, DAY + timedelta(hours=1))
+        assert summary['latest'] == 17
+
+    def test_command_samples_and_rolls_up(self, capsys):
+        """Test the hourly management command."""
+        SubscriptionFactory()
+
+        call_command('sample_usage')
+
+        output = capsys.readouterr().out
+        assert 'Recorded 3 usage sample(s).' in output
+        assert 'Rolled up 0 day(s)' in output
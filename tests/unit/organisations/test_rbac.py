@@ -0,0 +1,154 @@
+# tests/unit/organisations/test_rbac.py
+import copy
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework.views import APIView
+from authentications.tokens import ClaimsRefreshToken, ClaimsTokenUser
+from organisations.models import OrganisationMember
+from organisations.permissions import HasOrganisationPermission
+from organisations.rbac import OWNER, CompiledHierarchy, organisation_role, rbac
+from tests.factories import OrganisationFactory, UserFactory
+
+HIERARCHY = {
+    'admin': ['manager', 'billing'],
+    'manager': ['user', 'write'],
+    'user': ['read'],
+}
+
+
+def token_user(user):
+    return ClaimsTokenUser(ClaimsRefreshToken.for_user(user).access_token)
+
+
+class ItemsView(APIView):
+    permission_classes = [HasOrganisationPermission]
+    required_permissions = {'DELETE': ('write', 'billing')}
+
+    def get(self, request):
+        return Response({})
+
+    def post(self, request):
+        return Response({})
+
+    def delete(self, request):
+        return Response({})
+
+
+@pytest.mark.unit
+class TestCompiledHierarchy:
+    """Tests for compiling role hierarchies to bitmasks."""
+
+    def test_roles_inherit_permissions(self):
+        """Test that each role holds its own and inherited permissions."""
+        compiled = CompiledHierarchy(HIERARCHY)
+
+        assert compiled.allows('admin', ('read', 'write', 'billing'))
+        assert compiled.allows('manager', ('read', 'write'))
+        assert not compiled.allows('manager', ('billing',))
+        assert compiled.allows('user', ('read',))
+        assert not compiled.allows('user', ('write',))
+
+    def test_unknown_roles_and_permissions_are_denied(self):
+        """Test that nothing is granted for names the hierarchy lacks."""
+        compiled = CompiledHierarchy(HIERARCHY)
+
+        assert not compiled.allows('guest', ('read',))
+        assert not compiled.allows('admin', ('read', 'delete_everything'))
+        assert compiled.allows('guest', ())
+
+    def test_cycles_share_permissions(self):
+        """Test that roles inheriting each other terminate and share grants."""
+        compiled = CompiledHierarchy({'a': ['b', 'x'], 'b': ['a', 'y']})
+
+        assert compiled.allows('a', ('x', 'y'))
+        assert compiled.allows('b', ('x', 'y'))
+
+    def test_malformed_entries_are_ignored(self):
+        """Test that non-list roles and non-string entries grant nothing."""
+        compiled = CompiledHierarchy({'user': ['read', 3, None], 'odd': 'read'})
+
+        assert compiled.allows('user', ('read',))
+        assert not compiled.allows('odd', ('read',))
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestRBACEvaluator:
+    """Tests for roles, the compiled cache and the DRF permission."""
+
+    def test_recompiles_when_organisation_changes(self):
+        """Test that the cache is keyed by updated_at."""
+        organisation = OrganisationFactory(role_hierarchy=copy.deepcopy(HIERARCHY))
+        assert not rbac.has_permissions(organisation, 'user', ('write',))
+        assert rbac.compile(organisation) is rbac.compile(organisation)
+
+        organisation.role_hierarchy['user'].append('write')
+        organisation.save()
+
+        assert rbac.has_permissions(organisation, 'user', ('write',))
+
+    def test_cache_is_bounded(self, settings):
+        """Test that RBAC_CACHE_SIZE limits the compiled entries."""
+        settings.RBAC_CACHE_SIZE = 2
+        organisations = [OrganisationFactory() for _ in range(3)]
+
+        for organisation in organisations:
+            rbac.compile(organisation)
+
+        assert list(rbac.compiled) == [organisation.pk for organisation in organisations[1:]]
+
+    def test_organisation_roles(self):
+        """Test owner, member and outsider roles for session and JWT users."""
+        organisation = OrganisationFactory(role_hierarchy=HIERARCHY)
+        member = UserFactory()
+        OrganisationMember.objects.create(user=member, organisation=organisation, role='manager')
+        outsider = UserFactory()
+
+        assert organisation_role(organisation.owner, organisation) is OWNER
+        assert organisation_role(token_user(organisation.owner), organisation) is OWNER
+        assert organisation_role(member, organisation) == 'manager'
+        assert organisation_role(token_user(member), organisation) == 'manager'
+        assert organisation_role(outsider, organisation) is None
+        assert organisation_role(token_user(outsider), organisation) is None
+        assert organisation_role(AnonymousUser(), organisation) is None
+
+    def test_permission_class_checks_required_permissions(self, django_assert_num_queries):
+        """Test that JWT members are authorised by method without queries."""
+        organisation = OrganisationFactory(role_hierarchy=HIERARCHY)
+        member = UserFactory()
+        OrganisationMember.objects.create(user=member, organisation=organisation, role='manager')
+        user = token_user(member)
+        factory = APIRequestFactory()
+        view = ItemsView.as_view()
+
+        def status_for(method):
+            request = getattr(factory, method)('/items/')
+            force_authenticate(request, user=user)
+            return view(request).status_code
+
+        assert status_for('get') == 200
+        with django_assert_num_queries(0):
+            assert status_for('post') == 200
+            # Needs billing, which managers lack
+            assert status_for('delete') == 403
+
+    def test_owner_has_every_permission(self):
+        """Test that the owner passes whatever the view requires."""
+        organisation = OrganisationFactory(role_hierarchy={'user': ['read']})
+        request = APIRequestFactory().delete('/items/')
+        force_authenticate(request, user=organisation.owner)
+
+        assert ItemsView.as_view()(request).status_code == 200
+
+    def test_objects_must_belong_to_tenant(self):
+        """Test the object-level check against the caller's organisation."""
+        organisation, other = OrganisationFactory(), OrganisationFactory()
+        request = APIRequestFactory().get('/items/')
+        request.user = organisation.owner
+        permission = HasOrganisationPermission()
+
+        assert permission.has_object_permission(request, None, organisation)
+        assert not permission.has_object_permission(request, None, other)
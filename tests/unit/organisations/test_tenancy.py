@@ -0,0 +1,145 @@
+# tests/unit/organisations/test_tenancy.py
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.db import transaction
+from django.test import RequestFactory
+from authentications.tokens import ClaimsRefreshToken, ClaimsTokenUser
+from organisations.models import SubscriptionTier
+from organisations.tenancy import TenantContextMiddleware, get_tenant_context, tenant_cache
+from tests.factories import OrganisationFactory, SubscriptionFactory, UserFactory
+
+
+def token_user(user):
+    return ClaimsTokenUser(ClaimsRefreshToken.for_user(user).access_token)
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestTenantContext:
+    """Tests for resolving and caching the request tenant."""
+
+    def test_resolves_owner_organisation_once(self, django_assert_num_queries):
+        """Test one query on a cache miss and none on a hit."""
+        subscription = SubscriptionFactory()
+        owner = subscription.organisation.owner
+
+        with django_assert_num_queries(1):
+            context = get_tenant_context(owner)
+            assert context.subscription.pk == subscription.pk
+            assert context.subscription.organisation is context.organisation
+
+        with django_assert_num_queries(0):
+            assert get_tenant_context(owner).organisation_id == subscription.organisation_id
+
+    def test_resolves_token_user_from_claims(self, django_assert_num_queries):
+        """Test that JWT users are resolved by their organisation claim."""
+        organisation = OrganisationFactory()
+        user = token_user(organisation.owner)
+
+        with django_assert_num_queries(1):
+            context = get_tenant_context(user)
+            get_tenant_context(user)
+
+        assert context.organisation == organisation
+        assert context.subscription is None
+
+    def test_no_tenant(self, django_assert_num_queries):
+        """Test that anonymous users and non-owners get an empty context."""
+        member = UserFactory()
+        member_token_user = token_user(member)
+
+        assert not get_tenant_context(AnonymousUser())
+        with django_assert_num_queries(0):
+            assert not get_tenant_context(member_token_user)
+        assert not get_tenant_context(member)
+
+    def test_cached_instances_are_not_shared(self):
+        """Test that changing a returned instance leaves the cache intact."""
+        organisation = OrganisationFactory()
+
+        get_tenant_context(organisation.owner).organisation.name = 'Changed'
+
+        assert get_tenant_context(organisation.owner).organisation.name == organisation.name
+
+    def test_saves_invalidate_cached_context(self):
+        """Test that organisation and subscription saves drop stale entries."""
+        subscription = SubscriptionFactory()
+        organisation = subscription.organisation
+        user = token_user(organisation.owner)
+        get_tenant_context(user)
+
+        organisation.subscription_tier = SubscriptionTier.PRO
+        organisation.save()
+        assert get_tenant_context(user).organisation.subscription_tier == SubscriptionTier.PRO
+
+        subscription.billing_name = 'Renamed Ltd'
+        subscription.save()
+        assert get_tenant_context(user).subscription.billing_name == 'Renamed Ltd'
+
+        subscription.delete()
+        assert get_tenant_context(user).subscription is None
+
+    def test_owner_change_invalidates_both_owners(self):
+        """Test that the previous and the new owner are both re-resolved."""
+        organisation = OrganisationFactory()
+        previous, new_owner = organisation.owner, UserFactory()
+        get_tenant_context(previous)
+        assert not get_tenant_context(new_owner)
+
+        organisation.owner = new_owner
+        organisation.save()
+
+        assert not get_tenant_context(previous)
+        assert get_tenant_context(new_owner).organisation_id == organisation.pk
+
+    def test_least_recently_used_entries_are_evicted(self, settings):
+        """Test that the cache stays within TENANT_CACHE_SIZE."""
+        settings.TENANT_CACHE_SIZE = 2
+        organisations = [OrganisationFactory() for _ in range(3)]
+
+        for organisation in organisations:
+            get_tenant_context(organisation.owner)
+
+        assert list(tenant_cache.entries) == [
+            ('user', organisation.owner.pk) for organisation in organisations[1:]]
+
+    def test_expired_entries_are_reloaded(self, settings, django_assert_num_queries):
+        """Test that entries older than TENANT_CACHE_TTL are not served."""
+        settings.TENANT_CACHE_TTL = 0
+        organisation = OrganisationFactory()
+        get_tenant_context(organisation.owner)
+
+        with django_assert_num_queries(1):
+            get_tenant_context(organisation.owner)
+
+    def test_middleware_resolves_lazily(self, django_assert_num_queries):
+        """Test that request.tenant costs nothing until it is read."""
+        organisation = OrganisationFactory()
+        user = token_user(organisation.owner)
+        seen = []
+
+        def view(request):
+            # As DRF does when it authenticates the request
+            request.user = user
+            seen.append(request.tenant.organisation_id)
+            seen.append(request.tenant.organisation_id)
+
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+        with django_assert_num_queries(1):
+            TenantContextMiddleware(view)(request)
+
+        assert seen == [organisation.pk, organisation.pk]
+
+    def test_invalidated_again_on_commit(self, django_capture_on_commit_callbacks):
+        """Test that entries cached before the save commits are dropped too."""
+        organisation = OrganisationFactory()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            with transaction.atomic():
+                organisation.name = 'Renamed'
+                organisation.save()
+                get_tenant_context(organisation.owner)
+                assert tenant_cache.entries
+
+        assert not tenant_cache.entries
@@ -0,0 +1,145 @@
+# tests/unit/organisations/test_tiers.py
+import dataclasses
+import json
+import os
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from organisations.models import ProjectFramework, SubscriptionTier
+from organisations.tiers import get_tier_policy, tier_policies
+from tests.factories import OrganisationFactory, SubscriptionFactory
+
+
+@pytest.fixture(autouse=True)
+def fresh_tier_policies():
+    tier_policies.invalidate()
+    yield
+    tier_policies.invalidate()
+
+
+@pytest.mark.unit
+class TestTierPolicyRegistry:
+    """Tests for the tier policy registry."""
+
+    def test_default_limits(self):
+        """Test the built-in limits for each tier."""
+        limits = {
+            tier: (policy.max_users, policy.max_items, policy.storage_limit)
+            for tier, policy in tier_policies.all().items()
+        }
+
+        assert limits == {
+            'STR': (10, 1000, 10240),
+            'PRO': (50, 10000, 51200),
+            'BUS': (250, 50000, 102400),
+            'ENT': (999999, 999999, 1024000),
+        }
+
+    def test_policies_are_immutable(self):
+        """Test that policies and the registry cannot be modified in place."""
+        policy = get_tier_policy(SubscriptionTier.PRO)
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            policy.max_users = 1
+        with pytest.raises(TypeError):
+            tier_policies.all()['PRO'] = policy
+
+    def test_registry_is_built_once(self):
+        """Test that lookups reuse the same policy objects."""
+        assert get_tier_policy('BUS') is get_tier_policy('BUS')
+
+    def test_setting_overrides(self, settings):
+        """Test that TIER_POLICY_OVERRIDES replaces individual fields."""
+        settings.TIER_POLICY_OVERRIDES = {'PRO': {'max_users': 75}}
+
+        assert get_tier_policy('PRO').max_users == 75
+        assert get_tier_policy('PRO').max_items == 10000
+
+    def test_invalid_override(self, settings):
+        """Test that unknown tiers or fields are rejected."""
+        settings.TIER_POLICY_OVERRIDES = {'PRO': {'max_seats': 75}}
+
+        with pytest.raises(ImproperlyConfigured):
+            tier_policies.all()
+
+    def test_file_changes_roll_out_without_restart(self, settings, tmp_path):
+        """Test that edits to TIER_POLICY_FILE are picked up on the next check."""
+        policy_file = tmp_path / 'tiers.json'
+        policy_file.write_text(json.dumps({'STR': {'max_items': 2000}}))
+        settings.TIER_POLICY_FILE = str(policy_file)
+        settings.TIER_POLICY_CHECK_SECONDS = 0
+        assert get_tier_policy('STR').max_items == 2000
+
+        policy_file.write_text(json.dumps({'STR': {'max_items': 3000}}))
+        os.utime(policy_file, (0, os.stat(policy_file).st_mtime + 1))
+
+        assert get_tier_policy('STR').max_items == 3000
+
+    def test_bad_file_keeps_last_good_policies(self, settings, tmp_path):
+        """Test that an invalid edit does not take the registry down."""
+        policy_file = tmp_path / 'tiers.json'
+        policy_file.write_text(json.dumps({'STR': {'max_items': 2000}}))
+        settings.TIER_POLICY_FILE = str(policy_file)
+        settings.TIER_POLICY_CHECK_SECONDS = 0
+        get_tier_policy('STR')
+
+        policy_file.write_text('{not json')
+        os.utime(policy_file, (0, os.stat(policy_file).st_mtime + 1))
+
+        assert get_tier_policy('STR').max_items == 2000
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestTierPolicyModels:
+    """Tests for models reading from the tier policy registry."""
+
+    def test_save_applies_forced_features(self):
+        """Test that saving applies the tier's features and storage."""
+        organisation = OrganisationFactory(subscription_tier=SubscriptionTier.BUSINESS)
+
+        assert organisation.enable_objective_layer
+        assert organisation.enable_platform_layer
+        assert organisation.storage_limit == 102400
+
+    def test_optional_features_are_left_alone(self):
+        """Test that flags the tier does not force keep their value."""
+        organisation = OrganisationFactory(
+            subscription_tier=SubscriptionTier.PRO, enable_objective_layer=True)
+
+        assert organisation.enable_objective_layer
+        assert not organisation.enable_platform_layer
+
+    def test_methodology_not_on_tier(self):
+        """Test that a default methodology must be allowed by the tier."""
+        with pytest.raises(ValidationError):
+            OrganisationFactory(subscription_tier=SubscriptionTier.STARTER,
+                                enable_scrum_hierarchy=True,
+                                default_framework=ProjectFramework.SCRUM)
+
+    def test_waterfall_needs_business(self):
+        """Test that Pro organisations cannot default to Waterfall."""
+        with pytest.raises(ValidationError):
+            OrganisationFactory(subscription_tier=SubscriptionTier.PRO,
+                                enable_waterfall=True,
+                                default_framework=ProjectFramework.WATERFALL)
+
+    def test_unknown_tier_is_a_field_error(self):
+        """Test that an unknown tier fails validation rather than the policy lookup."""
+        with pytest.raises(ValidationError) as excinfo:
+            OrganisationFactory(subscription_tier='XXX')
+        assert 'subscription_tier' in excinfo.value.message_dict
+
+        organisation = OrganisationFactory()
+        organisation.subscription_tier = 'XXX'
+        with pytest.raises(ValidationError) as excinfo:
+            organisation.save()
+        assert 'subscription_tier' in excinfo.value.message_dict
+
+    def test_subscription_limits_follow_overrides(self, settings):
+        """Test that subscription limits read the current policy."""
+        subscription = SubscriptionFactory()
+        settings.TIER_POLICY_OVERRIDES = {'STR': {'max_users': 3}}
+
+        assert subscription.max_users == 3
+        assert subscription.max_items == 1000
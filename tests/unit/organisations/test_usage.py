@@ -0,0 +1,172 @@
+# tests/unit/organisations/test_usage.py
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.db import DatabaseError, transaction
+from organisations.models import (
+    OrganisationMember, Subscription, UsageCounter, UsageMetric,
+)
+from organisations.usage import (
+    _sources, current_usage, fold_counters, reconcile_usage, record_usage,
+    register_usage_source, usage_meter, user_totals, within_limit,
+)
+from tests.factories import SubscriptionFactory, UserFactory
+
+
+@pytest.fixture(autouse=True)
+def clean_meter():
+    sources = dict(_sources)
+    usage_meter.pending.clear()
+    usage_meter.pending_count = 0
+    yield
+    usage_meter.pending.clear()
+    usage_meter.pending_count = 0
+    _sources.clear()
+    _sources.update(sources)
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestUsageMetering:
+    """Tests for buffered, sharded usage counters."""
+
+    def test_increments_are_buffered_and_coalesced(self, django_assert_num_queries):
+        """Test that many increments flush as one update per metric."""
+        subscription = SubscriptionFactory()
+        record_usage(subscription, UsageMetric.ITEMS)
+        record_usage(subscription, UsageMetric.STORAGE, 5)
+        usage_meter.flush()
+
+        with django_assert_num_queries(0):
+            for _ in range(100):
+                record_usage(subscription, UsageMetric.ITEMS)
+            record_usage(subscription, UsageMetric.STORAGE, 25)
+
+        # One UPDATE per metric, plus the savepoint around them
+        with django_assert_num_queries(4):
+            assert usage_meter.flush() == 2
+
+        assert current_usage(subscription)[UsageMetric.ITEMS] == 101
+        assert current_usage(subscription)[UsageMetric.STORAGE] == 30
+
+    def test_shards_are_created_on_first_flush(self, settings):
+        """Test that every shard row exists after the first flush."""
+        settings.USAGE_COUNTER_SHARDS = 4
+        subscription = SubscriptionFactory()
+
+        record_usage(subscription, UsageMetric.USERS, 3)
+        usage_meter.flush()
+
+        counters = UsageCounter.objects.filter(subscription=subscription)
+        assert counters.count() == 4
+        assert sum(counter.value for counter in counters) == 3
+
+    def test_current_usage_includes_unflushed_deltas(self):
+        """Test that reads see this process's buffered increments."""
+        subscription = SubscriptionFactory(current_item_count=10)
+
+        record_usage(subscription, UsageMetric.ITEMS, 5)
+
+        assert current_usage(subscription)[UsageMetric.ITEMS] == 15
+
+    def test_flush_when_buffer_is_full(self, settings, django_capture_on_commit_callbacks):
+        """Test that a full buffer flushes once the caller commits."""
+        settings.USAGE_FLUSH_MAX_PENDING = 3
+        subscription = SubscriptionFactory()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            for _ in range(3):
+                record_usage(subscription, UsageMetric.ITEMS)
+            assert usage_meter.pending
+
+        assert not usage_meter.pending
+        assert UsageCounter.objects.filter(subscription=subscription).exists()
+
+    def test_full_buffer_survives_caller_rollback(self, settings):
+        """Test that a rolled back caller does not take buffered deltas with it."""
+        settings.USAGE_FLUSH_MAX_PENDING = 3
+        subscription = SubscriptionFactory()
+        record_usage(subscription, UsageMetric.ITEMS, 2)
+
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                record_usage(subscription, UsageMetric.STORAGE)
+                record_usage(subscription, UsageMetric.STORAGE)
+                raise RuntimeError("caller failed")
+
+        assert usage_meter.pending_delta(subscription.pk, UsageMetric.ITEMS) == 2
+        assert not UsageCounter.objects.filter(subscription=subscription).exists()
+
+    def test_failed_size_flush_is_logged_and_kept(
+            self, settings, caplog, django_capture_on_commit_callbacks):
+        """Test that a failing flush does not raise into the caller."""
+        settings.USAGE_FLUSH_MAX_PENDING = 2
+        subscription = SubscriptionFactory()
+
+        with mock.patch('organisations.usage._add_to_shard',
+                        side_effect=DatabaseError("down")):
+            with django_capture_on_commit_callbacks(execute=True):
+                record_usage(subscription, UsageMetric.ITEMS)
+                record_usage(subscription, UsageMetric.ITEMS)
+
+        assert "Usage flush failed: down" in caplog.text
+        assert usage_meter.pending_delta(subscription.pk, UsageMetric.ITEMS) == 2
+
+    def test_within_limit(self):
+        """Test limit checks against the aggregated usage."""
+        subscription = SubscriptionFactory(current_user_count=9)
+
+        assert within_limit(subscription, UsageMetric.USERS)
+        record_usage(subscription, UsageMetric.USERS)
+        assert not within_limit(subscription, UsageMetric.USERS)
+
+    def test_fold_moves_shards_into_subscription(self):
+        """Test that folding keeps totals and empties the shards."""
+        subscription = SubscriptionFactory(current_item_count=2)
+        record_usage(subscription, UsageMetric.ITEMS, 7)
+        usage_meter.flush()
+
+        assert fold_counters() == 1
+
+        subscription.refresh_from_db()
+        assert subscription.current_item_count == 9
+        assert not UsageCounter.objects.exclude(value=0).exists()
+        assert current_usage(subscription)[UsageMetric.ITEMS] == 9
+
+    def test_reconcile_resets_to_true_totals(self):
+        """Test that reconcile corrects drift using registered sources."""
+        subscription = SubscriptionFactory(current_user_count=1)
+        record_usage(subscription, UsageMetric.ITEMS, 40)
+
+        @register_usage_source(UsageMetric.ITEMS)
+        def item_totals(subscription_ids):
+            return {subscription.pk: 12}
+
+        assert reconcile_usage() == 1
+
+        subscription.refresh_from_db()
+        assert subscription.current_item_count == 12
+        assert current_usage(subscription)[UsageMetric.ITEMS] == 12
+
+    def test_reconcile_counts_owner_and_members(self):
+        """Test that the user source counts the owner and each member once."""
+        subscription = SubscriptionFactory(current_user_count=7)
+        organisation = subscription.organisation
+        OrganisationMember.objects.create(user=UserFactory(), organisation=organisation)
+        OrganisationMember.objects.create(user=organisation.owner, organisation=organisation)
+
+        assert user_totals([subscription.pk]) == {subscription.pk: 2}
+        assert reconcile_usage([subscription.pk]) == 1
+        subscription.refresh_from_db()
+        assert subscription.current_user_count == 2
+
+    def test_reconcile_command(self):
+        """Test the fold-only mode of the reconcile command."""
+        subscription = SubscriptionFactory()
+        record_usage(subscription, UsageMetric.STORAGE, 64)
+        usage_meter.flush()
+
+        call_command('reconcile_usage', '--fold-only')
+
+        assert Subscription.objects.get(pk=subscription.pk).current_storage_used == 64
@@ -0,0 +1,75 @@
+# tests/unit/test_ratelimit.py
+import multiprocessing
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from backlogger_api.ratelimit import SharedRateLimiter, parse_rate
+
+
+@pytest.fixture
+def limiter(tmp_path):
+    return SharedRateLimiter(str(tmp_path / 'counters'), slots=1024)
+
+
+def hammer(path, hits, results):
+    # Runs in a child process with its own mapping of the same file
+    limiter = SharedRateLimiter(path, slots=1024)
+    results.put(sum(limiter.hit('shared', 50, 60, now=120.0)[0]
+                    for _ in range(hits)))
+
+
+@pytest.mark.unit
+class TestSharedRateLimiter:
+    """Unit tests for the shared-memory sliding-window limiter."""
+
+    @pytest.mark.parametrize("rate, expected", [
+        ('5/m', (5, 60)),
+        ('100/15m', (100, 900)),
+        ('10/s', (10, 1)),
+    ])
+    def test_parse_rate(self, rate, expected):
+        assert parse_rate(rate) == expected
+
+    def test_parse_invalid_rate(self):
+        with pytest.raises(ImproperlyConfigured):
+            parse_rate('five per minute')
+
+    def test_limits_within_window(self, limiter):
+        """Test that hits beyond the limit are rejected."""
+        results = [limiter.hit('ip:1', 5, 60, now=10.0)[0] for _ in range(7)]
+
+        assert results == [True] * 5 + [False] * 2
+
+    def test_keys_are_independent(self, limiter):
+        for _ in range(5):
+            limiter.hit('ip:1', 5, 60, now=10.0)
+
+        assert limiter.hit('ip:2', 5, 60, now=10.0)[0]
+
+    def test_previous_window_is_weighted(self, limiter):
+        """Test the sliding estimate carries over part of the last window."""
+        for _ in range(5):
+            limiter.hit('ip:1', 5, 60, now=59.0)
+
+        # A quarter into the next window, 75% of the previous count remains
+        allowed, estimate = limiter.hit('ip:1', 5, 60, now=75.0)
+        assert allowed
+        assert estimate == pytest.approx(5 * 0.75 + 1)
+        assert not limiter.hit('ip:1', 5, 60, now=75.0)[0]
+
+        # Two windows later the key starts fresh
+        assert limiter.hit('ip:1', 5, 60, now=185.0)[1] == 1
+
+    def test_shared_across_processes(self, tmp_path):
+        """Test that worker processes enforce one combined limit."""
+        path = str(tmp_path / 'counters')
+        context = multiprocessing.get_context('spawn')
+        results = context.Queue()
+        workers = [context.Process(target=hammer, args=(path, 40, results))
+                   for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=30)
+
+        assert sum(results.get(timeout=5) for _ in workers) == 50